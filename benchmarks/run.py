@@ -0,0 +1,304 @@
+# benchmarks/run.py
+"""
+Microbenchmarks for the generator's hot paths.
+
+Times every ``SectionBuilder.build_examples`` plus the shared helpers in
+``src/utils.py`` (validation, deduplication, stats, entity naming and
+classification, JSON saving) at several scales, writes machine-readable
+results and optionally compares them against a stored baseline::
+
+    python -m benchmarks.run --out bench-results.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --max-slowdown 1.3
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+
+Comparison uses the best time per item, so builders that cap their output
+below the requested scale are compared fairly. The process exits with status
+1 when any case is slower than ``--max-slowdown`` times its baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src import sections
+from src.domain_config import DomainConfig, load_domain_configs
+from src.manifest import git_revision
+from src.sections import SectionBuilder
+from src.utils import (
+    EntityNameSpace,
+    classify_entity_name,
+    compute_stats,
+    deduplicate_examples,
+    generate_diverse_entity_names,
+    save_json_array,
+    validate_example,
+)
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CONFIG = REPO_ROOT / "config.yaml"
+DEFAULT_DOMAIN = "expense"
+DEFAULT_SCALES = (1_000, 100_000, 1_000_000)
+
+# Fewer repeats at larger scales keep a full run in the minutes range.
+_REPEATS = {1_000: 5, 100_000: 3}
+_DEFAULT_REPEATS = 1
+
+# A case prepares its inputs once, then returns the timed callable, which
+# returns the number of items it processed.
+Case = Callable[[DomainConfig, int], Callable[[], int]]
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    name: str
+    scale: int
+    items: int
+    repeats: int
+    best_s: float
+    median_s: float
+
+    @property
+    def per_item_us(self) -> float:
+        return self.best_s / max(self.items, 1) * 1e6
+
+
+# -----------------------------------------------------------------------------
+# Inputs
+
+
+def _builder_classes() -> List[type]:
+    return [
+        getattr(sections, name)
+        for name in sections.__all__
+        if name != "SectionBuilder"
+    ]
+
+
+def _scaled(cfg: DomainConfig, builder_cls: type, n: int) -> SectionBuilder:
+    builder = builder_cls(cfg)
+    return builder.with_config(
+        dataclasses.replace(cfg, sample_scale=1.0, section_samples={builder.section_key: n})
+    )
+
+
+_seed_examples: Dict[str, List[Dict[str, Any]]] = {}
+
+
+def synthetic_examples(cfg: DomainConfig, n: int, duplicate_ratio: float = 0.1) -> List[Dict[str, Any]]:
+    """``n`` realistic examples built by tiling every section's default output.
+
+    Instructions get a unique suffix, except for roughly ``duplicate_ratio``
+    of the examples which repeat an earlier one so deduplication has work to
+    do.
+    """
+    seed = _seed_examples.get(cfg.id)
+    if seed is None:
+        seed = [ex for cls in _builder_classes() for ex in cls(cfg).build_examples()]
+        _seed_examples[cfg.id] = seed
+    rng = np.random.default_rng(0)
+    duplicates = rng.random(n) < duplicate_ratio
+    out: List[Dict[str, Any]] = []
+    for i in range(n):
+        source = seed[i % len(seed)]
+        suffix = i // 2 if duplicates[i] else i
+        out.append({**source, "instruction": f"{source['instruction']} [{suffix}]"})
+    return out
+
+
+# -----------------------------------------------------------------------------
+# Cases
+
+
+def _builder_case(builder_cls: type) -> Case:
+    def setup(cfg: DomainConfig, n: int) -> Callable[[], int]:
+        builder = _scaled(cfg, builder_cls, n)
+        return lambda: len(builder.build_examples())
+    return setup
+
+
+def _validate_case(cfg: DomainConfig, n: int) -> Callable[[], int]:
+    examples = synthetic_examples(cfg, n)
+    return lambda: sum(validate_example(ex) for ex in examples)
+
+
+def _dedup_case(cfg: DomainConfig, n: int) -> Callable[[], int]:
+    examples = synthetic_examples(cfg, n)
+
+    def run() -> int:
+        deduplicate_examples(examples)
+        return len(examples)
+    return run
+
+
+def _stats_case(cfg: DomainConfig, n: int) -> Callable[[], int]:
+    examples = synthetic_examples(cfg, n)
+    return lambda: compute_stats(examples)["total_examples"]
+
+
+def _classify_case(cfg: DomainConfig, n: int) -> Callable[[], int]:
+    names = list(EntityNameSpace(cfg, n))
+    return lambda: sum(1 for name in names if classify_entity_name(name, cfg.entity_types))
+
+
+def _entity_names_case(cfg: DomainConfig, n: int) -> Callable[[], int]:
+    return lambda: len(generate_diverse_entity_names(cfg, n))
+
+
+def _save_case(cfg: DomainConfig, n: int) -> Callable[[], int]:
+    examples = synthetic_examples(cfg, n)
+
+    def run() -> int:
+        with tempfile.TemporaryDirectory(prefix="bench-save-") as out_dir:
+            save_json_array(Path(out_dir) / "bench.json", examples)
+        return len(examples)
+    return run
+
+
+def all_cases() -> Dict[str, Case]:
+    cases: Dict[str, Case] = {
+        f"build.{cls.section_key}": _builder_case(cls)
+        for cls in _builder_classes()
+    }
+    cases.update({
+        "utils.validate_example": _validate_case,
+        "utils.deduplicate_examples": _dedup_case,
+        "utils.compute_stats": _stats_case,
+        "utils.classify_entity_name": _classify_case,
+        "utils.generate_diverse_entity_names": _entity_names_case,
+        "utils.save_json_array": _save_case,
+    })
+    return cases
+
+
+# -----------------------------------------------------------------------------
+# Running and comparing
+
+
+def run_case(name: str, case: Case, cfg: DomainConfig, scale: int, repeats: int) -> BenchResult:
+    fn = case(cfg, scale)
+    timings = []
+    items = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        items = fn()
+        timings.append(time.perf_counter() - start)
+    return BenchResult(name, scale, items, repeats, min(timings), statistics.median(timings))
+
+
+def run_all(
+    cfg: DomainConfig,
+    scales: Sequence[int],
+    selected: Optional[Sequence[str]] = None,
+    log: Callable[[str], None] = print,
+) -> Iterator[BenchResult]:
+    for name, case in all_cases().items():
+        if selected and not any(sel in name for sel in selected):
+            continue
+        for scale in scales:
+            result = run_case(name, case, cfg, scale, _REPEATS.get(scale, _DEFAULT_REPEATS))
+            log(
+                f"{name:<45} n={scale:<9} items={result.items:<9} "
+                f"best={result.best_s:9.4f}s  {result.per_item_us:9.2f} us/item"
+            )
+            yield result
+
+
+def to_json(results: Sequence[BenchResult]) -> Dict[str, Any]:
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(REPO_ROOT),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "results": [
+            {**dataclasses.asdict(r), "per_item_us": r.per_item_us} for r in results
+        ],
+    }
+
+
+def compare(
+    results: Sequence[BenchResult], baseline: Dict[str, Any], max_slowdown: float
+) -> Tuple[List[str], List[str]]:
+    """Compare per-item times with a baseline.
+
+    Returns
+    -------
+    (report, regressions)
+        One line per case found in the baseline, and the subset that is
+        slower than ``max_slowdown`` times the baseline.
+    """
+    base = {(r["name"], r["scale"]): r["per_item_us"] for r in baseline.get("results", [])}
+    report: List[str] = []
+    regressions: List[str] = []
+    for r in results:
+        ref = base.get((r.name, r.scale))
+        if not ref:
+            continue
+        ratio = r.per_item_us / ref
+        line = f"{r.name:<45} n={r.scale:<9} {ratio:6.2f}x baseline"
+        report.append(line)
+        if ratio > max_slowdown:
+            regressions.append(line)
+    return report, regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run generator microbenchmarks.")
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG), help="Config file for inputs")
+    parser.add_argument("--domain", default=DEFAULT_DOMAIN, help="Domain id used for inputs")
+    parser.add_argument(
+        "--scales",
+        default=",".join(str(s) for s in DEFAULT_SCALES),
+        help="Comma-separated item counts (default: %(default)s)",
+    )
+    parser.add_argument("--only", nargs="*", help="Run only cases whose name contains one of these")
+    parser.add_argument("--out", help="Write JSON results to this file")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=1.25,
+        help="Fail when a case is slower than this multiple of its baseline (default: %(default)s)",
+    )
+    parser.add_argument("--save-baseline", help="Write results as the new baseline to this file")
+    args = parser.parse_args(argv)
+
+    cfg = load_domain_configs(Path(args.config))[args.domain]
+    scales = [int(float(s)) for s in args.scales.split(",") if s]
+    results = list(run_all(cfg, scales, args.only))
+    payload = to_json(results)
+
+    for target in (args.out, args.save_baseline):
+        if target:
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+            Path(target).write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+            print(f"Wrote {len(results)} results -> {target}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        report, regressions = compare(results, baseline, args.max_slowdown)
+        print("\n".join(report))
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than {args.max_slowdown}x baseline:")
+            print("\n".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
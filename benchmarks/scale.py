@@ -0,0 +1,178 @@
+# benchmarks/scale.py
+"""
+End-to-end scale harness.
+
+Synthesizes a config with many domains and long entity lists, runs the full
+``DatasetGenerator`` pipeline on it and reports throughput::
+
+    python -m benchmarks.scale --domains 50 --list-size 200 --kb-facts 500 --scale 5
+
+Reported: examples/s, bytes written/s, peak RSS of the process and wall time
+per section (summed over domains). By default every domain has distinct
+names, which is the worst case for section reuse; ``--shared`` gives all
+domains the same names and sampling key so the section memo can kick in.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import yaml
+
+from src.domain_config import load_domain_configs
+from src.factory import SectionBuilderFactory
+from src.generator import DatasetGenerator, SectionResult
+
+try:  # POSIX only
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+
+_ENTITY_KINDS = ["Invoice", "Vendor", "CostCenter", "ExpensePolicy", "Project", "Person", "Receipt"]
+_REGIONS = ["Global", "UAE", "India", "Nigeria", "Europe", "APAC", "LATAM", "US"]
+
+
+def synthesize_config(
+    domains: int,
+    list_size: int,
+    kb_facts: int,
+    sample_scale: float = 1.0,
+    shared: bool = False,
+) -> Dict[str, Any]:
+    """Build a config mapping with ``domains`` large, expense-style domains.
+
+    Parameters
+    ----------
+    domains: int
+        Number of domain entries.
+    list_size: int
+        Length of the products, roles, regions and entity type lists.
+    kb_facts: int
+        Number of company KB facts per domain (0 uses generated placeholders).
+    sample_scale: float, optional
+        ``sample_scale`` set on every domain.
+    shared: bool, optional
+        Give all domains the same names and sampling key.
+    """
+    entries = []
+    for d in range(domains):
+        tag = "shared" if shared else f"{d:04d}"
+        entries.append({
+            "id": f"synthetic_{d:04d}",
+            "company_name": f"Company {tag}",
+            "agent_name": f"Agent{tag}",
+            "chat_agent_name": f"Chat Agent {tag}",
+            "domain_name": f"Expense Management {tag}",
+            "kb_label": f"Company {tag} Knowledge Base",
+            "primary_products": [f"Product{tag}_{i}" for i in range(list_size)],
+            "primary_roles": [f"Role {i}" for i in range(list_size)],
+            "primary_regions": [f"{_REGIONS[i % len(_REGIONS)]} {i}" for i in range(list_size)],
+            "entity_types": [f"{_ENTITY_KINDS[i % len(_ENTITY_KINDS)]}{i}" for i in range(list_size)],
+            "expense_doc_types": ["Invoice", "Bill", "Receipt"],
+            "currencies": ["INR", "USD", "AED", "EUR", "GBP"],
+            "company_kb_facts": [f"Fact {i} about Company {tag}." for i in range(kb_facts)] or None,
+            "sample_scale": sample_scale,
+            **({"sampling_key": "synthetic"} if shared else {}),
+        })
+    return {"domains": entries}
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def summarize(results: Sequence[SectionResult], wall_seconds: float) -> Dict[str, Any]:
+    per_section: Dict[str, Dict[str, float]] = defaultdict(lambda: {"seconds": 0.0, "examples": 0, "bytes": 0})
+    for r in results:
+        entry = per_section[r.section]
+        entry["seconds"] += r.seconds
+        entry["examples"] += r.examples
+        entry["bytes"] += r.bytes
+    examples = sum(r.examples for r in results)
+    written = sum(r.bytes for r in results)
+    return {
+        "wall_seconds": wall_seconds,
+        "domains": len({r.domain for r in results}),
+        "examples": examples,
+        "bytes": written,
+        "examples_per_second": examples / wall_seconds if wall_seconds else 0.0,
+        "bytes_per_second": written / wall_seconds if wall_seconds else 0.0,
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "reused_sections": sum(r.reused for r in results),
+        "sections": dict(sorted(per_section.items(), key=lambda kv: -kv[1]["seconds"])),
+    }
+
+
+def format_report(summary: Dict[str, Any]) -> str:
+    rss = summary["peak_rss_bytes"]
+    lines = [
+        f"Domains:        {summary['domains']}",
+        f"Examples:       {summary['examples']} in {summary['wall_seconds']:.2f}s "
+        f"({summary['examples_per_second']:.0f} examples/s)",
+        f"Bytes written:  {summary['bytes'] / 2**20:.1f} MB "
+        f"({summary['bytes_per_second'] / 2**20:.1f} MB/s)",
+        f"Peak RSS:       {rss / 2**20:.1f} MB" if rss is not None else "Peak RSS:       n/a",
+        f"Reused:         {summary['reused_sections']} sections",
+        "",
+        f"{'section':<34}{'seconds':>10}{'examples':>12}{'MB':>10}",
+    ]
+    for name, s in summary["sections"].items():
+        lines.append(f"{name:<34}{s['seconds']:>10.2f}{s['examples']:>12}{s['bytes'] / 2**20:>10.1f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the generator end to end on a synthetic config.")
+    parser.add_argument("--domains", type=int, default=10, help="Number of domains (default: %(default)s)")
+    parser.add_argument(
+        "--list-size",
+        type=int,
+        default=100,
+        help="Length of products/roles/regions/entity_types lists (default: %(default)s)",
+    )
+    parser.add_argument("--kb-facts", type=int, default=200, help="Company KB facts per domain")
+    parser.add_argument("--scale", type=float, default=1.0, help="sample_scale for every domain")
+    parser.add_argument("--shared", action="store_true", help="Make domains identical apart from their id")
+    parser.add_argument("--seed", type=int, default=None, help="Root seed for sampling")
+    parser.add_argument("--out-dir", help="Where to write datasets (default: a temporary directory)")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary output directory")
+    parser.add_argument("--json", help="Also write the summary as JSON to this file")
+    args = parser.parse_args(argv)
+
+    out_dir = Path(args.out_dir) if args.out_dir else Path(tempfile.mkdtemp(prefix="scale-harness-"))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        config_path = out_dir / "config.yaml"
+        data = synthesize_config(args.domains, args.list_size, args.kb_facts, args.scale, args.shared)
+        config_path.write_text(yaml.safe_dump(data, sort_keys=False), encoding="utf-8")
+        cfgs = list(load_domain_configs(config_path, use_snapshot=False).values())
+
+        generator = DatasetGenerator(SectionBuilderFactory(seed=args.seed), verbose=False)
+        start = time.perf_counter()
+        results: List[SectionResult] = generator.generate_for_domains(cfgs, out_dir / "datasets")
+        summary = summarize(results, time.perf_counter() - start)
+    finally:
+        if not args.out_dir and not args.keep:
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+    print(format_report(summary))
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,10 +3,12 @@
 from .domain_config import DomainConfig
 from .generator import DatasetGenerator
 from .factory import SectionBuilderFactory
+from .stream import iter_dataset
   
 __all__ = [
     "DomainConfig",
     "DatasetGenerator",
     "SectionBuilderFactory",
+    "iter_dataset",
 ]
   
\ No newline at end of file
@@ -0,0 +1,208 @@
+# dataset_generator/budget.py
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Hashable, List, Optional, Sequence, Tuple
+
+from .section_memo import ConfigAccessRecorder, memo_key
+from .sections import SectionBuilder
+
+
+# -----------------------------------------------------------------------------
+# Pre-run resource estimates
+#
+# Large ``sample_scale`` values can turn a seconds-long run into one that
+# exhausts memory halfway through. Before generating, every builder is probed
+# on a handful of examples: after a warm-up run the probe is repeated under
+# ``tracemalloc`` to measure the memory per example (including serialization),
+# then timed. Per-example costs are extrapolated linearly to each builder's
+# ``planned_count``, which already stops at the size of its template space
+# (or at its configured facts), so capped sections are not over-counted.
+# Sections are built and written one at a time, so peak memory is that of the
+# largest section while time adds up over all of them, plus the outputs the
+# section memo holds for reuse by a later domain: the probe also records which
+# config fields each builder reads, which tells which sections share an output
+# and for how long it is kept.
+
+DEFAULT_PROBE_SIZE = 32
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised when a run's estimate exceeds the configured budget."""
+
+
+@dataclass(frozen=True)
+class SectionEstimate:
+    section: str
+    examples: int
+    seconds: float
+    bytes: int
+
+
+@dataclass(frozen=True)
+class RunEstimate:
+    """Extrapolated cost of generating every section of a domain.
+
+    ``retained_bytes[i]`` is the memory the section memo holds for other
+    sections while section ``i`` is generated (empty: nothing is held).
+    """
+
+    sections: List[SectionEstimate]
+    retained_bytes: Tuple[int, ...] = ()
+
+    @property
+    def total_examples(self) -> int:
+        return sum(s.examples for s in self.sections)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(s.seconds for s in self.sections)
+
+    def _held(self) -> List[int]:
+        retained = self.retained_bytes or (0,) * len(self.sections)
+        return [s.bytes + r for s, r in zip(self.sections, retained)]
+
+    @property
+    def peak_bytes(self) -> int:
+        return max(self._held(), default=0)
+
+    def summary(self) -> str:
+        return (
+            f"Estimated {self.total_examples} examples in ~{self.total_seconds:.1f}s, "
+            f"peak ~{self.peak_bytes / 2**20:.1f} MB"
+        )
+
+    def check(self, max_memory_mb: Optional[float] = None, max_seconds: Optional[float] = None) -> None:
+        """Raise :class:`BudgetExceededError` if the estimate exceeds a limit.
+
+        Parameters
+        ----------
+        max_memory_mb: float, optional
+            Limit for the peak memory, in MiB: the largest section plus the
+            shared outputs held while it is generated.
+        max_seconds: float, optional
+            Limit for the total generation time.
+        """
+        problems = []
+        if max_memory_mb is not None and self.peak_bytes > max_memory_mb * 2**20:
+            held = self._held()
+            worst = self.sections[held.index(max(held))]
+            problems.append(
+                f"peak memory ~{self.peak_bytes / 2**20:.1f} MB (section '{worst.section}') "
+                f"exceeds max_memory_mb={max_memory_mb}"
+            )
+        if max_seconds is not None and self.total_seconds > max_seconds:
+            problems.append(f"time ~{self.total_seconds:.1f}s exceeds max_seconds={max_seconds}")
+        if problems:
+            raise BudgetExceededError(
+                "Refusing to start: " + "; ".join(problems) + ". Lower sample_scale or raise the budget."
+            )
+
+
+def _probe(builder: SectionBuilder) -> int:
+    examples = builder.build_examples()
+    json.dumps(examples, ensure_ascii=False, indent=2)
+    return len(examples)
+
+
+def estimate_section(builder: SectionBuilder, probe_size: int = DEFAULT_PROBE_SIZE) -> SectionEstimate:
+    """Extrapolate one builder's time and memory from a small probe run."""
+    return _estimate_section(builder, probe_size)[0]
+
+
+def _estimate_section(builder: SectionBuilder, probe_size: int) -> Tuple[SectionEstimate, FrozenSet[str]]:
+    """The estimate plus the config fields the builder read."""
+    planned = builder.planned_count
+    probe_n = min(planned, probe_size)
+    if probe_n <= 0:
+        return SectionEstimate(builder.section_key, 0, 0.0, 0), frozenset()
+    cfg = builder.config
+    probe_cfg = dataclasses.replace(
+        cfg,
+        sample_scale=1.0,
+        section_samples={**(cfg.section_samples or {}), builder.section_key: probe_n},
+    )
+    probe = builder.with_config(probe_cfg)
+
+    # Warm up first so one-off work (cached graphs, scenario files...) is not
+    # extrapolated as if it were a per-example cost. The warm-up also records
+    # the fields read, as the section memo does.
+    recorder = ConfigAccessRecorder(probe_cfg)
+    _probe(probe.with_config(recorder))  # type: ignore[arg-type]
+    tracemalloc.start()
+    try:
+        _probe(probe)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    start = time.perf_counter()
+    produced = _probe(probe)
+    elapsed = time.perf_counter() - start
+
+    # A builder that returns fewer examples than asked without declaring a
+    # cap has a fixed size anyway and will not grow with scale.
+    examples = produced if produced < probe_n else planned
+    per_example = max(produced, 1)
+    estimate = SectionEstimate(
+        section=builder.section_key,
+        examples=examples,
+        seconds=elapsed / per_example * examples,
+        bytes=int(peak / per_example * examples),
+    )
+    return estimate, recorder.accessed
+
+
+def estimate_run(
+    builders: Sequence[SectionBuilder],
+    probe_size: int = DEFAULT_PROBE_SIZE,
+    shared: bool = False,
+    retain_all: bool = False,
+) -> RunEstimate:
+    """Estimate the cost of running ``builders`` at their configured sizes.
+
+    Parameters
+    ----------
+    builders: sequence of SectionBuilder
+        Builders in the order they will run.
+    probe_size: int, optional
+        Examples per probe run.
+    shared: bool, optional
+        Whether outputs are shared through a section memo.
+    retain_all: bool, optional
+        Whether the memo keeps every output (watch mode) rather than only
+        those a later builder reuses.
+    """
+    probed = [_estimate_section(b, probe_size) for b in builders]
+    sections = [estimate for estimate, _ in probed]
+    if not shared:
+        return RunEstimate(sections)
+
+    # An output is held from right after its first build until its last
+    # reuse (or the end of the run with retain_all); a difference array keeps
+    # this linear in the number of sections.
+    keys = [memo_key(b, tuple(sorted(names))) for b, (_, names) in zip(builders, probed)]
+    first: Dict[Hashable, int] = {}
+    last: Dict[Hashable, int] = {}
+    for i, key in enumerate(keys):
+        first.setdefault(key, i)
+        last[key] = i
+    delta = [0] * (len(keys) + 1)
+    for key, i in first.items():
+        end = len(keys) if retain_all else last[key]
+        if end > i + 1:
+            delta[i + 1] += sections[i].bytes
+            delta[end] -= sections[i].bytes
+    retained: List[int] = []
+    held = 0
+    for i, key in enumerate(keys):
+        held += delta[i]
+        # A reuse of the held output is already counted as the section itself.
+        own = sections[first[key]].bytes if first[key] < i and (retain_all or i < last[key]) else 0
+        retained.append(held - own)
+    return RunEstimate(sections, tuple(retained))
@@ -3,11 +3,22 @@
 from __future__ import annotations
 
 import argparse
+import dataclasses
+import sys
+import time
 from pathlib import Path
+from typing import List
 
-from .domain_config import load_domain_config
+from .budget import BudgetExceededError
+from .domain_config import DomainConfig, load_domain_configs
 from .factory import SectionBuilderFactory
-from .generator import DatasetGenerator
+from .generator import DatasetGenerator, SectionResult
+from .manifest import MANIFEST_FILE_NAME, build_manifest, write_manifest
+from .preview import preview_examples, print_examples, sample_examples
+from .profiling import DEFAULT_SAMPLE_INTERVAL, PROFILE_MODES, SectionProfiler
+from .progress import PROGRESS_MODES, ProgressReporter
+from .splits import parse_split_ratios
+from .watch import DEFAULT_POLL_INTERVAL, Watcher, watch
 
 
 def main() -> None:
@@ -15,8 +26,117 @@ def main() -> None:
         description="Generate LLaMAFactory SFT datasets from YAML config."
     )
     parser.add_argument("--config", required=True, help="Path to config.yaml")
-    parser.add_argument("--domain", required=True, help="Domain id from config.yaml")
-    parser.add_argument("--out-dir", required=True, help="Output directory for JSON files")
+    parser.add_argument(
+        "--domain",
+        required=True,
+        nargs="+",
+        help="Domain id(s) from config.yaml, or 'all'. With several domains each is "
+        "written to <out-dir>/<domain id>",
+    )
+    parser.add_argument(
+        "--out-dir", help="Output directory for JSON files (not needed with --preview / --sample)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Root seed for randomized sampling; each (domain, section, shard) gets "
+        "an independent, reproducible substream",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=None,
+        help="Multiplier for every section's sample count (overrides sample_scale in config)",
+    )
+    parser.add_argument(
+        "--max-memory-mb",
+        type=float,
+        default=None,
+        help="Refuse to start if the estimated peak memory exceeds this (overrides config)",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=None,
+        help="Refuse to start if the estimated run time exceeds this (overrides config)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the pre-run estimate and exit without generating",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help=f"Record peak allocations per section with tracemalloc in {MANIFEST_FILE_NAME} "
+        "(slows generation down)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=PROFILE_MODES,
+        default=None,
+        help="Profile each section's build and save separately into <out-dir>/profiles "
+        "(<section>.pstats and <section>.collapsed.txt for flamegraphs). 'sample' "
+        "uses a low-overhead stack sampler and writes only the collapsed stacks",
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=DEFAULT_SAMPLE_INTERVAL,
+        help="Seconds between stack samples with --profile sample (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--progress",
+        choices=PROGRESS_MODES,
+        default="auto",
+        help="Live progress on stderr: a status line on a terminal, JSON lines otherwise "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--splits",
+        type=parse_split_ratios,
+        default=None,
+        metavar="NAME=RATIO,...",
+        help="Write hash-assigned split files, e.g. train=0.9,val=0.05,test=0.05 "
+        "(overrides splits in config)",
+    )
+    parser.add_argument(
+        "--stratify",
+        default=None,
+        metavar="FIELD,...",
+        help="Metadata fields to stratify splits by, e.g. section,complexity,is_negative_example "
+        "(overrides split_stratify in config)",
+    )
+    look = parser.add_mutually_exclusive_group()
+    look.add_argument(
+        "--preview",
+        type=int,
+        metavar="K",
+        help="Print the first K examples of every section (built at size K) and exit "
+        "without writing files",
+    )
+    look.add_argument(
+        "--sample",
+        type=int,
+        metavar="K",
+        help="Print K examples drawn uniformly from every section at full size and exit "
+        "without writing files",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After generating, keep running and regenerate only the domains and sections "
+        "affected by edits to the config or src/sections",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help="Seconds between change polls with --watch (default: %(default)s)",
+    )
     args = parser.parse_args()
 
     # Validate config file exists
@@ -24,28 +144,121 @@ def main() -> None:
     if not config_path.exists():
         raise FileNotFoundError(f"Config file not found: {config_path}")
 
-    # Validate output directory is writable
-    out_dir = Path(args.out_dir)
-    out_dir.mkdir(parents=True, exist_ok=True)
-    if not out_dir.is_dir():
-        raise ValueError(f"Output path exists but is not a directory: {out_dir}")
-
-    # Test write permissions
-    test_file = out_dir / ".write_test"
-    try:
-        test_file.touch()
-        test_file.unlink()
-    except (OSError, PermissionError) as e:
-        raise PermissionError(f"Output directory is not writable: {out_dir}") from e
-
-    try:
-        cfg = load_domain_config(config_path, args.domain)
-    except ValueError as e:
-        raise ValueError(f"Failed to load domain config: {e}") from e
-
-    factory = SectionBuilderFactory(include_expense_docs=True)
-    generator = DatasetGenerator(factory)
-    generator.generate_for_domain(cfg, out_dir)
+    # --preview / --sample only print, so they need no output directory.
+    inspect_only = args.preview is not None or args.sample is not None
+    if args.out_dir is None and not inspect_only:
+        parser.error("the following arguments are required: --out-dir")
+
+    if not inspect_only:
+        # Validate output directory is writable
+        out_dir = Path(args.out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        if not out_dir.is_dir():
+            raise ValueError(f"Output path exists but is not a directory: {out_dir}")
+
+        # Test write permissions
+        test_file = out_dir / ".write_test"
+        try:
+            test_file.touch()
+            test_file.unlink()
+        except (OSError, PermissionError) as e:
+            raise PermissionError(f"Output directory is not writable: {out_dir}") from e
+
+    def load_selected() -> List[DomainConfig]:
+        try:
+            configs = load_domain_configs(config_path)
+        except (ValueError, KeyError) as e:
+            raise ValueError(f"Failed to load domain config: {e}") from e
+        domain_ids = list(configs) if args.domain == ["all"] else args.domain
+        missing = [d for d in domain_ids if d not in configs]
+        if missing:
+            raise ValueError(f"Failed to load domain config: Domain id(s) {missing} not found in {config_path}")
+        cfgs = [configs[d] for d in domain_ids]
+        if args.scale is not None:
+            cfgs = [dataclasses.replace(cfg, sample_scale=args.scale) for cfg in cfgs]
+        if args.splits is not None:
+            cfgs = [dataclasses.replace(cfg, splits=args.splits) for cfg in cfgs]
+        if args.stratify is not None:
+            stratify = [f.strip() for f in args.stratify.split(",") if f.strip()]
+            cfgs = [dataclasses.replace(cfg, split_stratify=stratify) for cfg in cfgs]
+        return cfgs
+
+    # Created before the first run so edits made while it runs are picked up.
+    watcher = Watcher(config_path, args.watch_interval) if args.watch else None
+    cfgs = load_selected()
+    # The layout follows what was asked for, not how many domains resolved:
+    # ``all`` always writes OUT_DIR/<id>, even for a single-domain config.
+    multi_domain = args.domain == ["all"] or len(args.domain) > 1
+
+    factory = SectionBuilderFactory(include_expense_docs=True, seed=args.seed)
+    if inspect_only:
+        for cfg in cfgs:
+            for builder in factory.create_builders(cfg):
+                if args.preview is not None:
+                    title, examples = "first", preview_examples(builder, args.preview)
+                else:
+                    title, examples = "sampled", sample_examples(builder, args.sample)
+                print_examples(f"{cfg.id} / {builder.section_key} ({len(examples)} {title})", examples, sys.stdout)
+        return
+
+    profiler = (
+        SectionProfiler(out_dir / "profiles", args.profile, args.profile_interval)
+        if args.profile
+        else None
+    )
+    progress = (
+        ProgressReporter(json_lines=None if args.progress == "auto" else args.progress == "json")
+        if args.progress != "off"
+        else None
+    )
+    generator = DatasetGenerator(
+        factory,
+        trace_memory=args.trace_memory,
+        profiler=profiler,
+        progress=progress,
+        skip_unchanged=args.watch,
+    )
+
+    # Estimate before generating whenever a budget applies (or was asked for);
+    # the tightest configured budget across the selected domains wins.
+    max_memory_mb = args.max_memory_mb
+    if max_memory_mb is None:
+        max_memory_mb = min((c.max_memory_mb for c in cfgs if c.max_memory_mb is not None), default=None)
+    max_seconds = args.max_seconds
+    if max_seconds is None:
+        max_seconds = min((c.max_seconds for c in cfgs if c.max_seconds is not None), default=None)
+    if args.dry_run or max_memory_mb is not None or max_seconds is not None:
+        estimate = generator.estimate_for_domains(cfgs)
+        print(estimate.summary())
+        try:
+            estimate.check(max_memory_mb=max_memory_mb, max_seconds=max_seconds)
+        except BudgetExceededError as e:
+            parser.exit(1, f"{e}\n")
+        if args.dry_run:
+            return
+
+    def generate(selected: List[DomainConfig]) -> List[SectionResult]:
+        # Several domains each get a subdirectory, also when watch mode only
+        # regenerates one of them.
+        if multi_domain:
+            return generator.generate_for_domains(selected, out_dir)
+        return [r for cfg in selected for r in generator.generate_for_domain(cfg, out_dir)]
+
+    start = time.perf_counter()
+    results = generate(cfgs)
+    manifest = build_manifest(
+        results, cfgs, time.perf_counter() - start, config_path=config_path, seed=args.seed
+    )
+    write_manifest(out_dir / MANIFEST_FILE_NAME, manifest)
+    print(f"Wrote run manifest -> {out_dir / MANIFEST_FILE_NAME}")
+    if profiler is not None:
+        print(f"Wrote {len(profiler.written)} profile files -> {profiler.out_dir}")
+
+    if watcher is not None:
+        try:
+            watch(generator, watcher, cfgs, load_selected, generate)
+        except KeyboardInterrupt:
+            pass
 
 
 if __name__ == "__main__":
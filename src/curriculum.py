@@ -0,0 +1,233 @@
+# dataset_generator/curriculum.py
+"""
+Curriculum export: the combined dataset ordered easy to hard.
+
+    python -m src.curriculum training-jsons --out curriculum.jsonl
+
+Every example's metadata carries a ``complexity`` tier. This orders all
+examples of the given directories (section files of one or more domains) or
+files (``.json`` arrays or ``.jsonl``, e.g. a mix) by tier (low, medium,
+high, then anything else), then by estimated length in whitespace tokens,
+then by a stable content hash, and writes one JSONL file for sequential
+curriculum training.
+
+The sort is external: sorted runs of at most ``--max-in-memory`` examples are
+spilled to temporary JSONL files and merged ``--fan-in`` at a time, so memory
+is bounded whatever the dataset size. Each run line stores the sort key next
+to the example, so keys are computed once. The hash makes the order a pure
+function of the content and input order: the same files always give the same
+output, however many runs the sort spills.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import json
+import tempfile
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .mixer import discover_sections
+from .utils import approx_tokens, content_key, iter_json_array
+
+
+COMPLEXITY_ORDER = ("low", "medium", "high")
+DEFAULT_MAX_IN_MEMORY = 100_000
+DEFAULT_FAN_IN = 64
+
+SortKey = Tuple[int, int, str]
+
+_TIER = {name: rank for rank, name in enumerate(COMPLEXITY_ORDER)}
+
+
+def curriculum_key(example: Dict[str, Any]) -> SortKey:
+    """(complexity tier, estimated length, content hash) of an example."""
+    complexity = (example.get("metadata") or {}).get("complexity")
+    digest = hashlib.blake2b(content_key(example).encode("utf-8"), digest_size=8, person=b"curriculum")
+    return _TIER.get(complexity, len(COMPLEXITY_ORDER)), approx_tokens(example), digest.hexdigest()
+
+
+@dataclass
+class SortStats:
+    examples: int = 0
+    runs: int = 0
+    merge_passes: int = 0
+    tiers: Counter = field(default_factory=Counter)
+
+
+def _write_run(path: Path, keyed: Iterable[Tuple[SortKey, Dict[str, Any]]]) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        for key, ex in keyed:
+            f.write(json.dumps([key, ex], ensure_ascii=False))
+            f.write("\n")
+
+
+def _read_run(path: Path) -> Iterator[Tuple[SortKey, Dict[str, Any]]]:
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            key, ex = json.loads(line)
+            yield tuple(key), ex
+
+
+def _merge(paths: Sequence[Path]) -> Iterator[Tuple[SortKey, Dict[str, Any]]]:
+    # Ties keep run order (heapq.merge is stable), as a single sort would.
+    return heapq.merge(*(_read_run(p) for p in paths), key=lambda item: item[0])
+
+
+def external_sort(
+    items: Iterable[Dict[str, Any]],
+    key: Callable[[Dict[str, Any]], SortKey] = curriculum_key,
+    max_in_memory: int = DEFAULT_MAX_IN_MEMORY,
+    fan_in: int = DEFAULT_FAN_IN,
+    tmp_dir: Optional[Path] = None,
+    stats: Optional[SortStats] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield ``items`` ordered by ``key`` holding at most ``max_in_memory`` in memory.
+
+    Parameters
+    ----------
+    items: iterable of dict
+        Examples in any order.
+    key: callable, optional
+        JSON-serializable sort key; defaults to the curriculum order.
+    max_in_memory: int, optional
+        Examples per sorted run.
+    fan_in: int, optional
+        Runs merged at once; more runs are merged in several passes.
+    tmp_dir: Path, optional
+        Where the runs are spilled (default: the system temp dir).
+    stats: SortStats, optional
+        Filled in with counts as the sort proceeds.
+    """
+    if max_in_memory < 1 or fan_in < 2:
+        raise ValueError("max_in_memory must be >= 1 and fan_in >= 2")
+    stats = stats if stats is not None else SortStats()
+    with tempfile.TemporaryDirectory(prefix="curriculum-", dir=tmp_dir) as tmp:
+        tmp_path = Path(tmp)
+        runs: List[Path] = []
+        buffer: List[Tuple[SortKey, Dict[str, Any]]] = []
+
+        def spill() -> None:
+            buffer.sort(key=lambda item: item[0])
+            run = tmp_path / f"run-{stats.runs:06d}.jsonl"
+            _write_run(run, buffer)
+            runs.append(run)
+            stats.runs += 1
+            buffer.clear()
+
+        for ex in items:
+            k = key(ex)
+            buffer.append((k, ex))
+            stats.examples += 1
+            stats.tiers[k[0]] += 1
+            if len(buffer) >= max_in_memory:
+                spill()
+
+        if not runs:  # everything fit: no disk round trip
+            buffer.sort(key=lambda item: item[0])
+            for _, ex in buffer:
+                yield ex
+            return
+        if buffer:
+            spill()
+
+        while len(runs) > fan_in:
+            stats.merge_passes += 1
+            merged: List[Path] = []
+            for start in range(0, len(runs), fan_in):
+                group = runs[start:start + fan_in]
+                out = tmp_path / f"pass{stats.merge_passes}-{len(merged):06d}.jsonl"
+                _write_run(out, _merge(group))
+                for p in group:
+                    p.unlink()
+                merged.append(out)
+            runs = merged
+        stats.merge_passes += 1
+        for _, ex in _merge(runs):
+            yield ex
+
+
+def _iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def dataset_files(inputs: Sequence[Path], split: Optional[str] = None) -> List[Path]:
+    """Section files under ``inputs``.
+
+    Directories contribute their section files (and those of their domain
+    subdirectories, for multi-domain output); files are taken as given.
+    """
+    files: List[Path] = []
+    for path in inputs:
+        if path.is_dir():
+            dirs = [path] + sorted(p for p in path.iterdir() if p.is_dir())
+            for d in dirs:
+                files.extend(sorted(discover_sections(d, split).values()))
+        elif path.exists():
+            files.append(path)
+        else:
+            raise FileNotFoundError(path)
+    return files
+
+
+def iter_examples(files: Sequence[Path]) -> Iterator[Dict[str, Any]]:
+    for path in files:
+        yield from (_iter_jsonl(path) if path.suffix == ".jsonl" else iter_json_array(path))
+
+
+def write_curriculum(
+    files: Sequence[Path],
+    out_path: Path,
+    max_in_memory: int = DEFAULT_MAX_IN_MEMORY,
+    fan_in: int = DEFAULT_FAN_IN,
+    tmp_dir: Optional[Path] = None,
+) -> SortStats:
+    """Sort the examples of ``files`` into ``out_path`` as JSONL."""
+    stats = SortStats()
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("w", encoding="utf-8") as f:
+        for ex in external_sort(iter_examples(files), curriculum_key, max_in_memory, fan_in, tmp_dir, stats):
+            f.write(json.dumps(ex, ensure_ascii=False))
+            f.write("\n")
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Order a dataset by complexity for curriculum training.")
+    parser.add_argument("inputs", nargs="+", help="Output directories or .json/.jsonl files")
+    parser.add_argument("--out", required=True, help="Output JSONL file")
+    parser.add_argument("--split", help="Use the <section>.<split>.json files, e.g. train")
+    parser.add_argument("--max-in-memory", type=int, default=DEFAULT_MAX_IN_MEMORY,
+                        help=f"Examples per sorted run (default: {DEFAULT_MAX_IN_MEMORY})")
+    parser.add_argument("--fan-in", type=int, default=DEFAULT_FAN_IN,
+                        help=f"Runs merged at once (default: {DEFAULT_FAN_IN})")
+    parser.add_argument("--tmp-dir", help="Directory for sorted runs (default: system temp)")
+    args = parser.parse_args(argv)
+
+    try:
+        files = dataset_files([Path(p) for p in args.inputs], args.split)
+    except FileNotFoundError as e:
+        parser.error(f"No such file or directory: {e}")
+    if not files:
+        parser.error("No dataset files found")
+    stats = write_curriculum(
+        files, Path(args.out), args.max_in_memory, args.fan_in,
+        Path(args.tmp_dir) if args.tmp_dir else None,
+    )
+    tiers = ", ".join(
+        f"{COMPLEXITY_ORDER[t] if t < len(COMPLEXITY_ORDER) else 'other'}={n}"
+        for t, n in sorted(stats.tiers.items())
+    )
+    print(f"Sorted {stats.examples} examples from {len(files)} files ({tiers}) "
+          f"in {stats.runs} run(s), {stats.merge_passes} merge pass(es) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# dataset_generator/dialogue_graph.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, Tuple
+
+import yaml
+
+
+# -----------------------------------------------------------------------------
+# Branching multi-turn dialogues
+#
+# A conversation is described as a directed acyclic graph of turns. Each node
+# has a role, one or more interchangeable phrasings (``variants``) and a list of
+# possible follow-up nodes (``next``). A dialogue is a path from one of the
+# ``roots`` to a node without successors, choosing one variant per node. The
+# number of paths grows multiplicatively with branching, so a small YAML file
+# describes thousands of distinct dialogues. Path counts are memoized per node,
+# which lets any path be decoded directly from its index without enumerating
+# the tree.
+#
+# YAML layout::
+#
+#     roots: [approval_q]
+#     nodes:
+#       approval_q:
+#         role: user
+#         variants: ["Who approves expense reports above the threshold?"]
+#         next: [approval_a]
+#       approval_a:
+#         role: assistant
+#         variants: ["The Finance Controller approves them."]
+#         next: []
+
+
+@dataclass(frozen=True)
+class DialogueNode:
+    """A single turn with alternative phrasings and possible follow-ups."""
+
+    id: str
+    role: str
+    variants: Tuple[str, ...]
+    next: Tuple[str, ...] = ()
+
+
+class DialogueGraph(Sequence[List[Dict[str, str]]]):
+    """Index-addressable set of all root-to-leaf paths through a turn graph.
+
+    ``len(graph)`` is the number of distinct dialogues and ``graph[i]`` decodes
+    the ``i``-th one as a list of ``{"role", "content"}`` messages. Nothing is
+    enumerated up front; only per-node path counts are computed and cached.
+
+    Parameters
+    ----------
+    nodes: mapping of str to DialogueNode
+        All nodes of the graph keyed by id.
+    roots: sequence of str
+        Ids of the nodes conversations may start from.
+    """
+
+    ROLES = ("user", "assistant")
+
+    def __init__(self, nodes: Mapping[str, DialogueNode], roots: Sequence[str]) -> None:
+        self._nodes = dict(nodes)
+        self._roots = tuple(roots)
+        self._counts: Dict[str, int] = {}
+        self._validate()
+        self._size = sum(self._count(root) for root in self._roots)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "DialogueGraph":
+        """Build a graph from the parsed YAML structure described above."""
+        raw_nodes = data.get("nodes") or {}
+        nodes = {
+            node_id: DialogueNode(
+                id=node_id,
+                role=spec["role"],
+                variants=tuple(spec["variants"]),
+                next=tuple(spec.get("next") or ()),
+            )
+            for node_id, spec in raw_nodes.items()
+        }
+        return cls(nodes, data.get("roots") or [])
+
+    @classmethod
+    def from_yaml(cls, path: Path) -> "DialogueGraph":
+        """Load a graph from a YAML file."""
+        with Path(path).open("r", encoding="utf-8") as f:
+            return cls.from_dict(yaml.safe_load(f) or {})
+
+    def _validate(self) -> None:
+        if not self._roots:
+            raise ValueError("Dialogue graph must define at least one root")
+        for node in self._nodes.values():
+            if node.role not in self.ROLES:
+                raise ValueError(f"Node '{node.id}' has invalid role '{node.role}'")
+            if not node.variants:
+                raise ValueError(f"Node '{node.id}' must define at least one variant")
+        missing = sorted(
+            ({ref for node in self._nodes.values() for ref in node.next} | set(self._roots))
+            - set(self._nodes)
+        )
+        if missing:
+            raise ValueError(f"Dialogue graph references unknown nodes: {missing}")
+        # Reject cycles, which would make the number of paths infinite.
+        state: Dict[str, int] = {}  # 1 = on the current DFS stack, 2 = done
+        for start in self._nodes:
+            stack: List[Tuple[str, Iterator[str]]] = []
+            if state.get(start):
+                continue
+            state[start] = 1
+            stack.append((start, iter(self._nodes[start].next)))
+            while stack:
+                node_id, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    state[node_id] = 2
+                    stack.pop()
+                elif state.get(child) == 1:
+                    raise ValueError(f"Dialogue graph has a cycle through '{child}'")
+                elif not state.get(child):
+                    state[child] = 1
+                    stack.append((child, iter(self._nodes[child].next)))
+
+    def _count(self, node_id: str) -> int:
+        """Number of distinct paths starting at ``node_id`` (memoized)."""
+        cached = self._counts.get(node_id)
+        if cached is not None:
+            return cached
+        node = self._nodes[node_id]
+        tails = sum(self._count(child) for child in node.next) if node.next else 1
+        count = len(node.variants) * tails
+        self._counts[node_id] = count
+        return count
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> List[Dict[str, str]]:  # type: ignore[override]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(f"Index {index} out of range for {self._size} dialogues")
+        node_id, index = self._descend(self._roots, index)
+        messages: List[Dict[str, str]] = []
+        while True:
+            node = self._nodes[node_id]
+            tails = self._count(node_id) // len(node.variants)
+            variant, index = divmod(index, tails)
+            messages.append({"role": node.role, "content": node.variants[variant]})
+            if not node.next:
+                return messages
+            node_id, index = self._descend(node.next, index)
+
+    def _descend(self, candidates: Sequence[str], index: int) -> Tuple[str, int]:
+        """Select the candidate whose block of paths contains ``index``.
+
+        Returns the candidate id and ``index`` relative to that candidate.
+        """
+        for node_id in candidates:
+            count = self._count(node_id)
+            if index < count:
+                return node_id, index
+            index -= count
+        raise IndexError(index)
+
+    def __iter__(self) -> Iterator[List[Dict[str, str]]]:
+        for i in range(self._size):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        return f"DialogueGraph(nodes={len(self._nodes)}, roots={len(self._roots)}, paths={self._size})"
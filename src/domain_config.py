@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
+import itertools
+import json
+import os
+import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
 
 import yaml
 
@@ -25,42 +30,382 @@ class DomainConfig:
     currencies: Optional[List[str]] = None
     # New field
     company_kb_facts: Optional[List[str]] = None
+    # Optional YAML turn graph for multi-turn dialogues (see dialogue_graph.py)
+    dialogue_graph: Optional[str] = None
+    # Optional YAML routing scenarios for the operator builders (see operator_routing.py)
+    operator_scenarios: Optional[str] = None
+    # Log-scale std-dev of the noise applied to operator scores (0 disables it)
+    operator_score_noise: float = 0.05
+    # Per-label confidences in advanced entity classification: "full", "top_k" or "sparse"
+    label_confidence_mode: str = "full"
+    label_confidence_top_k: int = 5
     # Sample counts for section builders (configurable via YAML or defaults)
     intro_samples: int = 100
     operator_samples: int = 100
     rag_context_samples: int = 200
     business_integration_samples: int = 100
     hard_negatives_samples: int = 28
+    # Key for the RNG substreams (defaults to id); domains sharing a key draw
+    # the same samples, so sections that read nothing else can be reused
+    sampling_key: Optional[str] = None
+    # Per-section sample counts keyed by SectionBuilder.section_key; they take
+    # precedence over the fields above and the builders' defaults
+    section_samples: Optional[Dict[str, int]] = None
+    # Multiplier applied to every section's sample count
+    sample_scale: float = 1.0
+    # Pre-run budget; generation refuses to start if the estimate exceeds it
+    max_memory_mb: Optional[float] = None
+    max_seconds: Optional[float] = None
+    # Write train/val/test files instead of one file per section, e.g.
+    # {"train": 0.9, "val": 0.05, "test": 0.05}; optionally stratified by
+    # metadata fields such as section, complexity or is_negative_example
+    splits: Optional[Dict[str, float]] = None
+    split_stratify: Optional[List[str]] = None
+
+
+# YAML parsing dominates start-up for large configs, so prefer the libyaml
+# C loader when PyYAML was built with it.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Snapshots of parsed configs are kept next to the config file and reused
+# while the file is unchanged. They hold plain JSON data only (never pickles,
+# which would execute whatever a writable cache directory contains); the
+# schema covers the layout version and this module's source.
+SNAPSHOT_DIR_NAME = ".config_cache"
+_SNAPSHOT_VERSION = 3
+
+# In-process cache: resolved path -> (mtime_ns, size, configs)
+_loaded: Dict[str, Tuple[int, int, "DomainConfigs"]] = {}
+
+
+def _domain_from_dict(d: Dict[str, Any], config_path: Path) -> DomainConfig:
+    return DomainConfig(
+        id=d["id"],
+        company_name=d["company_name"],
+        agent_name=d["agent_name"],
+        chat_agent_name=d["chat_agent_name"],
+        domain_name=d["domain_name"],
+        kb_label=d["kb_label"],
+        primary_products=d["primary_products"],
+        primary_roles=d["primary_roles"],
+        primary_regions=d["primary_regions"],
+        entity_types=d["entity_types"],
+        expense_doc_types=d.get("expense_doc_types"),
+        currencies=d.get("currencies"),
+        company_kb_facts=d.get("company_kb_facts"),
+        # Relative paths are resolved against the config file's directory
+        dialogue_graph=(
+            str(config_path.resolve().parent / d["dialogue_graph"])
+            if d.get("dialogue_graph") else None
+        ),
+        operator_scenarios=(
+            str(config_path.resolve().parent / d["operator_scenarios"])
+            if d.get("operator_scenarios") else None
+        ),
+        operator_score_noise=d.get("operator_score_noise", 0.05),
+        label_confidence_mode=d.get("label_confidence_mode", "full"),
+        label_confidence_top_k=d.get("label_confidence_top_k", 5),
+        intro_samples=d.get("intro_samples", 100),
+        operator_samples=d.get("operator_samples", 100),
+        rag_context_samples=d.get("rag_context_samples", 200),
+        business_integration_samples=d.get("business_integration_samples", 100),
+        hard_negatives_samples=d.get("hard_negatives_samples", 28),
+        sampling_key=d.get("sampling_key"),
+        section_samples=d.get("section_samples"),
+        sample_scale=d.get("sample_scale", 1.0),
+        max_memory_mb=d.get("max_memory_mb"),
+        max_seconds=d.get("max_seconds"),
+        splits=d.get("splits"),
+        split_stratify=d.get("split_stratify"),
+    )
+
+
+# -----------------------------------------------------------------------------
+# Overlays and matrices
+#
+# Tenant domains usually differ from a base domain in a few fields. A domain
+# entry may therefore:
+#
+# * ``extends: <id>`` another entry, overriding only the keys it sets (nested
+#   mappings such as ``section_samples`` are merged, lists are replaced);
+# * set ``abstract: true`` to serve only as a base, without being generated;
+# * declare a ``matrix`` mapping field names to alternative values. The entry
+#   expands into one domain per combination, with ids ``<id>-<suffix>...``.
+#   Values are given as a list (suffixes derived from the values) or as a
+#   mapping of suffix to value. Variants share the entry's ``sampling_key``
+#   (its id by default), so sections that do not depend on the varied fields
+#   are built once for the whole matrix.
+#
+#     - id: expense_tenant
+#       extends: expense
+#       matrix:
+#         primary_regions: {uae: ["UAE"], india: ["India"]}
+#         currencies: [["AED"], ["INR"]]
+
+_DIRECTIVES = ("extends", "abstract", "matrix")
+
+
+def _merge(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+    merged = dict(base)
+    for key, value in overlay.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _resolve_extends(
+    raw: List[Dict[str, Any]]
+) -> List[Tuple[Dict[str, Any], Union[Dict[str, Any], ValueError]]]:
+    """Apply ``extends`` overlays; bases may appear anywhere in the file.
+
+    Every entry is paired with its resolved fields, or with the error that
+    kept it from resolving (unknown or cyclic base).
+    """
+    by_id: Dict[Any, Dict[str, Any]] = {}
+    for d in raw:
+        by_id.setdefault(d.get("id"), d)
+    resolved: Dict[Any, Dict[str, Any]] = {}
+
+    def resolve(d: Dict[str, Any], chain: Tuple[Any, ...]) -> Dict[str, Any]:
+        domain_id = d.get("id")
+        if domain_id in chain:
+            raise ValueError(f"Cyclic 'extends' chain: {' -> '.join(map(str, chain + (domain_id,)))}")
+        if domain_id in resolved and by_id.get(domain_id) is d:
+            return resolved[domain_id]
+        parent_id = d.get("extends")
+        if parent_id is None:
+            out = dict(d)
+        elif parent_id not in by_id:
+            raise ValueError(f"Domain '{domain_id}' extends unknown domain '{parent_id}'")
+        else:
+            parent = resolve(by_id[parent_id], chain + (domain_id,))
+            # Inheritance never carries over the parent's own directives.
+            parent = {k: v for k, v in parent.items() if k not in ("abstract", "matrix")}
+            out = _merge(parent, d)
+        if by_id.get(domain_id) is d:
+            resolved[domain_id] = out
+        return out
+
+    out: List[Tuple[Dict[str, Any], Union[Dict[str, Any], ValueError]]] = []
+    for d in raw:
+        try:
+            out.append((d, resolve(d, ())))
+        except ValueError as e:
+            out.append((d, e))
+    return out
+
+
+def _slug(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return "_".join(_slug(v) for v in value)
+    return re.sub(r"[^0-9a-z]+", "_", str(value).lower()).strip("_")
+
+
+def _expand_matrix(d: Dict[str, Any]) -> List[Dict[str, Any]]:
+    matrix = d.get("matrix")
+    if not matrix:
+        return [d]
+    axes = []
+    for field_name, options in matrix.items():
+        if isinstance(options, dict):
+            axes.append([(str(suffix), field_name, value) for suffix, value in options.items()])
+        else:
+            axes.append([(_slug(value), field_name, value) for value in options])
+        if not axes[-1]:
+            raise ValueError(f"Matrix axis '{field_name}' of domain '{d.get('id')}' is empty")
+    variants = []
+    for combo in itertools.product(*axes):
+        variant = {k: v for k, v in d.items() if k != "matrix"}
+        variant["id"] = "-".join([str(d["id"])] + [suffix for suffix, _, _ in combo])
+        variant.setdefault("sampling_key", d["id"])
+        for _, field_name, value in combo:
+            variant[field_name] = value
+        variants.append(variant)
+    return variants
+
+
+def _parse_domain_entries(raw: bytes) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """Resolved field dicts and per-domain errors, both keyed by domain id.
+
+    An entry whose ``extends`` chain or matrix is broken is recorded as an
+    error for its id (and its variants'), so it only fails when requested.
+    """
+    data = yaml.load(raw, Loader=_YamlLoader) or {}
+    entries: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    for d, resolved in _resolve_extends(data.get("domains", [])):
+        domain_id = d.get("id")
+        if domain_id is None:  # cannot be requested
+            continue
+        domain_id = str(domain_id)
+        if isinstance(resolved, ValueError):
+            errors.setdefault(domain_id, str(resolved))
+            continue
+        if resolved.get("abstract"):
+            continue
+        try:
+            variants = _expand_matrix(resolved)
+        except ValueError as e:
+            errors.setdefault(domain_id, str(e))
+            continue
+        for variant in variants:
+            variant = {k: v for k, v in variant.items() if k not in _DIRECTIVES}
+            # First definition wins, as with the previous linear scan.
+            variant_id = str(variant["id"])
+            if variant_id not in entries and variant_id not in errors:
+                entries[variant_id] = variant
+    return entries, errors
+
+
+class DomainConfigs(Mapping[str, DomainConfig]):
+    """Domains of one config file, built from their entries on first access.
+
+    A malformed domain raises ``ValueError`` only when it is looked up, so it
+    never keeps the other domains of the file from loading.
+
+    Parameters
+    ----------
+    entries: dict of str to dict
+        Resolved fields of every domain, in file order.
+    errors: dict of str to str
+        Domains whose entry could not be resolved, with the reason.
+    config_path: Path
+        Config file; relative paths in the entries are resolved against it.
+    """
+
+    def __init__(self, entries: Dict[str, Dict[str, Any]], errors: Dict[str, str], config_path: Path) -> None:
+        self._entries = entries
+        self._errors = errors
+        self._config_path = config_path
+        self._built: Dict[str, DomainConfig] = {}
+
+    def __getitem__(self, domain_id: str) -> DomainConfig:
+        cfg = self._built.get(domain_id)
+        if cfg is not None:
+            return cfg
+        if domain_id in self._errors:
+            raise ValueError(f"Domain '{domain_id}' in {self._config_path}: {self._errors[domain_id]}")
+        entry = self._entries[domain_id]  # KeyError for unknown ids, as for a dict
+        try:
+            cfg = _domain_from_dict(entry, self._config_path)
+        except KeyError as e:
+            raise ValueError(
+                f"Domain '{domain_id}' in {self._config_path} is missing required field {e.args[0]!r}"
+            ) from None
+        self._built[domain_id] = cfg
+        return cfg
+
+    def __contains__(self, domain_id: object) -> bool:
+        return domain_id in self._entries or domain_id in self._errors
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._entries
+        yield from (d for d in self._errors if d not in self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries) + sum(d not in self._entries for d in self._errors)
+
+
+def _snapshot_path(config_path: Path) -> Path:
+    return config_path.parent / SNAPSHOT_DIR_NAME / f"{config_path.name}.json"
+
+
+def _snapshot_schema() -> List[Any]:
+    # Any change to this module (overlay or matrix semantics included)
+    # invalidates snapshots, so none needs a manual version bump to stay right.
+    return [_SNAPSHOT_VERSION, hashlib.sha256(Path(__file__).read_bytes()).hexdigest()]
+
+
+def _read_snapshot(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        snapshot = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("schema") != _snapshot_schema():
+        return None
+    return snapshot
+
+
+def _write_snapshot(path: Path, snapshot: Dict[str, Any]) -> None:
+    # Best effort: a read-only checkout, or YAML values JSON cannot hold
+    # (timestamps, say), simply run without a snapshot.
+    try:
+        payload = json.dumps(snapshot)
+    except (TypeError, ValueError):
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def load_domain_configs(config_path: Path, use_snapshot: bool = True) -> DomainConfigs:
+    """Load every domain of a config file into a map keyed by domain id.
+
+    The file is parsed at most once per process while it is unchanged, and
+    each domain is built when it is first looked up. With ``use_snapshot`` the
+    resolved domain entries (plain data, after ``extends`` and ``matrix``) are
+    also stored as JSON in ``SNAPSHOT_DIR_NAME`` next to the config, keyed by
+    the file's mtime, size and SHA-256, so later runs skip YAML parsing
+    entirely: an unchanged mtime avoids even reading the file, and a touched
+    but identical file is recognized by its hash. Paths and defaults are
+    applied when a domain is built, so a moved checkout or a changed default
+    never comes back from a stale snapshot.
+
+    Parameters
+    ----------
+    config_path: Path
+        Path to the YAML config.
+    use_snapshot: bool, optional
+        Read and write the on-disk snapshot, by default True.
+
+    Returns
+    -------
+    DomainConfigs
+        Domains in file order.
+    """
+    config_path = Path(config_path)
+    key = str(config_path.resolve())
+    st = config_path.stat()
+    cached = _loaded.get(key)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+
+    snapshot_path = _snapshot_path(config_path)
+    snapshot = _read_snapshot(snapshot_path) if use_snapshot else None
+    if snapshot is not None and (snapshot["mtime_ns"], snapshot["size"]) == (st.st_mtime_ns, st.st_size):
+        entries, errors = snapshot["entries"], snapshot["errors"]
+    else:
+        raw = config_path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if snapshot is not None and snapshot["sha256"] == digest:
+            entries, errors = snapshot["entries"], snapshot["errors"]
+        else:
+            entries, errors = _parse_domain_entries(raw)
+        if use_snapshot:
+            _write_snapshot(snapshot_path, {
+                "schema": _snapshot_schema(),
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "sha256": digest,
+                "entries": entries,
+                "errors": errors,
+            })
+
+    configs = DomainConfigs(entries, errors, config_path)
+    _loaded[key] = (st.st_mtime_ns, st.st_size, configs)
+    return configs
 
 
 def load_domain_config(config_path: Path, domain_id: str) -> DomainConfig:
     """Infrastructure concern: read YAML and map to DomainConfig."""
-    with config_path.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
-
-    domains = data.get("domains", [])
-    for d in domains:
-        if d.get("id") == domain_id:
-            return DomainConfig(
-                id=d["id"],
-                company_name=d["company_name"],
-                agent_name=d["agent_name"],
-                chat_agent_name=d["chat_agent_name"],
-                domain_name=d["domain_name"],
-                kb_label=d["kb_label"],
-                primary_products=d["primary_products"],
-                primary_roles=d["primary_roles"],
-                primary_regions=d["primary_regions"],
-                entity_types=d["entity_types"],
-                expense_doc_types=d.get("expense_doc_types"),
-                currencies=d.get("currencies"),
-                company_kb_facts=d.get("company_kb_facts"),
-                intro_samples=d.get("intro_samples", 100),
-                operator_samples=d.get("operator_samples", 100),
-                rag_context_samples=d.get("rag_context_samples", 200),
-                business_integration_samples=d.get("business_integration_samples", 100),
-                hard_negatives_samples=d.get("hard_negatives_samples", 28),
-            )
-
-    raise ValueError(f"Domain id '{domain_id}' not found in {config_path}")
-   
\ No newline at end of file
+    configs = load_domain_configs(config_path)
+    try:
+        return configs[domain_id]
+    except KeyError:
+        raise ValueError(f"Domain id '{domain_id}' not found in {config_path}") from None
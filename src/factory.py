@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
 from .domain_config import DomainConfig
+from .sampling import RngStreams
 from .sections import (
     SectionBuilder,
     IntroTrainingBuilder,
@@ -31,8 +32,11 @@ class SectionBuilderFactory:
     Decides which SectionBuilder implementations to use for a given domain.
     """
 
-    def __init__(self, include_expense_docs: bool = True) -> None:
+    def __init__(self, include_expense_docs: bool = True, seed: Optional[int] = None) -> None:
         self._include_expense_docs = include_expense_docs
+        # Every builder draws from its own (domain, section, shard) substream of
+        # the run seed, so output is reproducible however the work is split.
+        self._rng_streams = RngStreams(seed)
 
     def create_builders(self, cfg: DomainConfig) -> List[SectionBuilder]:
         """Assemble a list of section builders for a given domain.
@@ -54,23 +58,24 @@ class SectionBuilderFactory:
         list of SectionBuilder
             An ordered list of instantiated section builders.
         """
+        streams = self._rng_streams
         builders: List[SectionBuilder] = []
 
         # Always include core sections
         builders.extend([
-            IntroTrainingBuilder(cfg),                        # Sections 1 + 2
-            OperatorTrainingBuilder(cfg),                    # Section 3
-            BusinessContextReasoningBuilder(cfg),            # Section 4
-            SafetyGuardrailsTrainingBuilder(cfg),            # Section 5
-            EntityClassificationTrainingBuilder(cfg),        # Section 6
-            HardNegativesTrainingBuilder(cfg),               # Section 6B
-            RagContextTrainingBuilder(cfg),                  # Sections 7 + 8
-            EntityReasoningDepthTrainingBuilder(cfg),        # Section 10
-            CompanyKBTrainingBuilder(cfg),                   # Section 11 (positive)
-            CompanyKBNoHallucinationsTrainingBuilder(cfg),   # Section 11B (negative)
-            AdvancedEntityClassificationTrainingBuilder(cfg),# Section 12
-            AdvancedOperatorDecisionBuilder(cfg),            # Section 13
-            BusinessIntegrationTrainingBuilder(cfg),         # Section 14
+            IntroTrainingBuilder(cfg, streams),                        # Sections 1 + 2
+            OperatorTrainingBuilder(cfg, streams),                    # Section 3
+            BusinessContextReasoningBuilder(cfg, streams),            # Section 4
+            SafetyGuardrailsTrainingBuilder(cfg, streams),            # Section 5
+            EntityClassificationTrainingBuilder(cfg, streams),        # Section 6
+            HardNegativesTrainingBuilder(cfg, streams),               # Section 6B
+            RagContextTrainingBuilder(cfg, streams),                  # Sections 7 + 8
+            EntityReasoningDepthTrainingBuilder(cfg, streams),        # Section 10
+            CompanyKBTrainingBuilder(cfg, streams),                   # Section 11 (positive)
+            CompanyKBNoHallucinationsTrainingBuilder(cfg, streams),   # Section 11B (negative)
+            AdvancedEntityClassificationTrainingBuilder(cfg, streams),# Section 12
+            AdvancedOperatorDecisionBuilder(cfg, streams),            # Section 13
+            BusinessIntegrationTrainingBuilder(cfg, streams),         # Section 14
         ])
 
         # Conditionally include resume intelligence only for domains that
@@ -81,7 +86,7 @@ class SectionBuilderFactory:
         resume_keywords = ["resume", "cv", "talent", "recruit", "career"]
         domain_str = f"{cfg.id} {cfg.domain_name}".lower()
         if any(kw in domain_str for kw in resume_keywords):
-            builders.append(ResumeIntelligenceTrainingBuilder(cfg))
+            builders.append(ResumeIntelligenceTrainingBuilder(cfg, streams))
 
         # Add expense-specific sections when the domain covers expense management.
         # This includes both the expense document extraction and the multi‑turn
@@ -91,7 +96,7 @@ class SectionBuilderFactory:
             cfg.expense_doc_types is not None or "expense" in cfg.domain_name.lower()
         )
         if self._include_expense_docs and is_expense:
-            builders.append(ExpenseDocumentsTrainingBuilder(cfg))
-            builders.append(DialogueExpenseTrainingBuilder(cfg))
+            builders.append(ExpenseDocumentsTrainingBuilder(cfg, streams))
+            builders.append(DialogueExpenseTrainingBuilder(cfg, streams))
 
         return builders
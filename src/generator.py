@@ -2,26 +2,206 @@
 
 from __future__ import annotations
 
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Collection, Dict, Iterator, List, Optional, Sequence
 
+from .budget import DEFAULT_PROBE_SIZE, RunEstimate, estimate_run
 from .domain_config import DomainConfig
 from .factory import SectionBuilderFactory
+from .profiling import SectionProfiler
+from .progress import ProgressReporter
+from .section_memo import SectionMemo
+from .splits import SplitSpec
+from .sections import SectionBuilder
 from .utils import save_json_array
 
 
+@dataclass(frozen=True)
+class SectionResult:
+    """What generating one section of one domain produced, and what it cost."""
+
+    domain: str
+    section: str
+    path: Path
+    examples: int  # built, before validation and deduplication
+    bytes: int  # size of the written dataset file
+    seconds: float  # wall time to build (or reuse) and save
+    reused: bool
+    written: int = 0  # after validation and deduplication
+    # Seconds per stage: build, validate, dedup, stats, write
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    # Peak traced allocations while building and saving; None unless tracing
+    peak_alloc_bytes: Optional[int] = None
+    # Examples per split when the domain writes train/val/test files
+    split_counts: Optional[Dict[str, int]] = None
+    # Output unchanged since the last write (skip_unchanged); nothing written
+    skipped: bool = False
+
+    @property
+    def examples_per_second(self) -> float:
+        return self.written / self.seconds if self.seconds else 0.0
+
+
 class DatasetGenerator:
     """Coordinates building and writing all dataset sections for a domain."""
 
-    def __init__(self, builder_factory: SectionBuilderFactory) -> None:
+    def __init__(
+        self,
+        builder_factory: SectionBuilderFactory,
+        share_sections: bool = True,
+        verbose: bool = True,
+        trace_memory: bool = False,
+        profiler: Optional[SectionProfiler] = None,
+        progress: Optional[ProgressReporter] = None,
+        skip_unchanged: bool = False,
+    ) -> None:
         self._builder_factory = builder_factory
+        self._verbose = verbose
+        # tracemalloc slows building down noticeably, so it is opt-in.
+        self._trace_memory = trace_memory
+        # Profiles each builder and each save separately when set.
+        self._profiler = profiler
+        self._progress = progress
+        # With skip_unchanged, a section whose memoized output is the very list
+        # last written to the same path is not written again (watch mode).
+        self._skip_unchanged = skip_unchanged and share_sections
+        self._written: Dict[Path, List[Dict[str, Any]]] = {}
+        # Reuses a section's examples for any later domain that agrees on every
+        # config field the builder read (see section_memo.py). Watch mode keeps
+        # every output so unchanged sections come back as the same list.
+        self._memo: Optional[SectionMemo] = (
+            SectionMemo(retain_all=self._skip_unchanged) if share_sections else None
+        )
 
-    def generate_for_domain(self, cfg: DomainConfig, out_dir: Path) -> None:
-        out_dir = out_dir.resolve()
+    def estimate_for_domain(self, cfg: DomainConfig, probe_size: int = DEFAULT_PROBE_SIZE) -> RunEstimate:
+        """Probe every section of ``cfg`` and extrapolate time and memory."""
+        return estimate_run(self._builder_factory.create_builders(cfg), probe_size, **self._sharing())
+
+    def estimate_for_domains(
+        self, cfgs: Sequence[DomainConfig], probe_size: int = DEFAULT_PROBE_SIZE
+    ) -> RunEstimate:
+        """Combined estimate for generating ``cfgs`` one after another.
+
+        Shared sections are counted once per domain, so this is an upper bound;
+        the peak includes the shared outputs held for later domains.
+        """
+        builders = [b for cfg in cfgs for b in self._builder_factory.create_builders(cfg)]
+        return estimate_run(builders, probe_size, **self._sharing())
+
+    def _sharing(self) -> Dict[str, bool]:
+        return {"shared": self._memo is not None, "retain_all": self._skip_unchanged}
+
+    def forget(self, builder_types: Collection[type]) -> None:
+        """Stop reusing outputs of ``builder_types`` (e.g. after a reload)."""
+        if self._memo is not None:
+            self._memo.forget(builder_types)
+
+    @contextmanager
+    def _run(self, builders: Sequence[SectionBuilder]) -> Iterator[None]:
+        """Run-wide setup around generating ``builders``: tracing and progress."""
+        tracing = self._trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        if self._memo is not None:
+            self._memo.plan(builders)
+        if self._progress is not None:
+            self._progress.run_started(sum(b.planned_count for b in builders), len(builders))
+        try:
+            yield
+        finally:
+            if tracing:
+                tracemalloc.stop()
+        if self._progress is not None:
+            self._progress.run_finished()
+
+    def generate_for_domain(self, cfg: DomainConfig, out_dir: Path) -> List[SectionResult]:
         builders = self._builder_factory.create_builders(cfg)
+        with self._run(builders):
+            return self._generate(cfg, builders, out_dir, self._profiler)
+
+    def _generate(
+        self,
+        cfg: DomainConfig,
+        builders: Sequence[SectionBuilder],
+        out_dir: Path,
+        profiler: Optional[SectionProfiler],
+    ) -> List[SectionResult]:
+        out_dir = out_dir.resolve()
+        progress = self._progress
+        splits = SplitSpec.from_config(cfg)
+        results: List[SectionResult] = []
 
         for builder in builders:
-            examples = builder.build_examples()
+            if self._trace_memory:
+                tracemalloc.reset_peak()
+            key = builder.section_key
+            if progress is not None:
+                progress.section_started(cfg.id, key, builder.planned_count)
+                builder.set_progress(progress.update)
+            start = time.perf_counter()
+            with profiler.profile(key) if profiler else nullcontext():
+                if self._memo is not None:
+                    examples, reused = self._memo.build(builder)
+                else:
+                    examples, reused = builder.build_examples(), False
+            built = time.perf_counter()
             path = out_dir / builder.file_name
-            save_json_array(path, examples)
-            print(f"Wrote {len(examples):4d} examples -> {path}")
-   
\ No newline at end of file
+            if progress is not None:
+                builder.set_progress(None)
+                progress.build_finished(len(examples))
+            if self._skip_unchanged:
+                if self._written.get(path) is examples:
+                    # Not a result (nothing was written), but the run's
+                    # progress still counts the section as done.
+                    if progress is not None:
+                        progress.section_finished(SectionResult(
+                            domain=cfg.id,
+                            section=key,
+                            path=path,
+                            examples=len(examples),
+                            bytes=0,
+                            seconds=time.perf_counter() - start,
+                            reused=reused,
+                            skipped=True,
+                        ))
+                    continue
+                self._written[path] = examples
+            with profiler.profile(f"{key}.save") if profiler else nullcontext():
+                report = save_json_array(path, examples, progress.stage if progress else None, splits)
+            end = time.perf_counter()
+            result = SectionResult(
+                domain=cfg.id,
+                section=key,
+                path=path,
+                examples=len(examples),
+                bytes=report.bytes,
+                seconds=end - start,
+                reused=reused,
+                written=report.written,
+                stage_seconds={"build": built - start, **report.stage_seconds},
+                peak_alloc_bytes=tracemalloc.get_traced_memory()[1] if self._trace_memory else None,
+                split_counts=report.split_counts,
+            )
+            results.append(result)
+            if progress is not None:
+                progress.section_finished(result)
+            if self._verbose:
+                note = " (reused)" if reused else ""
+                print(f"Wrote {len(examples):4d} examples -> {path}{note}")
+        return results
+
+    def generate_for_domains(self, cfgs: Sequence[DomainConfig], out_dir: Path) -> List[SectionResult]:
+        """Generate several domains, each into ``out_dir / <domain id>``."""
+        plans = [(cfg, self._builder_factory.create_builders(cfg)) for cfg in cfgs]
+        results: List[SectionResult] = []
+        with self._run([b for _, builders in plans for b in builders]):
+            for cfg, builders in plans:
+                if self._verbose:
+                    print(f">>> Generating datasets for {cfg.id}")
+                profiler = self._profiler.subdir(cfg.id) if self._profiler else None
+                results.extend(self._generate(cfg, builders, out_dir / cfg.id, profiler))
+        return results
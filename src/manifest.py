@@ -0,0 +1,131 @@
+# dataset_generator/manifest.py
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from .domain_config import DomainConfig
+from .generator import SectionResult
+
+
+# -----------------------------------------------------------------------------
+# Run manifests
+#
+# Every CLI run leaves a ``run_manifest.json`` next to the datasets it wrote so
+# that a slow or unexpectedly small run can be diagnosed after the fact: where
+# the time went per section and stage, how many examples survived validation
+# and deduplication, and exactly which config and code produced them.
+
+MANIFEST_FILE_NAME = "run_manifest.json"
+STAGES = ("build", "validate", "dedup", "stats", "split", "write")
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def git_revision(repo: Path = _REPO_ROOT) -> Optional[str]:
+    """Commit hash checked out in ``repo``, or None outside a git checkout."""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=repo, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def config_hash(cfg: DomainConfig) -> str:
+    """SHA-256 of a domain's effective settings (after overlays and overrides)."""
+    payload = json.dumps(dataclasses.asdict(cfg), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _section_entry(r: SectionResult) -> Dict[str, Any]:
+    return {
+        "domain": r.domain,
+        "section": r.section,
+        "path": str(r.path),
+        "reused": r.reused,
+        "examples_built": r.examples,
+        "examples_written": r.written,
+        "bytes": r.bytes,
+        "seconds": round(r.seconds, 6),
+        "stage_seconds": {stage: round(r.stage_seconds.get(stage, 0.0), 6) for stage in STAGES},
+        "examples_per_second": round(r.examples_per_second, 1),
+        "peak_alloc_bytes": r.peak_alloc_bytes,
+        "split_counts": r.split_counts,
+    }
+
+
+def build_manifest(
+    results: Sequence[SectionResult],
+    cfgs: Sequence[DomainConfig],
+    wall_seconds: float,
+    config_path: Optional[Path] = None,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Assemble the manifest for one generation run.
+
+    Parameters
+    ----------
+    results: sequence of SectionResult
+        Everything the generator wrote, in order.
+    cfgs: sequence of DomainConfig
+        The configs the run was started with.
+    wall_seconds: float
+        Wall time of the whole run.
+    config_path: Path, optional
+        Config file the domains were loaded from; its hash is recorded.
+    seed: int, optional
+        Root sampling seed of the run.
+
+    Returns
+    -------
+    dict
+        JSON-serializable manifest.
+    """
+    written = sum(r.written for r in results)
+    stage_totals = {stage: round(sum(r.stage_seconds.get(stage, 0.0) for r in results), 6) for stage in STAGES}
+    peaks = [r.peak_alloc_bytes for r in results if r.peak_alloc_bytes is not None]
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": seed,
+        "config": {
+            "path": str(config_path) if config_path is not None else None,
+            "sha256": _file_hash(config_path) if config_path is not None else None,
+            "domains": {cfg.id: config_hash(cfg) for cfg in cfgs},
+        },
+        "totals": {
+            "wall_seconds": round(wall_seconds, 6),
+            "sections": len(results),
+            "reused_sections": sum(r.reused for r in results),
+            "examples_built": sum(r.examples for r in results),
+            "examples_written": written,
+            "bytes": sum(r.bytes for r in results),
+            "examples_per_second": round(written / wall_seconds, 1) if wall_seconds else 0.0,
+            "stage_seconds": stage_totals,
+            "peak_alloc_bytes": max(peaks) if peaks else None,
+        },
+        "sections": [_section_entry(r) for r in results],
+    }
+
+
+def write_manifest(path: Path, manifest: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
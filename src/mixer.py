@@ -0,0 +1,259 @@
+# dataset_generator/mixer.py
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .manifest import MANIFEST_FILE_NAME
+from .sampling import RngStreams
+from .utils import approx_tokens, iter_json_array
+
+
+# -----------------------------------------------------------------------------
+# Weighted section mixing
+#
+# Training wants one interleaved file with chosen section proportions, not one
+# file per section. Weights are shares of the mix, normalized over the
+# sections named (others are left out); the size is a number of examples or
+# an approximate token budget, in which case the weights are token shares.
+#
+# * A section needing more examples than it has is repeated whole; each pass
+#   re-reads the file, so repeats are spread out rather than adjacent. The
+#   remainder, like a section needing fewer than it has, is drawn without
+#   replacement by selection sampling (Knuth's Algorithm S), which keeps
+#   stream order and needs only the section size from the first pass.
+# * The per-section streams are interleaved by a k-way merge on each
+#   example's fractional position (j + 0.5) / target, so every stretch of the
+#   output follows the target ratios.
+#
+# Files are read with the streaming JSON parser, so memory stays constant
+# however large the sections are, and the same seed always gives the same
+# file.
+
+TokenCounter = Callable[[Dict[str, Any]], int]
+
+
+@dataclass(frozen=True)
+class SectionSource:
+    name: str
+    path: Path
+    examples: int
+    tokens: int
+
+
+@dataclass(frozen=True)
+class MixPlan:
+    """How many examples each section contributes."""
+
+    sources: List[SectionSource]
+    targets: Dict[str, int]
+
+    @property
+    def total(self) -> int:
+        return sum(self.targets.values())
+
+    def summary(self) -> str:
+        lines = [f"{'section':<34}{'available':>10}{'target':>10}{'share':>8}"]
+        for src in self.sources:
+            t = self.targets[src.name]
+            share = t / self.total if self.total else 0.0
+            lines.append(f"{src.name:<34}{src.examples:>10}{t:>10}{share:>8.1%}")
+        lines.append(f"{'total':<34}{sum(s.examples for s in self.sources):>10}{self.total:>10}")
+        return "\n".join(lines)
+
+
+def discover_sections(input_dir: Path, split: Optional[str] = None) -> Dict[str, Path]:
+    """Section name -> dataset file in ``input_dir``.
+
+    Names are section keys when a run manifest covers the directory (the
+    manifest of a multi-domain run sits one level up), file stems otherwise.
+    With ``split`` the ``<stem>.<split>.json`` files are used.
+    """
+    input_dir = input_dir.resolve()
+    by_file: Dict[str, str] = {}
+    for manifest_path in (input_dir / MANIFEST_FILE_NAME, input_dir.parent / MANIFEST_FILE_NAME):
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            for entry in manifest.get("sections", []):
+                path = Path(entry["path"])
+                if path.parent == input_dir:
+                    by_file[path.name] = entry["section"]
+            break
+
+    found: Dict[str, Path] = {}
+    for path in sorted(input_dir.glob("*.json")):
+        if path.name == MANIFEST_FILE_NAME or path.stem.endswith("_stats"):
+            continue
+        stem, _, suffix = path.stem.rpartition(".")
+        if split is not None:
+            if suffix != split:
+                continue
+            base = f"{stem}{path.suffix}"
+        elif stem:  # a split file, while mixing whole sections
+            continue
+        else:
+            base = path.name
+        found[by_file.get(base, Path(base).stem)] = path
+    return found
+
+
+def scan(name: str, path: Path, count_tokens: TokenCounter = approx_tokens) -> SectionSource:
+    """First pass over a section: example and token counts."""
+    examples = tokens = 0
+    for ex in iter_json_array(path):
+        examples += 1
+        tokens += count_tokens(ex)
+    return SectionSource(name, path, examples, tokens)
+
+
+def _largest_remainder(exact: Dict[str, float], total: int) -> Dict[str, int]:
+    counts = {k: int(math.floor(v)) for k, v in exact.items()}
+    order = sorted(exact, key=lambda k: (counts[k] - exact[k], k))
+    for k in order[: max(total - sum(counts.values()), 0)]:
+        counts[k] += 1
+    return counts
+
+
+def plan_mix(
+    sources: Sequence[SectionSource],
+    weights: Optional[Dict[str, float]] = None,
+    total: Optional[int] = None,
+    token_budget: Optional[int] = None,
+) -> MixPlan:
+    """Per-section example counts for the requested weights and size.
+
+    Parameters
+    ----------
+    sources: sequence of SectionSource
+        Scanned sections.
+    weights: dict, optional
+        Section name -> relative weight. Defaults to the section sizes
+        (examples, or tokens with ``token_budget``).
+    total: int, optional
+        Examples in the mix; defaults to the sum of the sections used.
+    token_budget: int, optional
+        Approximate tokens in the mix instead of ``total``; weights then are
+        token shares.
+    """
+    if total is not None and token_budget is not None:
+        raise ValueError("Give either total or token_budget, not both")
+    by_name = {s.name: s for s in sources}
+    if weights is None:
+        weights = {s.name: float(s.tokens if token_budget else s.examples) for s in sources}
+    unknown = sorted(set(weights) - set(by_name))
+    if unknown:
+        raise ValueError(f"Unknown section(s) {unknown}; available: {sorted(by_name)}")
+    if any(w < 0 for w in weights.values()):
+        raise ValueError("Weights must be >= 0")
+    used = [s for s in sources if weights.get(s.name, 0) > 0 and s.examples > 0]
+    weight_sum = sum(weights[s.name] for s in used)
+    if not used or weight_sum <= 0:
+        raise ValueError("No non-empty section has a positive weight")
+    share = {s.name: weights[s.name] / weight_sum for s in used}
+
+    if token_budget is not None:
+        exact = {s.name: share[s.name] * token_budget / (s.tokens / s.examples or 1) for s in used}
+        total = int(round(sum(exact.values())))
+    else:
+        if total is None:
+            total = sum(s.examples for s in used)
+        exact = {s.name: share[s.name] * total for s in used}
+    targets = _largest_remainder(exact, total)
+    return MixPlan(list(used), {s.name: targets[s.name] for s in used})
+
+
+def _selection_sample(items: Iterator[Any], n: int, k: int, rng: np.random.Generator) -> Iterator[Any]:
+    """Exactly ``k`` of the ``n`` items, uniformly, in stream order (Algorithm S)."""
+    needed = k
+    for seen, item in enumerate(items):
+        if needed == 0:
+            return
+        if (n - seen) * rng.random() < needed:
+            needed -= 1
+            yield item
+
+
+def _section_stream(src: SectionSource, target: int, rng: np.random.Generator) -> Iterator[Any]:
+    passes, remainder = divmod(target, src.examples)
+    for _ in range(passes):
+        yield from iter_json_array(src.path)
+    if remainder:
+        yield from _selection_sample(iter_json_array(src.path), src.examples, remainder, rng)
+
+
+def iter_mix(plan: MixPlan, seed: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """The mixed stream: per-section streams merged by fractional position."""
+    streams = RngStreams(seed)
+
+    def keyed(order: int, src: SectionSource) -> Iterator[Tuple[float, int, Any]]:
+        target = plan.targets[src.name]
+        rng = streams.generator("mix", src.name)
+        for j, ex in enumerate(_section_stream(src, target, rng)):
+            yield (j + 0.5) / target, order, ex
+
+    merged = heapq.merge(*(keyed(i, s) for i, s in enumerate(plan.sources)), key=lambda t: t[:2])
+    for _, _, ex in merged:
+        yield ex
+
+
+def write_mix(plan: MixPlan, out_path: Path, seed: Optional[int] = None) -> int:
+    """Write the mix as JSONL; returns the number of lines written."""
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    lines = 0
+    with out_path.open("w", encoding="utf-8") as f:
+        for ex in iter_mix(plan, seed):
+            f.write(json.dumps(ex, ensure_ascii=False))
+            f.write("\n")
+            lines += 1
+    return lines
+
+
+def _parse_weights(spec: str) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for part in spec.split(","):
+        name, sep, value = part.partition("=")
+        if not sep or not name.strip():
+            raise argparse.ArgumentTypeError(f"Invalid weight '{part}', expected section=weight")
+        weights[name.strip()] = float(value)
+    return weights
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Mix section files into one weighted JSONL file.")
+    parser.add_argument("--input-dir", required=True, help="Directory with one domain's section files")
+    parser.add_argument("--out", required=True, help="Output JSONL file")
+    parser.add_argument("--weights", type=_parse_weights, help="section=weight,... (default: section sizes)")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--total", type=int, help="Examples in the mix (default: all examples used)")
+    size.add_argument("--token-budget", type=int, help="Approximate tokens in the mix")
+    parser.add_argument("--split", help="Mix the <section>.<split>.json files, e.g. train")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for sampling (default: fixed)")
+    args = parser.parse_args(argv)
+
+    files = discover_sections(Path(args.input_dir), args.split)
+    if not files:
+        parser.error(f"No section files found in {args.input_dir}")
+    names = list(args.weights) if args.weights else list(files)
+    missing = [n for n in names if n not in files]
+    if missing:
+        parser.error(f"Unknown section(s) {missing}; available: {sorted(files)}")
+    sources = [scan(name, files[name]) for name in names]
+    try:
+        plan = plan_mix(sources, args.weights, args.total, args.token_budget)
+    except ValueError as e:
+        parser.error(str(e))
+    print(plan.summary())
+    lines = write_mix(plan, Path(args.out), args.seed)
+    print(f"Wrote {lines} examples -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# dataset_generator/operator_routing.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+
+# -----------------------------------------------------------------------------
+# Operator-routing scenario engine
+#
+# Routing scenarios (which operator should answer, and how confident each
+# retrieval backend is) are declared in YAML and compiled into NumPy arrays.
+# Batches of routing decisions are then drawn by perturbing the base scores
+# with multiplicative noise, renormalizing every row to sum to 1 and deriving
+# risk, fallback and chain-of-thought suppression with array thresholds, so
+# no per-example Python arithmetic is needed.
+#
+# YAML layout::
+#
+#     scenarios:
+#       - key: vdb_high
+#         primary: VDB             # operator name, or "VDB+KG" for a hybrid
+#         secondary: [KG]
+#         scores: {vdb: 0.9, kg: 0.05, graph: 0.03, web: 0.02}
+#         sections: [operator]     # optional; omitted = every operator section
+
+# Score keys, in column order, and the operator name each column stands for.
+OPERATOR_KEYS: Tuple[str, ...] = ("vdb", "kg", "graph", "web")
+OPERATOR_NAMES: Tuple[str, ...] = ("VDB", "KG", "Graph", "Web")
+
+# Fallback labels: index 0 means "no fallback"; web search gets its own label,
+# the remaining operators fall back by name.
+FALLBACK_LABELS: Tuple[Optional[str], ...] = (None, "VDB", "KG", "Graph", "WEB_SEARCH")
+
+# Scores are rounded to this many decimals in the generated examples.
+SCORE_DECIMALS = 3
+
+# Builders draw decisions in fixed-size batches, each from its own RNG shard,
+# so an example's scores do not depend on how many batches a run uses.
+ROUTING_BATCH_SIZE = 4096
+
+
+def validate_operator_scores(scores: Dict[str, float], tolerance: float = 0.01) -> None:
+    """Validate that operator scores sum to approximately 1.0.
+
+    Parameters
+    ----------
+    scores : Dict[str, float]
+        Dictionary mapping operator names to their confidence scores.
+    tolerance : float, optional
+        Acceptable deviation from 1.0, by default 0.01.
+
+    Raises
+    ------
+    ValueError
+        If the sum of scores deviates from 1.0 by more than tolerance.
+    """
+    total = sum(scores.values())
+    if abs(total - 1.0) > tolerance:
+        raise ValueError(
+            f"Operator scores must sum to ~1.0 (tolerance: {tolerance}). "
+            f"Got {total:.4f} from scores: {scores}"
+        )
+
+
+def validate_operator_score_matrix(scores: np.ndarray, tolerance: float = 0.01) -> None:
+    """Vectorized :func:`validate_operator_scores` over one row per example.
+
+    Parameters
+    ----------
+    scores : numpy.ndarray
+        Array of shape ``(n, len(OPERATOR_KEYS))``.
+    tolerance : float, optional
+        Acceptable deviation of each row sum from 1.0, by default 0.01.
+
+    Raises
+    ------
+    ValueError
+        If any score is negative or any row sum deviates by more than tolerance.
+    """
+    if scores.ndim != 2 or scores.shape[1] != len(OPERATOR_KEYS):
+        raise ValueError(f"Expected scores of shape (n, {len(OPERATOR_KEYS)}), got {scores.shape}")
+    bad = np.flatnonzero((np.abs(scores.sum(axis=1) - 1.0) > tolerance) | (scores < 0).any(axis=1))
+    if bad.size:
+        row = int(bad[0])
+        raise ValueError(
+            f"Operator scores must be non-negative and sum to ~1.0 (tolerance: {tolerance}). "
+            f"{bad.size} invalid row(s), first is {row}: {dict(zip(OPERATOR_KEYS, scores[row].tolist()))}"
+        )
+
+
+@dataclass(frozen=True)
+class OperatorScenario:
+    """Declarative routing scenario as written in YAML."""
+
+    key: str
+    primary: str
+    secondary: Tuple[str, ...]
+    scores: Tuple[float, ...]  # one per OPERATOR_KEYS entry
+    sections: Tuple[str, ...] = ()  # section keys using it; empty means all
+
+    def applies_to(self, section: str) -> bool:
+        return not self.sections or section in self.sections
+
+
+def load_operator_scenarios(path: Path) -> List[OperatorScenario]:
+    """Read scenarios from a YAML file laid out as described above."""
+    with Path(path).open("r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    return [
+        OperatorScenario(
+            key=spec["key"],
+            primary=spec["primary"],
+            secondary=tuple(spec.get("secondary") or ()),
+            scores=tuple(float((spec.get("scores") or {}).get(k, 0.0)) for k in OPERATOR_KEYS),
+            sections=tuple(spec.get("sections") or ()),
+        )
+        for spec in data.get("scenarios") or []
+    ]
+
+
+@dataclass(frozen=True)
+class RoutingBatch:
+    """Column-oriented routing decisions for a batch of examples."""
+
+    scenario: np.ndarray  # index into the engine's scenarios
+    scores: np.ndarray  # (n, 4) perturbed scores, rows sum to 1
+    risk: np.ndarray  # 1 - combined score of the primary operator(s)
+    fallback: np.ndarray  # index into FALLBACK_LABELS
+    cot_suppressed: np.ndarray  # bool
+
+    def __len__(self) -> int:
+        return len(self.scenario)
+
+    def score_dicts(self) -> List[Dict[str, float]]:
+        """Per-row ``{"vdb": ..., "kg": ..., ...}`` dicts, built once per batch."""
+        return [dict(zip(OPERATOR_KEYS, row)) for row in self.scores.tolist()]
+
+
+class ScenarioEngine:
+    """Compiled set of routing scenarios that draws perturbed decisions in bulk.
+
+    Parameters
+    ----------
+    scenarios: sequence of OperatorScenario
+        Scenario definitions. Base scores are renormalized to sum to 1.
+    noise: float, optional
+        Log-scale standard deviation of the multiplicative score noise. ``0``
+        reproduces the (normalized) base scores exactly.
+    risk_thresholds: (float, float), optional
+        ``(medium, high)`` risk cut-offs. Risk at or above ``high`` falls back
+        to web search, at or above ``medium`` to the strongest operator outside
+        the primary; chain-of-thought is suppressed below ``medium``.
+    """
+
+    def __init__(
+        self,
+        scenarios: Sequence[OperatorScenario],
+        noise: float = 0.05,
+        risk_thresholds: Tuple[float, float] = (0.3, 0.5),
+    ) -> None:
+        if not scenarios:
+            raise ValueError("At least one operator scenario is required")
+        if noise < 0:
+            raise ValueError(f"noise must be >= 0, got {noise}")
+        self._scenarios = tuple(scenarios)
+        self._noise = noise
+        self._medium, self._high = risk_thresholds
+
+        base = np.array([s.scores for s in self._scenarios], dtype=np.float64)
+        totals = base.sum(axis=1, keepdims=True)
+        invalid = [s.key for s, t, row in zip(self._scenarios, totals[:, 0], base) if t <= 0 or (row < 0).any()]
+        if invalid:
+            raise ValueError(f"Scenario scores must be non-negative with a positive sum: {invalid}")
+        self._base = base / totals
+
+        # Boolean mask of the columns that make up each scenario's primary
+        # operator ("VDB+KG" covers two columns).
+        self._primary_mask = np.zeros_like(self._base, dtype=bool)
+        for row, scenario in enumerate(self._scenarios):
+            for name in scenario.primary.split("+"):
+                if name not in OPERATOR_NAMES:
+                    raise ValueError(f"Scenario '{scenario.key}' has unknown primary operator '{name}'")
+                self._primary_mask[row, OPERATOR_NAMES.index(name)] = True
+
+    @classmethod
+    def from_yaml(cls, path: Path, **kwargs: Any) -> "ScenarioEngine":
+        return cls(load_operator_scenarios(path), **kwargs)
+
+    @property
+    def scenarios(self) -> Tuple[OperatorScenario, ...]:
+        return self._scenarios
+
+    def __len__(self) -> int:
+        return len(self._scenarios)
+
+    def draw(self, rng: np.random.Generator, scenario: np.ndarray) -> RoutingBatch:
+        """Perturb the base scores of ``scenario`` (an index array) and derive decisions.
+
+        Parameters
+        ----------
+        rng: numpy.random.Generator
+            Source of the score noise; use a per-batch stream for reproducibility.
+        scenario: numpy.ndarray
+            Scenario index for every example in the batch.
+
+        Returns
+        -------
+        RoutingBatch
+            Validated scores plus derived risk, fallback and CoT flags.
+        """
+        scenario = np.asarray(scenario, dtype=np.int64)
+        base = self._base[scenario]
+        scores = base * np.exp(rng.normal(0.0, self._noise, base.shape))
+        scores /= scores.sum(axis=1, keepdims=True)
+        scores = np.round(scores, SCORE_DECIMALS)
+        validate_operator_score_matrix(scores)
+
+        primary = self._primary_mask[scenario]
+        risk = np.round(1.0 - np.where(primary, scores, 0.0).sum(axis=1), 2)
+
+        # Runner-up: the best-scoring operator that is not part of the primary.
+        runner_up = np.where(primary, -1.0, scores).argmax(axis=1)
+        fallback = np.where(
+            risk >= self._high,
+            FALLBACK_LABELS.index("WEB_SEARCH"),
+            np.where(risk >= self._medium, runner_up + 1, 0),
+        )
+        return RoutingBatch(
+            scenario=scenario,
+            scores=scores,
+            risk=risk,
+            fallback=fallback,
+            cot_suppressed=risk < self._medium,
+        )
+
+    def __repr__(self) -> str:
+        return f"ScenarioEngine(scenarios={len(self._scenarios)}, noise={self._noise})"
@@ -0,0 +1,287 @@
+# dataset_generator/packing.py
+"""
+Sequence packing for fixed context-length training.
+
+    python -m src.packing training-jsons --seq-len 2048 --out packed.jsonl
+    python -m src.packing training-jsons --seq-len 4096 --manifest packing.json \\
+        --tokenizer path/to/tokenizer.json
+
+Each example (prompt, response and EOS) is measured with the local tokenizer
+and the examples are bin-packed into sequences of at most ``--seq-len``
+tokens, so short templated sections no longer leave most of a context window
+as padding. ``--algorithm ffd`` (first fit decreasing) puts an example in the
+oldest sequence it fits; ``bfd`` (best fit decreasing) in the fullest one.
+Both sort the length array once with NumPy and find the target sequence with
+a max segment tree in O(log n), so planning is O(n log n). An example longer
+than ``--seq-len`` gets a sequence of its own and is counted as oversized
+(the trainer truncates it).
+
+``--out`` writes one JSONL line per sequence with its examples;
+``--manifest`` writes the plan as example indices into the input stream.
+The report gives packing efficiency (real tokens / sequence slots) next to
+the unpacked one-example-per-sequence baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .curriculum import dataset_files, iter_examples
+from .tokenizer import DEFAULT_EOS_TOKEN, Tokenizer, example_lengths, load_tokenizer
+
+
+PACKING_ALGORITHMS = ("ffd", "bfd")
+DEFAULT_SEQ_LEN = 2048
+
+
+class _MaxTree:
+    """Max segment tree with a leftmost ``value >= x`` search from an index."""
+
+    def __init__(self, values: np.ndarray) -> None:
+        size = 1
+        while size < len(values):
+            size *= 2
+        self.size = size
+        tree = np.full(2 * size, -1, dtype=np.int64)
+        tree[size:size + len(values)] = values
+        for i in range(size - 1, 0, -1):
+            tree[i] = max(tree[2 * i], tree[2 * i + 1])
+        self._tree = tree.tolist()  # plain ints: much faster to index than numpy
+
+    def set(self, i: int, value: int) -> None:
+        tree = self._tree
+        i += self.size
+        tree[i] = value
+        i //= 2
+        while i:
+            tree[i] = max(tree[2 * i], tree[2 * i + 1])
+            i //= 2
+
+    def leftmost(self, at_least: int, lo: int = 0) -> int:
+        """Smallest index >= ``lo`` whose value is >= ``at_least``, or -1."""
+        tree = self._tree
+        node, node_lo, width = 1, 0, self.size
+        stack = []
+        while True:
+            if node_lo + width > lo and tree[node] >= at_least:
+                if width == 1:
+                    return node_lo
+                width //= 2
+                stack.append((2 * node + 1, node_lo + width, width))
+                node = 2 * node
+                continue
+            if not stack:
+                return -1
+            node, node_lo, width = stack.pop()
+
+
+def _first_fit_decreasing(lengths: np.ndarray, order: np.ndarray, capacity: int) -> np.ndarray:
+    # Leaves are sequences in opening order holding their free space; unopened
+    # ones are full capacity, so the leftmost fit opens a new one when needed.
+    bins = np.empty(len(lengths), dtype=np.int64)
+    tree = _MaxTree(np.full(len(lengths), capacity, dtype=np.int64))
+    free = [capacity] * len(lengths)
+    for i in order.tolist():
+        need = min(int(lengths[i]), capacity)
+        b = tree.leftmost(need)
+        bins[i] = b
+        free[b] -= need
+        tree.set(b, free[b])
+    return bins
+
+
+def _best_fit_decreasing(lengths: np.ndarray, order: np.ndarray, capacity: int) -> np.ndarray:
+    # Leaves are free-space amounts 0..capacity holding how many open
+    # sequences have exactly that much left; the leftmost non-empty leaf at or
+    # above the need is the tightest fit.
+    bins = np.empty(len(lengths), dtype=np.int64)
+    by_free: List[List[int]] = [[] for _ in range(capacity + 1)]
+    tree = _MaxTree(np.zeros(capacity + 1, dtype=np.int64))
+    opened = 0
+    for i in order.tolist():
+        need = min(int(lengths[i]), capacity)
+        r = tree.leftmost(1, lo=need)
+        if r == -1:
+            b, r = opened, capacity
+            opened += 1
+        else:
+            b = by_free[r].pop()
+            tree.set(r, len(by_free[r]))
+        bins[i] = b
+        left = r - need
+        by_free[left].append(b)
+        tree.set(left, len(by_free[left]))
+    return bins
+
+
+def plan_packing(lengths: np.ndarray, seq_len: int, algorithm: str = "ffd") -> np.ndarray:
+    """Sequence index of every example.
+
+    Parameters
+    ----------
+    lengths: np.ndarray
+        Tokens per example.
+    seq_len: int
+        Sequence capacity in tokens.
+    algorithm: str, optional
+        ``"ffd"`` or ``"bfd"``.
+
+    Returns
+    -------
+    np.ndarray
+        Sequence index per example; sequences are numbered in opening order.
+    """
+    if algorithm not in PACKING_ALGORITHMS:
+        raise ValueError(f"Unknown packing algorithm '{algorithm}'; expected one of {PACKING_ALGORITHMS}")
+    if seq_len < 1:
+        raise ValueError("seq_len must be >= 1")
+    lengths = np.asarray(lengths, dtype=np.int64)
+    if len(lengths) == 0:
+        return np.empty(0, dtype=np.int64)
+    # Longest first; ties keep input order so plans are reproducible.
+    order = np.argsort(-lengths, kind="stable")
+    pack = _first_fit_decreasing if algorithm == "ffd" else _best_fit_decreasing
+    return pack(lengths, order, seq_len)
+
+
+def sequences_of(bins: np.ndarray) -> List[np.ndarray]:
+    """Example indices of every sequence, each in input order."""
+    order = np.argsort(bins, kind="stable")
+    cuts = np.flatnonzero(np.diff(bins[order])) + 1
+    return np.split(order, cuts)
+
+
+@dataclass(frozen=True)
+class PackingReport:
+    examples: int
+    sequences: int
+    seq_len: int
+    tokens: int
+    oversized: int
+
+    @property
+    def efficiency(self) -> float:
+        """Real tokens over sequence slots (tokens beyond seq_len are cut)."""
+        slots = self.sequences * self.seq_len
+        return min(self.tokens, slots) / slots if slots else 0.0
+
+    @property
+    def unpacked_efficiency(self) -> float:
+        """Efficiency with one example per padded sequence."""
+        slots = self.examples * self.seq_len
+        return min(self.tokens, slots) / slots if slots else 0.0
+
+    @property
+    def speedup(self) -> float:
+        """Fewer sequences per epoch: unpacked / packed sequence count."""
+        return self.examples / self.sequences if self.sequences else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "examples": self.examples,
+            "sequences": self.sequences,
+            "seq_len": self.seq_len,
+            "tokens": self.tokens,
+            "oversized": self.oversized,
+            "efficiency": round(self.efficiency, 6),
+            "unpacked_efficiency": round(self.unpacked_efficiency, 6),
+            "speedup": round(self.speedup, 3),
+        }
+
+    def summary(self) -> str:
+        return (
+            f"{self.examples} examples -> {self.sequences} sequences of {self.seq_len} tokens; "
+            f"efficiency {self.efficiency:.1%} (unpacked {self.unpacked_efficiency:.1%}, "
+            f"{self.speedup:.2f}x fewer sequences); {self.oversized} oversized"
+        )
+
+
+def packing_report(lengths: np.ndarray, bins: np.ndarray, seq_len: int) -> PackingReport:
+    clipped = np.minimum(lengths, seq_len)
+    return PackingReport(
+        examples=len(lengths),
+        sequences=int(bins.max()) + 1 if len(bins) else 0,
+        seq_len=seq_len,
+        tokens=int(clipped.sum()),
+        oversized=int(np.count_nonzero(lengths > seq_len)),
+    )
+
+
+def write_packed_jsonl(
+    path: Path, examples: Sequence[Dict[str, Any]], lengths: np.ndarray, bins: np.ndarray
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        for seq in sequences_of(bins):
+            idx = seq.tolist()
+            line = {"tokens": int(lengths[seq].sum()), "examples": [examples[i] for i in idx]}
+            f.write(json.dumps(line, ensure_ascii=False))
+            f.write("\n")
+
+
+def write_packing_manifest(
+    path: Path,
+    files: Sequence[Path],
+    tokenizer: Tokenizer,
+    algorithm: str,
+    lengths: np.ndarray,
+    bins: np.ndarray,
+    report: PackingReport,
+) -> None:
+    manifest = {
+        "inputs": [str(p) for p in files],
+        "tokenizer": tokenizer.name,
+        "algorithm": algorithm,
+        "report": report.as_dict(),
+        "lengths": lengths.tolist(),
+        "sequences": [seq.tolist() for seq in sequences_of(bins)],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+        f.write("\n")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pack examples into fixed-length training sequences.")
+    parser.add_argument("inputs", nargs="+", help="Output directories or .json/.jsonl files")
+    parser.add_argument("--seq-len", type=int, default=DEFAULT_SEQ_LEN,
+                        help=f"Sequence length in tokens (default: {DEFAULT_SEQ_LEN})")
+    parser.add_argument("--algorithm", choices=PACKING_ALGORITHMS, default="ffd",
+                        help="First fit decreasing or best fit decreasing (default: ffd)")
+    parser.add_argument("--tokenizer", help="Local tokenizer.json (default: whitespace tokenizer)")
+    parser.add_argument("--eos-token", default=DEFAULT_EOS_TOKEN, help="EOS token of --tokenizer")
+    parser.add_argument("--split", help="Use the <section>.<split>.json files, e.g. train")
+    parser.add_argument("--out", help="Write packed sequences as JSONL")
+    parser.add_argument("--manifest", help="Write the packing plan and report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        files = dataset_files([Path(p) for p in args.inputs], args.split)
+        tokenizer = load_tokenizer(args.tokenizer, args.eos_token)
+    except (FileNotFoundError, RuntimeError, ValueError) as e:
+        parser.error(str(e))
+    if not files:
+        parser.error("No dataset files found")
+
+    examples = list(iter_examples(files))
+    lengths = example_lengths(examples, tokenizer)
+    bins = plan_packing(lengths, args.seq_len, args.algorithm)
+    report = packing_report(lengths, bins, args.seq_len)
+    print(report.summary())
+    if args.out:
+        write_packed_jsonl(Path(args.out), examples, lengths, bins)
+        print(f"Wrote {report.sequences} sequences -> {args.out}")
+    if args.manifest:
+        write_packing_manifest(Path(args.manifest), files, tokenizer, args.algorithm, lengths, bins, report)
+        print(f"Wrote packing manifest -> {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
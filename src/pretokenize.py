@@ -0,0 +1,271 @@
+# dataset_generator/pretokenize.py
+"""
+Pre-tokenized binary export for training ingestion.
+
+    python -m src.pretokenize training-jsons --out-dir pretokenized \\
+        --tokenizer path/to/tokenizer.json --workers 8
+
+Training jobs otherwise re-parse and re-tokenize the same JSON every run.
+This tokenizes every example once, in parallel worker processes, and writes
+flat arrays that a job maps straight into memory:
+
+* ``tokens.bin`` - all token ids back to back, ``uint16`` when the
+  vocabulary fits, ``uint32`` otherwise. Each example is its prompt, its
+  response and the EOS token.
+* ``loss_mask.bin`` - one ``uint8`` per token: 0 for prompt tokens, 1 for
+  response tokens and EOS.
+* ``offsets.npy`` - ``int64`` array of length ``examples + 1``; example ``i``
+  is ``tokens[offsets[i]:offsets[i + 1]]``.
+* ``meta.json`` - dtype, counts, tokenizer and inputs.
+
+``PretokenizedDataset`` opens a directory with ``numpy.memmap`` and returns
+zero-copy views: no parsing, and pages are only read when touched. Examples
+are written in input order, chunk by chunk as workers finish, with a bounded
+number of chunks in flight, so memory does not grow with the dataset.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .curriculum import dataset_files, iter_examples
+from .tokenizer import DEFAULT_EOS_TOKEN, Tokenizer, example_segments, load_tokenizer
+
+
+TOKENS_FILE = "tokens.bin"
+LOSS_MASK_FILE = "loss_mask.bin"
+OFFSETS_FILE = "offsets.npy"
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+DEFAULT_CHUNK_SIZE = 1024
+
+Encoded = Tuple[np.ndarray, np.ndarray, np.ndarray]  # ids, loss mask, lengths
+
+
+def token_dtype(vocab_size: int) -> np.dtype:
+    return np.dtype(np.uint16) if vocab_size <= 1 << 16 else np.dtype(np.uint32)
+
+
+def encode_examples(examples: Sequence[Dict[str, Any]], tokenizer: Tokenizer) -> Encoded:
+    """Token ids, loss mask and per-example lengths of a chunk."""
+    segments = [example_segments(ex) for ex in examples]
+    prompts = tokenizer.encode_batch([p for p, _ in segments])
+    responses = tokenizer.encode_batch([r for _, r in segments])
+    ids: List[int] = []
+    mask: List[int] = []
+    lengths = np.empty(len(examples), dtype=np.int64)
+    eos = tokenizer.eos_id
+    for i, (p, r) in enumerate(zip(prompts, responses)):
+        ids.extend(p)
+        ids.extend(r)
+        ids.append(eos)
+        mask.extend([0] * len(p))
+        mask.extend([1] * (len(r) + 1))
+        lengths[i] = len(p) + len(r) + 1
+    return np.array(ids, dtype=np.int64), np.array(mask, dtype=np.uint8), lengths
+
+
+# Worker processes build their own tokenizer once; tokenizers are not shared
+# across a fork.
+_worker_tokenizer: Optional[Tokenizer] = None
+
+
+def _init_worker(spec: Optional[str], eos_token: str) -> None:
+    global _worker_tokenizer
+    _worker_tokenizer = load_tokenizer(spec, eos_token)
+
+
+def _encode_in_worker(examples: List[Dict[str, Any]]) -> Encoded:
+    assert _worker_tokenizer is not None
+    return encode_examples(examples, _worker_tokenizer)
+
+
+def _chunks(items: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _encoded_chunks(
+    examples: Iterable[Dict[str, Any]],
+    tokenizer_spec: Optional[str],
+    eos_token: str,
+    workers: int,
+    chunk_size: int,
+) -> Iterator[Encoded]:
+    if workers <= 1:
+        tokenizer = load_tokenizer(tokenizer_spec, eos_token)
+        for chunk in _chunks(examples, chunk_size):
+            yield encode_examples(chunk, tokenizer)
+        return
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(tokenizer_spec, eos_token)) as pool:
+        pending: Deque[Future] = deque()
+        for chunk in _chunks(examples, chunk_size):
+            pending.append(pool.submit(_encode_in_worker, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+@dataclass(frozen=True)
+class ExportReport:
+    examples: int
+    tokens: int
+    response_tokens: int
+    dtype: str
+    bytes: int
+
+
+def export_pretokenized(
+    files: Sequence[Path],
+    out_dir: Path,
+    tokenizer_spec: Optional[str] = None,
+    eos_token: str = DEFAULT_EOS_TOKEN,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> ExportReport:
+    """Tokenize the examples of ``files`` into ``out_dir``.
+
+    Parameters
+    ----------
+    files: sequence of Path
+        Section files (``.json``) or JSONL files, read in order.
+    out_dir: Path
+        Directory receiving the binary files and ``meta.json``.
+    tokenizer_spec: str, optional
+        Path of a local ``tokenizer.json``; defaults to the whitespace
+        tokenizer.
+    eos_token: str, optional
+        EOS token of the tokenizer file.
+    workers: int, optional
+        Tokenizer processes; 1 tokenizes in this process.
+    chunk_size: int, optional
+        Examples per work unit.
+    """
+    tokenizer = load_tokenizer(tokenizer_spec, eos_token)  # fail fast, and the vocab size
+    dtype = token_dtype(tokenizer.vocab_size)
+    limit = np.iinfo(dtype).max
+    out_dir.mkdir(parents=True, exist_ok=True)
+    lengths: List[np.ndarray] = []
+    tokens = response_tokens = 0
+    with (out_dir / TOKENS_FILE).open("wb") as tok_f, (out_dir / LOSS_MASK_FILE).open("wb") as mask_f:
+        chunks = _encoded_chunks(iter_examples(files), tokenizer_spec, eos_token, workers, chunk_size)
+        for ids, mask, chunk_lengths in chunks:
+            if len(ids) and int(ids.max()) > limit:
+                raise ValueError(f"Token id {int(ids.max())} does not fit {dtype.name}")
+            ids.astype(dtype).tofile(tok_f)
+            mask.tofile(mask_f)
+            lengths.append(chunk_lengths)
+            tokens += len(ids)
+            response_tokens += int(mask.sum())
+
+    all_lengths = np.concatenate(lengths) if lengths else np.empty(0, dtype=np.int64)
+    offsets = np.zeros(len(all_lengths) + 1, dtype=np.int64)
+    np.cumsum(all_lengths, out=offsets[1:])
+    np.save(out_dir / OFFSETS_FILE, offsets)
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "dtype": dtype.name,
+        "examples": len(all_lengths),
+        "tokens": tokens,
+        "response_tokens": response_tokens,
+        "tokenizer": tokenizer.name,
+        "vocab_size": tokenizer.vocab_size,
+        "eos_id": tokenizer.eos_id,
+        "inputs": [str(p) for p in files],
+    }
+    (out_dir / META_FILE).write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
+    size = sum((out_dir / name).stat().st_size for name in (TOKENS_FILE, LOSS_MASK_FILE, OFFSETS_FILE))
+    return ExportReport(len(all_lengths), tokens, response_tokens, dtype.name, size)
+
+
+class PretokenizedDataset:
+    """Memory-mapped view of a pre-tokenized export.
+
+    Parameters
+    ----------
+    path: Path
+        Directory written by ``export_pretokenized``.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path = Path(path)
+        self.meta = json.loads((path / META_FILE).read_text(encoding="utf-8"))
+        if self.meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported pre-tokenized format in {path}: {self.meta.get('format_version')}")
+        self.offsets = np.load(path / OFFSETS_FILE, mmap_mode="r")
+        n_tokens = int(self.offsets[-1])
+        # np.memmap cannot map an empty file.
+        if n_tokens:
+            self.tokens = np.memmap(path / TOKENS_FILE, dtype=self.meta["dtype"], mode="r", shape=(n_tokens,))
+            self.loss_mask = np.memmap(path / LOSS_MASK_FILE, dtype=np.uint8, mode="r", shape=(n_tokens,))
+        else:
+            self.tokens = np.empty(0, dtype=self.meta["dtype"])
+            self.loss_mask = np.empty(0, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(token ids, loss mask) of example ``i``, as views into the maps."""
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        i %= len(self)
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return self.tokens[start:end], self.loss_mask[start:end]
+
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export examples as memory-mappable token id arrays.")
+    parser.add_argument("inputs", nargs="+", help="Output directories or .json/.jsonl files")
+    parser.add_argument("--out-dir", required=True, help="Directory for tokens.bin, loss_mask.bin, offsets.npy")
+    parser.add_argument("--tokenizer", help="Local tokenizer.json (default: whitespace tokenizer)")
+    parser.add_argument("--eos-token", default=DEFAULT_EOS_TOKEN, help="EOS token of --tokenizer")
+    parser.add_argument("--split", help="Use the <section>.<split>.json files, e.g. train")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Tokenizer processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Examples per work unit (default: {DEFAULT_CHUNK_SIZE})")
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error("--workers and --chunk-size must be >= 1")
+
+    try:
+        files = dataset_files([Path(p) for p in args.inputs], args.split)
+    except FileNotFoundError as e:
+        parser.error(f"No such file or directory: {e}")
+    if not files:
+        parser.error("No dataset files found")
+    try:
+        report = export_pretokenized(
+            files, Path(args.out_dir), args.tokenizer, args.eos_token, args.workers, args.chunk_size
+        )
+    except (FileNotFoundError, RuntimeError, ValueError) as e:
+        parser.error(str(e))
+    print(
+        f"Wrote {report.examples} examples, {report.tokens} {report.dtype} tokens "
+        f"({report.response_tokens} in responses), {report.bytes} bytes -> {args.out_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# dataset_generator/preview.py
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import math
+from typing import Any, Dict, Iterable, List, TextIO
+
+import numpy as np
+
+from .sections import SectionBuilder
+from .utils import clean_examples, iter_clean_examples
+
+
+# -----------------------------------------------------------------------------
+# Previews
+#
+# Reviewing a config should not require generating and opening every dataset.
+# ``--preview k`` builds each section at size k, the cheapest way to see what a
+# builder emits. ``--sample k`` instead draws k examples uniformly from the
+# section at its full configured size with reservoir sampling (Li's
+# Algorithm L). The builder's examples are streamed through validation and
+# deduplication (exactly what the CLI would write) into the reservoir, so
+# only the k kept examples and the dedup hashes are held; the builder still
+# produces every example, so the cost in time is that of a full build.
+# Nothing is written to disk in either mode, and no output directory is
+# needed.
+
+DEFAULT_WIDTH = 110
+
+_END = object()
+
+
+def preview_examples(builder: SectionBuilder, k: int) -> List[Dict[str, Any]]:
+    """First ``k`` examples of ``builder`` when it is asked for only ``k``.
+
+    Builders that do not scale with the sample count (e.g. company KB facts)
+    are cut to ``k``.
+    """
+    cfg = builder.config
+    small = builder.with_config(dataclasses.replace(
+        cfg,
+        sample_scale=1.0,
+        section_samples={**(cfg.section_samples or {}), builder.section_key: k},
+    ))
+    return clean_examples(small.build_examples(), builder.file_name)[:k]
+
+
+def reservoir_sample(items: Iterable[Any], k: int, rng: np.random.Generator) -> List[Any]:
+    """Uniform sample of ``k`` items from a stream of unknown length.
+
+    Algorithm L: after the reservoir fills, jump directly to the next item
+    that replaces a reservoir entry, so the cost is O(k log(n / k)) random
+    draws. Items keep stream order when fewer than ``k`` are available.
+    """
+    if k <= 0:
+        return []
+    it = iter(items)
+    reservoir: List[Any] = []
+    for item in it:
+        reservoir.append(item)
+        if len(reservoir) == k:
+            break
+    else:
+        return reservoir
+
+    w = math.exp(math.log(_open_unit(rng)) / k)
+    while True:
+        skip = math.floor(math.log(_open_unit(rng)) / math.log(1 - w))
+        for _ in range(skip):
+            if next(it, _END) is _END:
+                return reservoir
+        item = next(it, _END)
+        if item is _END:
+            return reservoir
+        reservoir[int(rng.integers(k))] = item
+        w *= math.exp(math.log(_open_unit(rng)) / k)
+
+
+def _open_unit(rng: np.random.Generator) -> float:
+    """Uniform draw from the open interval (0, 1); logs of 0 are undefined."""
+    u = rng.random()
+    while u == 0.0:
+        u = rng.random()
+    return u
+
+
+def sample_examples(builder: SectionBuilder, k: int) -> List[Dict[str, Any]]:
+    """``k`` examples drawn uniformly from ``builder``'s full, cleaned output.
+
+    The section is streamed, never held in full.
+    """
+    cfg = builder.config
+    rng = builder.rng_streams.generator(cfg.sampling_key or cfg.id, f"{builder.section_key}/reservoir")
+    stream = iter_clean_examples(builder.iter_examples(), builder.file_name)
+    return reservoir_sample(stream, k, rng)
+
+
+def _shorten(value: Any, width: int) -> str:
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    text = " ".join(text.split())
+    return text if len(text) <= width else text[: width - 3] + "..."
+
+
+def print_examples(
+    title: str, examples: List[Dict[str, Any]], out: TextIO, width: int = DEFAULT_WIDTH
+) -> None:
+    """One block per section; one truncated line per non-empty field."""
+    out.write(f"== {title} ==\n")
+    if not examples:
+        out.write("   (no examples)\n")
+    for i, ex in enumerate(examples, start=1):
+        for n, field in enumerate(("instruction", "input", "output")):
+            value = ex.get(field)
+            if value in (None, ""):
+                continue
+            prefix = f"{i:>3} " if n == 0 else "    "
+            label = f"{field}: "
+            out.write(prefix + label + _shorten(value, width - len(prefix) - len(label)) + "\n")
+    out.write("\n")
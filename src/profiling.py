@@ -0,0 +1,172 @@
+# dataset_generator/profiling.py
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# -----------------------------------------------------------------------------
+# Per-section profiling
+#
+# ``--profile`` wraps every builder and every save call in its own profile so
+# hot spots are attributed to one section instead of being averaged over the
+# whole run. Two modes are supported:
+#
+# * ``cprofile`` (default): deterministic, exact call counts, writes
+#   ``<label>.pstats`` for ``pstats``/snakeviz plus ``<label>.collapsed.txt``.
+#   cProfile only keeps caller -> callee edges, not full stacks, so the
+#   collapsed stacks are reconstructed by splitting each function's time
+#   across its callees in proportion to the edge times (exact for trees,
+#   an approximation when a function is reached along several paths).
+# * ``sample``: a background thread snapshots the generating thread's stack
+#   every ``interval`` seconds. Overhead stays roughly constant however many
+#   calls the builders make, which matters on big runs. Only the collapsed
+#   stacks (one count per sample) are written.
+#
+# Collapsed files use the ``frame;frame;frame count`` format read by
+# flamegraph.pl, speedscope and inferno.
+
+PROFILE_MODES = ("cprofile", "sample")
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# Frames deeper than this are not followed when reconstructing stacks.
+_MAX_STACK_DEPTH = 200
+
+FuncKey = Tuple[str, int, str]  # (file name, first line, function name) as in pstats
+
+
+def _frame_label(filename: str, lineno: int, name: str) -> str:
+    if filename == "~":  # built-ins such as <built-in method builtins.len>
+        return name
+    short = "/".join(Path(filename).parts[-2:])
+    return f"{name} ({short}:{lineno})"
+
+
+def _code_label(code: CodeType) -> str:
+    return _frame_label(code.co_filename, code.co_firstlineno, code.co_name)
+
+
+def collapse_pstats(stats: pstats.Stats) -> Dict[str, int]:
+    """Reconstruct collapsed stacks (in microseconds) from cProfile stats."""
+    raw = stats.stats  # type: ignore[attr-defined]
+    children: Dict[FuncKey, List[Tuple[FuncKey, float]]] = {}
+    roots: List[FuncKey] = []
+    for func, (_, _, _, _, callers) in raw.items():
+        known = [c for c in callers if c in raw]
+        if not known:
+            roots.append(func)
+        for caller in known:
+            children.setdefault(caller, []).append((func, callers[caller][3]))
+
+    out: Counter = Counter()
+
+    def walk(func: FuncKey, weight: float, path: List[str], on_path: set) -> None:
+        _, _, own, total, _ = raw[func]
+        path = path + [_frame_label(*func)]
+        fraction = weight / total if total > 0 else 0.0
+        self_us = int(round(own * fraction * 1e6))
+        if self_us:
+            out[";".join(path)] += self_us
+        if len(path) >= _MAX_STACK_DEPTH:
+            return
+        for child, edge in children.get(func, ()):
+            if child in on_path:  # recursion: time is already counted above
+                continue
+            walk(child, edge * fraction, path, on_path | {child})
+
+    for root in roots:
+        walk(root, raw[root][3], [], {root})
+    return dict(out)
+
+
+def write_collapsed(path: Path, stacks: Dict[str, int]) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        for stack, count in sorted(stacks.items()):
+            f.write(f"{stack} {count}\n")
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        super().__init__(name="section-profiler", daemon=True)
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self.stacks: Counter = Counter()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            frame: Optional[FrameType] = sys._current_frames().get(self._thread_id)
+            labels: List[str] = []
+            while frame is not None and len(labels) < _MAX_STACK_DEPTH:
+                labels.append(_code_label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class SectionProfiler:
+    """Profiles labelled blocks and writes one profile per label.
+
+    Parameters
+    ----------
+    out_dir: Path
+        Directory receiving ``<label>.pstats`` and ``<label>.collapsed.txt``.
+    mode: str, optional
+        ``"cprofile"`` or ``"sample"`` (see module comment).
+    interval: float, optional
+        Seconds between stack samples in ``sample`` mode.
+    """
+
+    def __init__(self, out_dir: Path, mode: str = "cprofile", interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}")
+        self.out_dir = out_dir
+        self.mode = mode
+        self.interval = interval
+        self.written: List[Path] = []
+
+    def subdir(self, name: str) -> SectionProfiler:
+        """A profiler writing into ``out_dir / name`` that shares the file list."""
+        child = SectionProfiler(self.out_dir / name, self.mode, self.interval)
+        child.written = self.written
+        return child
+
+    @contextmanager
+    def profile(self, label: str) -> Iterator[None]:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        collapsed_path = self.out_dir / f"{label}.collapsed.txt"
+        if self.mode == "sample":
+            sampler = _StackSampler(threading.get_ident(), self.interval)
+            sampler.start()
+            try:
+                yield
+            finally:
+                sampler.stop()
+                write_collapsed(collapsed_path, sampler.stacks)
+                self.written.append(collapsed_path)
+            return
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            stats_path = self.out_dir / f"{label}.pstats"
+            profiler.dump_stats(str(stats_path))
+            write_collapsed(collapsed_path, collapse_pstats(pstats.Stats(profiler)))
+            self.written.extend([stats_path, collapsed_path])
@@ -0,0 +1,216 @@
+# dataset_generator/progress.py
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, TextIO
+
+if TYPE_CHECKING:
+    from .generator import SectionResult
+
+
+# -----------------------------------------------------------------------------
+# Live progress reporting
+#
+# Builders call ``SectionBuilder.report_progress`` for every example; the
+# reporter answers each call with the example count at which it next wants to
+# hear back, extrapolated from the current rate so that updates arrive about
+# once per ``min_interval`` seconds. Between updates the hot loop pays one
+# integer comparison. Output goes to stderr so it never mixes with datasets or
+# other tooling reading stdout: a single rewritten status line on a terminal,
+# JSON lines (one event per line) otherwise.
+
+PROGRESS_MODES = ("auto", "tty", "json", "off")
+DEFAULT_MIN_INTERVAL = 0.5
+
+
+def _format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "?"
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def _format_rate(rate: float) -> str:
+    return f"{rate / 1000:.1f}k" if rate >= 1000 else f"{rate:.0f}"
+
+
+class ProgressReporter:
+    """Throttled progress and throughput reporting for a generation run.
+
+    Parameters
+    ----------
+    stream: text stream, optional
+        Where to write; defaults to ``sys.stderr``.
+    json_lines: bool, optional
+        Emit JSON lines instead of a status line. Defaults to whether
+        ``stream`` is not a terminal.
+    min_interval: float, optional
+        Minimum seconds between two progress updates.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        json_lines: Optional[bool] = None,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+    ) -> None:
+        self._stream = stream if stream is not None else sys.stderr
+        self._json = json_lines if json_lines is not None else not self._stream.isatty()
+        self._min_interval = min_interval
+        self._run_planned = 0
+        self._run_built = 0
+        self._run_written = 0
+        self._run_start = 0.0
+        self._sections_total = 0
+        self._sections_done = 0
+        self._domain = ""
+        self._section = ""
+        self._planned = 0
+        self._built = 0
+        self._section_start = 0.0
+        self._last_emit = 0.0
+        self._line_open = False
+
+    # -- run ----------------------------------------------------------------
+
+    def run_started(self, planned_examples: int, sections: int) -> None:
+        self._run_planned = planned_examples
+        self._run_built = 0
+        self._run_written = 0
+        self._sections_total = sections
+        self._sections_done = 0
+        self._run_start = time.perf_counter()
+        self._emit({"event": "run_started", "planned": planned_examples, "sections": sections})
+
+    def run_finished(self) -> None:
+        elapsed = time.perf_counter() - self._run_start
+        self._emit({
+            "event": "run_finished",
+            "examples": self._run_written,
+            "elapsed_s": round(elapsed, 3),
+            "examples_per_s": round(self._run_written / elapsed, 1) if elapsed else 0.0,
+        })
+
+    # -- sections -----------------------------------------------------------
+
+    def section_started(self, domain: str, section: str, planned: int) -> None:
+        self._domain = domain
+        self._section = section
+        self._planned = planned
+        self._built = 0
+        self._section_start = self._last_emit = time.perf_counter()
+
+    def update(self, done: int) -> int:
+        """Progress callback for :meth:`SectionBuilder.set_progress`."""
+        now = time.perf_counter()
+        elapsed = now - self._section_start
+        rate = done / elapsed if elapsed > 0 else 0.0
+        if now - self._last_emit >= self._min_interval:
+            self._last_emit = now
+            self._emit_progress("build", done, rate, elapsed)
+        # Ask to be called again roughly one interval from now.
+        return done + max(1, int(rate * self._min_interval))
+
+    def build_finished(self, examples: int) -> None:
+        self._built = examples
+
+    def stage(self, stage: str) -> None:
+        """A save stage (validate, dedup, stats, write) has started."""
+        now = time.perf_counter()
+        if now - self._last_emit >= self._min_interval:
+            self._last_emit = now
+            self._emit_progress(stage, self._built, None, now - self._section_start)
+
+    def section_finished(self, result: SectionResult) -> None:
+        self._sections_done += 1
+        self._run_built += result.examples
+        self._run_written += result.written
+        dedup_rate = 1 - result.written / result.examples if result.examples and not result.skipped else 0.0
+        self._emit({
+            "event": "section_finished",
+            "domain": result.domain,
+            "section": result.section,
+            "examples": result.examples,
+            "written": result.written,
+            "dedup_rate": round(dedup_rate, 4),
+            "seconds": round(result.seconds, 3),
+            "examples_per_s": round(result.examples_per_second, 1),
+            "reused": result.reused,
+            "skipped": result.skipped,
+            "sections_done": self._sections_done,
+            "sections": self._sections_total,
+            "run_eta_s": self._run_eta(),
+        })
+
+    # -- output -------------------------------------------------------------
+
+    def _run_eta(self) -> Optional[float]:
+        elapsed = time.perf_counter() - self._run_start
+        if not self._run_built or elapsed <= 0:
+            return None
+        remaining = max(self._run_planned - self._run_built, 0)
+        return round(remaining / (self._run_built / elapsed), 1)
+
+    def _emit_progress(self, stage: str, done: int, rate: Optional[float], elapsed: float) -> None:
+        eta = (self._planned - done) / rate if rate else None
+        planned = max(self._planned, done)
+        self._emit({
+            "event": "progress",
+            "domain": self._domain,
+            "section": self._section,
+            "stage": stage,
+            "done": done,
+            "planned": planned,
+            "examples_per_s": round(rate, 1) if rate is not None else None,
+            "elapsed_s": round(elapsed, 3),
+            "eta_s": round(max(eta, 0.0), 1) if eta is not None else None,
+        })
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        if self._json:
+            self._stream.write(json.dumps(event) + "\n")
+            self._stream.flush()
+            return
+        kind = event["event"]
+        if kind == "progress":
+            pct = 100 * event["done"] / event["planned"] if event["planned"] else 100.0
+            line = (
+                f"[{self._sections_done + 1}/{self._sections_total}] {event['domain']}/{event['section']} "
+                f"{event['stage']} {event['done']}/{event['planned']} ({pct:.0f}%)"
+            )
+            if event["examples_per_s"] is not None:
+                line += (
+                    f" {_format_rate(event['examples_per_s'])} ex/s"
+                    f" ETA {_format_duration(event['eta_s'])}"
+                )
+            self._stream.write("\r\033[K" + line)
+            self._line_open = True
+        else:
+            if self._line_open:
+                self._stream.write("\r\033[K")
+                self._line_open = False
+            if kind == "section_finished" and event["skipped"]:
+                self._stream.write(
+                    f"[{event['sections_done']}/{event['sections']}] {event['domain']}/{event['section']}: "
+                    f"unchanged, skipped; run ETA {_format_duration(event['run_eta_s'])}\n"
+                )
+            elif kind == "section_finished":
+                self._stream.write(
+                    f"[{event['sections_done']}/{event['sections']}] {event['domain']}/{event['section']}: "
+                    f"{event['written']}/{event['examples']} kept (dedup {100 * event['dedup_rate']:.1f}%), "
+                    f"{event['seconds']:.2f}s, {_format_rate(event['examples_per_s'])} ex/s, "
+                    f"run ETA {_format_duration(event['run_eta_s'])}\n"
+                )
+            elif kind == "run_finished":
+                self._stream.write(
+                    f"Done: {event['examples']} examples in {event['elapsed_s']:.1f}s "
+                    f"({_format_rate(event['examples_per_s'])} ex/s)\n"
+                )
+        self._stream.flush()
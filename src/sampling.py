@@ -0,0 +1,241 @@
+# dataset_generator/sampling.py
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# -----------------------------------------------------------------------------
+# Lazy combinatorial index spaces
+#
+# Section builders combine a handful of small lists (regions, roles, products,
+# templates...) into training examples. Materializing the Cartesian product of
+# those lists costs memory proportional to the product size, which becomes the
+# bottleneck once datasets are scaled to millions of examples. The helpers here
+# address the product *by index* instead, so any element can be computed in
+# O(number of slots) time and O(1) memory.
+
+
+class MixedRadixSpace(Sequence[Tuple[int, ...]]):
+    """Cartesian product of ``range(r)`` for each radix, addressed by index.
+
+    Index ``i`` is decoded as a mixed-radix number whose last digit varies
+    fastest, so iterating ``range(len(space))`` visits the tuples in the same
+    order as the equivalent nested ``for`` loops (or ``itertools.product``).
+
+    Parameters
+    ----------
+    radices: sequence of int
+        Size of each slot. Every radix must be at least 1.
+    """
+
+    def __init__(self, radices: Sequence[int]) -> None:
+        if any(r < 1 for r in radices):
+            raise ValueError(f"All radices must be >= 1, got {list(radices)}")
+        self._radices: Tuple[int, ...] = tuple(radices)
+        size = 1
+        for r in self._radices:
+            size *= r
+        self._size = size
+
+    @property
+    def radices(self) -> Tuple[int, ...]:
+        return self._radices
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Tuple[int, ...]:  # type: ignore[override]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(f"Index {index} out of range for space of size {self._size}")
+        return self.digits(index)
+
+    def digits(self, index: int) -> Tuple[int, ...]:
+        """Decode ``index`` (assumed in range) into one digit per radix."""
+        out = [0] * len(self._radices)
+        for pos in range(len(self._radices) - 1, -1, -1):
+            index, out[pos] = divmod(index, self._radices[pos])
+        return tuple(out)
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        for i in range(self._size):
+            yield self.digits(i)
+
+    def __repr__(self) -> str:
+        return f"MixedRadixSpace(radices={list(self._radices)})"
+
+
+class IndexPermutation:
+    """Seeded bijective shuffle of ``range(size)``.
+
+    Uses a balanced Feistel network over the smallest even number of bits that
+    covers ``size`` and cycle-walks values that fall outside the range. Every
+    index maps to a distinct index, so walking ``0..size-1`` through the
+    permutation visits each element exactly once, in a pseudo-random order,
+    with O(1) memory.
+
+    Parameters
+    ----------
+    size: int
+        Number of elements to permute.
+    seed: int, optional
+        Key for the round function. Different seeds give different orders.
+    rounds: int, optional
+        Number of Feistel rounds. Four is enough to decorrelate neighbours.
+    """
+
+    _MASK64 = (1 << 64) - 1
+
+    def __init__(self, size: int, seed: int = 0, rounds: int = 4) -> None:
+        if size < 0:
+            raise ValueError(f"size must be >= 0, got {size}")
+        self._size = size
+        half_bits = max(1, ((max(size, 2) - 1).bit_length() + 1) // 2)
+        self._half_bits = half_bits
+        self._half_mask = (1 << half_bits) - 1
+        self._keys = [self._mix(seed * 0x9E3779B97F4A7C15 + r) for r in range(rounds)]
+
+    @classmethod
+    def _mix(cls, x: int) -> int:
+        # splitmix64 finalizer
+        x = (x + 0x9E3779B97F4A7C15) & cls._MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & cls._MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & cls._MASK64
+        return x ^ (x >> 31)
+
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self._half_bits, value & self._half_mask
+        for key in self._keys:
+            left, right = right, left ^ (self._mix(right ^ key) & self._half_mask)
+        return (left << self._half_bits) | right
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __call__(self, index: int) -> int:
+        if not 0 <= index < self._size:
+            raise IndexError(f"Index {index} out of range for permutation of size {self._size}")
+        value = self._encrypt(index)
+        while value >= self._size:
+            value = self._encrypt(value)
+        return value
+
+
+class CoverageSampler(Sequence[Dict[str, Any]]):
+    """Collision-free, permuted walk over the Cartesian space of named slots.
+
+    Builders describe each independent choice they make (template, product,
+    role, region...) as a slot. Element ``i`` of the sampler is the ``i``-th
+    combination of a seeded :class:`IndexPermutation` of the full product, so
+    the first ``k`` elements are ``k`` distinct combinations spread evenly over
+    every slot, rather than the correlated cycles produced by ``idx % len``.
+
+    Parameters
+    ----------
+    slots: mapping of str to sequence
+        Slot name to the values it can take. Order of keys is preserved.
+    seed: int, optional
+        Seed for the permutation of the combination space.
+
+    Examples
+    --------
+    >>> sampler = CoverageSampler({"template": templates, "role": roles})
+    >>> sampler.size                     # exact number of unique combinations
+    >>> for combo in sampler.take(n):    # at most ``sampler.size`` combos
+    ...     combo["template"].format(role=combo["role"])
+    """
+
+    def __init__(self, slots: Mapping[str, Sequence[Any]], seed: int = 0) -> None:
+        self._names = list(slots)
+        # Keep the sequences as given (e.g. ``range`` or other lazy sequences);
+        # only the chosen element of each slot is ever materialized.
+        self._values = [slots[name] for name in self._names]
+        empty = [name for name, values in zip(self._names, self._values) if not values]
+        if empty:
+            raise ValueError(f"Slots must not be empty: {empty}")
+        self._space = MixedRadixSpace([len(values) for values in self._values])
+        self._permutation = IndexPermutation(len(self._space), seed=seed)
+
+    @property
+    def size(self) -> int:
+        """Exact number of unique slot combinations."""
+        return len(self._space)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:  # type: ignore[override]
+        if index < 0:
+            index += self.size
+        digits = self._space.digits(self._permutation(index))
+        return {
+            name: values[d] for name, values, d in zip(self._names, self._values, digits)
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.take(self.size)
+
+    def take(self, n: int) -> Iterator[Dict[str, Any]]:
+        """Yield the first ``min(n, size)`` combinations; never repeats one."""
+        for i in range(min(n, self.size)):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        slots = ", ".join(f"{name}={len(v)}" for name, v in zip(self._names, self._values))
+        return f"CoverageSampler({slots}, size={self.size})"
+
+
+def _stable_key(name: str) -> int:
+    """32-bit key for ``name`` that, unlike ``hash``, is stable across processes."""
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=4).digest(), "big")
+
+
+class RngStreams:
+    """Reproducible, independent RNG substreams for parallel generation.
+
+    Each ``(domain, section, shard)`` triple addresses its own
+    ``numpy.random.SeedSequence`` node: the run seed is the entropy and the
+    triple is the ``spawn_key``, exactly as if the root sequence had been
+    ``spawn``-ed along that path. Streams are derived directly from their key
+    rather than in spawn order, so a stream's numbers do not depend on how
+    many workers there are or in which order they ask for streams. Generators
+    use the counter-based ``Philox`` bit generator.
+
+    Parameters
+    ----------
+    seed: int, optional
+        Root seed for the run. ``None`` uses a fixed default so that output is
+        reproducible unless a seed is chosen explicitly.
+    """
+
+    DEFAULT_SEED = 0
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self._seed = self.DEFAULT_SEED if seed is None else seed
+        if self._seed < 0:
+            raise ValueError(f"seed must be >= 0, got {self._seed}")
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    def seed_sequence(self, domain: str, section: str, shard: int = 0) -> np.random.SeedSequence:
+        """Return the seed sequence for one ``(domain, section, shard)`` substream."""
+        return np.random.SeedSequence(
+            entropy=self._seed,
+            spawn_key=(_stable_key(domain), _stable_key(section), shard),
+        )
+
+    def generator(self, domain: str, section: str, shard: int = 0) -> np.random.Generator:
+        """Return a fresh generator positioned at the start of the substream."""
+        return np.random.Generator(np.random.Philox(self.seed_sequence(domain, section, shard)))
+
+    def int_seed(self, domain: str, section: str, shard: int = 0) -> int:
+        """Return a 64-bit integer seed for the substream (e.g. for permutations)."""
+        state = self.seed_sequence(domain, section, shard).generate_state(2, dtype=np.uint32)
+        return (int(state[0]) << 32) | int(state[1])
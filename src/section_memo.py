@@ -0,0 +1,168 @@
+# dataset_generator/section_memo.py
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import FrozenInstanceError, fields
+from typing import Any, Collection, Dict, FrozenSet, Hashable, List, Sequence, Tuple
+
+from .domain_config import DomainConfig
+from .sections import SectionBuilder
+
+
+# -----------------------------------------------------------------------------
+# Sharing section outputs across domains
+#
+# Many sections only read a few DomainConfig fields (often just agent_name and
+# domain_name). When one base config is fanned out into many tenant variants,
+# rebuilding those sections for every variant is wasted work. Builders are
+# therefore run against a proxy that records which fields they read; the
+# output is memoized under the values of exactly those fields. A later domain
+# that agrees on all of them would take the same code path and produce the
+# same examples, so the stored list is reused.
+#
+# Outputs are only kept while they can still be reused. Before a run the
+# generator registers every builder it is about to run (``plan``); an output
+# is stored only if a builder still pending agrees on the fields read, and it
+# is dropped once the last such builder has taken it. Memory therefore holds
+# just the outputs of sections genuinely shared with a later domain, and
+# ``budget.py`` adds those to its peak estimate. Watch mode, which compares
+# each rebuild with what it wrote before, keeps every output instead
+# (``retain_all``).
+
+_CONFIG_FIELDS = frozenset(f.name for f in fields(DomainConfig))
+
+
+class ConfigAccessRecorder:
+    """Read-only stand-in for a DomainConfig that records the fields read."""
+
+    __slots__ = ("_config", "_accessed")
+
+    def __init__(self, config: DomainConfig) -> None:
+        object.__setattr__(self, "_config", config)
+        object.__setattr__(self, "_accessed", set())
+
+    @property
+    def accessed(self) -> FrozenSet[str]:
+        return frozenset(self._accessed)
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._config, name)
+        if name in _CONFIG_FIELDS:
+            self._accessed.add(name)
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable, order-preserving representation of a config value."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def builder_key(builder: SectionBuilder) -> Tuple[type, int]:
+    return type(builder), builder.rng_streams.seed
+
+
+def memo_key(builder: SectionBuilder, names: Tuple[str, ...]) -> Tuple[Any, ...]:
+    """Key under which ``builder``'s output is stored when it read ``names``."""
+    return (builder_key(builder), names, tuple(_freeze(getattr(builder.config, n)) for n in names))
+
+
+class SectionMemo:
+    """Memoized section outputs keyed on the config fields each builder read.
+
+    A builder type may read different fields on different code paths (e.g.
+    company KB facts present or not), so every distinct set of fields seen
+    for a builder type is kept and tried in turn.
+
+    Parameters
+    ----------
+    retain_all: bool, optional
+        Keep every output for the memo's lifetime instead of only those a
+        planned builder can still reuse.
+    """
+
+    def __init__(self, retain_all: bool = False) -> None:
+        self._retain_all = retain_all
+        self._field_sets: Dict[Tuple[type, int], List[Tuple[str, ...]]] = {}
+        self._outputs: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = {}
+        # Builders of the current plan not run yet, and per (builder type,
+        # field set) how many of them would hit each key; counts are derived
+        # when a field set is first seen and kept up to date as builders run.
+        self._pending: Dict[Tuple[type, int], Dict[int, SectionBuilder]] = {}
+        self._pending_keys: Dict[Tuple[Tuple[type, int], Tuple[str, ...]], Counter] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._outputs)
+
+    def plan(self, builders: Sequence[SectionBuilder]) -> None:
+        """Register the builders of the coming run, replacing any earlier plan."""
+        self._pending = {}
+        self._pending_keys = {}
+        for builder in builders:
+            self._pending.setdefault(builder_key(builder), {})[id(builder)] = builder
+
+    def _pending_counts(self, bkey: Tuple[type, int], names: Tuple[str, ...]) -> Counter:
+        counts = self._pending_keys.get((bkey, names))
+        if counts is None:
+            counts = Counter(memo_key(b, names) for b in self._pending.get(bkey, {}).values())
+            self._pending_keys[(bkey, names)] = counts
+        return counts
+
+    def _consume(self, builder: SectionBuilder) -> None:
+        bkey = builder_key(builder)
+        if self._pending.get(bkey, {}).pop(id(builder), None) is None:
+            return
+        for names in self._field_sets.get(bkey, ()):
+            counts = self._pending_keys.get((bkey, names))
+            if counts is not None:
+                counts[memo_key(builder, names)] -= 1
+
+    def _wanted(self, key: Tuple[Any, ...]) -> bool:
+        if self._retain_all:
+            return True
+        bkey, names, _ = key
+        return self._pending_counts(bkey, names)[key] > 0
+
+    def build(self, builder: SectionBuilder) -> Tuple[List[Dict[str, Any]], bool]:
+        """Return ``builder``'s examples and whether they were reused.
+
+        The returned list may be shared with other domains and must not be
+        mutated.
+        """
+        bkey = builder_key(builder)
+        self._consume(builder)
+        for names in self._field_sets.get(bkey, ()):
+            key = memo_key(builder, names)
+            cached = self._outputs.get(key)
+            if cached is not None:
+                self.hits += 1
+                if not self._wanted(key):
+                    del self._outputs[key]
+                return cached, True
+
+        recorder = ConfigAccessRecorder(builder.config)
+        examples = builder.with_config(recorder).build_examples()  # type: ignore[arg-type]
+        names = tuple(sorted(recorder.accessed))
+        known = self._field_sets.setdefault(bkey, [])
+        if names not in known:
+            known.append(names)
+        key = memo_key(builder, names)
+        if self._wanted(key):
+            self._outputs[key] = examples
+        self.misses += 1
+        return examples, False
+
+    def forget(self, builder_types: Collection[type]) -> None:
+        """Drop every output of ``builder_types`` (e.g. after reloading them)."""
+        self._field_sets = {k: v for k, v in self._field_sets.items() if k[0] not in builder_types}
+        self._outputs = {k: v for k, v in self._outputs.items() if k[0][0] not in builder_types}
+        self._pending_keys = {k: v for k, v in self._pending_keys.items() if k[0][0] not in builder_types}
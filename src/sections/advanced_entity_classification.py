@@ -3,10 +3,75 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator
+
+import numpy as np
 
 from .base import SectionBuilder
-from ..utils import make_metadata
+from ..utils import dumps_float_rows, make_metadata
+
+
+LABEL_CONFIDENCE_MODES = ("full", "top_k", "sparse")
+
+# Confidence for labels that apply, and the base value for those that do not.
+_POSITIVE_CONFIDENCE = 0.85
+_NEGATIVE_CONFIDENCE = 0.05
+_BATCH_SIZE = 4096
+# Low-confidence offsets (0.00 .. 0.04) each entity is paired with.
+_LOW_CONFIDENCE_OFFSETS = 5
+
+_SAMPLE_ENTITIES = [
+    ("ACME Cabs Pvt Ltd", ["Vendor", "ServiceProvider"]),
+    ("Corporate Travel Policy 2025", ["ExpensePolicy", "Document"]),
+    ("GL Account 5400 – Travel", ["GLAccount", "CostCenter"]),
+    ("ACME Software FZ-LLC", ["Vendor", "TechnologyPartner"]),
+    ("ACME Logistics LLC", ["Vendor", "Logistics"]),
+    ("Project Phoenix 2024", ["Project", "ExpensePolicy"]),
+    ("Vendor: Beta Travel Inc", ["Vendor", "ServiceProvider"]),
+    ("GL Account 6200 – Marketing", ["GLAccount", "CostCenter"]),
+    ("Enterprise SaaS License Agreement", ["ExpensePolicy", "Document", "Contract"]),
+    ("Delta Consulting Group", ["Vendor", "ServiceProvider", "Consultant"]),
+    ("Employee Travel Reimbursement Policy", ["ExpensePolicy", "Document"]),
+    ("GL Account 7100 – R&D", ["GLAccount", "CostCenter", "Project"]),
+    ("Omega Cloud Services Inc", ["Vendor", "TechnologyPartner", "CloudProvider"]),
+    ("Project Atlas 2025", ["Project", "ExpensePolicy", "Initiative"]),
+    ("Sigma Transportation Ltd", ["Vendor", "ServiceProvider", "Logistics"]),
+    ("GL Account 5500 – Meals & Entertainment", ["GLAccount", "CostCenter"]),
+    ("Corporate Card Usage Policy", ["ExpensePolicy", "Document", "FinancePolicy"]),
+    ("Gamma Analytics Platform", ["Vendor", "TechnologyPartner", "SaaS"]),
+    ("GL Account 8300 – Office Supplies", ["GLAccount", "CostCenter"]),
+    ("Theta Legal Services PLLC", ["Vendor", "ServiceProvider", "Legal"]),
+    ("Remote Work Equipment Policy", ["ExpensePolicy", "Document"]),
+    ("Project Horizon Q1-2025", ["Project", "Initiative"]),
+    ("Zeta Catering Services", ["Vendor", "ServiceProvider"]),
+    ("GL Account 9100 – Training & Development", ["GLAccount", "CostCenter", "HR"]),
+    ("Annual Conference Travel Policy", ["ExpensePolicy", "Document", "Event"]),
+    ("Kappa IT Solutions Corp", ["Vendor", "TechnologyPartner", "Consultant"]),
+    ("GL Account 5600 – Lodging", ["GLAccount", "CostCenter"]),
+    ("Lambda Recruitment Partners", ["Vendor", "ServiceProvider", "HR"]),
+    ("Expense Approval Workflow 2025", ["ExpensePolicy", "Document", "Process"]),
+    ("Project Quantum Leap", ["Project", "Initiative", "Transformation"]),
+    ("Epsilon Marketing Agency", ["Vendor", "ServiceProvider", "Marketing"]),
+    ("GL Account 7200 – Software Licenses", ["GLAccount", "CostCenter", "Technology"]),
+    ("Iota Facilities Management", ["Vendor", "ServiceProvider"]),
+    ("Vendor Payment Terms Policy", ["ExpensePolicy", "Document", "FinancePolicy"]),
+    ("GL Account 8500 – Telecommunications", ["GLAccount", "CostCenter"]),
+    ("Nu Data Security Solutions", ["Vendor", "TechnologyPartner", "Security"]),
+    ("Project Innovation Hub", ["Project", "Initiative", "R&D"]),
+    ("Xi Event Planning Services", ["Vendor", "ServiceProvider", "Event"]),
+    ("Per Diem Policy International", ["ExpensePolicy", "Document"]),
+    ("GL Account 6300 – Advertising", ["GLAccount", "CostCenter", "Marketing"]),
+    ("Omicron Healthcare Benefits", ["Vendor", "ServiceProvider", "HR"]),
+    ("Capital Expenditure Policy", ["ExpensePolicy", "Document", "FinancePolicy"]),
+    ("Rho Engineering Contractors", ["Vendor", "ServiceProvider", "Engineering"]),
+    ("GL Account 9200 – Professional Development", ["GLAccount", "CostCenter", "HR"]),
+    ("Tau Translation Services", ["Vendor", "ServiceProvider", "Consultant"]),
+    ("Project Digital Transformation", ["Project", "Initiative", "Technology"]),
+    ("Upsilon Shipping & Freight", ["Vendor", "Logistics", "ServiceProvider"]),
+    ("Mileage Reimbursement Policy", ["ExpensePolicy", "Document"]),
+    ("GL Account 5700 – Ground Transportation", ["GLAccount", "CostCenter"]),
+    ("Phi Property Management LLC", ["Vendor", "ServiceProvider", "RealEstate"]),
+]
 
 
 class AdvancedEntityClassificationTrainingBuilder(SectionBuilder):
@@ -18,113 +83,105 @@ class AdvancedEntityClassificationTrainingBuilder(SectionBuilder):
     - Confidence per label
     """
 
+    section_key = "advanced_entity_classification"
+    default_samples = 150
+
     @property
     def file_name(self) -> str:
         return "advanced_entity_classification_training.json"
 
-    def build_examples(self) -> List[Dict[str, Any]]:
+    @property
+    def planned_count(self) -> int:
+        return min(self.sample_count, len(_SAMPLE_ENTITIES) * _LOW_CONFIDENCE_OFFSETS)
+
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
         cfg = self.config
-        # Increased from 100 to 150 to account for deduplication
-        n = 150
-        examples: List[Dict[str, Any]] = []
-
-        sample_entities = [
-            ("ACME Cabs Pvt Ltd", ["Vendor", "ServiceProvider"]),
-            ("Corporate Travel Policy 2025", ["ExpensePolicy", "Document"]),
-            ("GL Account 5400 – Travel", ["GLAccount", "CostCenter"]),
-            ("ACME Software FZ-LLC", ["Vendor", "TechnologyPartner"]),
-            ("ACME Logistics LLC", ["Vendor", "Logistics"]),
-            ("Project Phoenix 2024", ["Project", "ExpensePolicy"]),
-            ("Vendor: Beta Travel Inc", ["Vendor", "ServiceProvider"]),
-            ("GL Account 6200 – Marketing", ["GLAccount", "CostCenter"]),
-            ("Enterprise SaaS License Agreement", ["ExpensePolicy", "Document", "Contract"]),
-            ("Delta Consulting Group", ["Vendor", "ServiceProvider", "Consultant"]),
-            ("Employee Travel Reimbursement Policy", ["ExpensePolicy", "Document"]),
-            ("GL Account 7100 – R&D", ["GLAccount", "CostCenter", "Project"]),
-            ("Omega Cloud Services Inc", ["Vendor", "TechnologyPartner", "CloudProvider"]),
-            ("Project Atlas 2025", ["Project", "ExpensePolicy", "Initiative"]),
-            ("Sigma Transportation Ltd", ["Vendor", "ServiceProvider", "Logistics"]),
-            ("GL Account 5500 – Meals & Entertainment", ["GLAccount", "CostCenter"]),
-            ("Corporate Card Usage Policy", ["ExpensePolicy", "Document", "FinancePolicy"]),
-            ("Gamma Analytics Platform", ["Vendor", "TechnologyPartner", "SaaS"]),
-            ("GL Account 8300 – Office Supplies", ["GLAccount", "CostCenter"]),
-            ("Theta Legal Services PLLC", ["Vendor", "ServiceProvider", "Legal"]),
-            ("Remote Work Equipment Policy", ["ExpensePolicy", "Document"]),
-            ("Project Horizon Q1-2025", ["Project", "Initiative"]),
-            ("Zeta Catering Services", ["Vendor", "ServiceProvider"]),
-            ("GL Account 9100 – Training & Development", ["GLAccount", "CostCenter", "HR"]),
-            ("Annual Conference Travel Policy", ["ExpensePolicy", "Document", "Event"]),
-            ("Kappa IT Solutions Corp", ["Vendor", "TechnologyPartner", "Consultant"]),
-            ("GL Account 5600 – Lodging", ["GLAccount", "CostCenter"]),
-            ("Lambda Recruitment Partners", ["Vendor", "ServiceProvider", "HR"]),
-            ("Expense Approval Workflow 2025", ["ExpensePolicy", "Document", "Process"]),
-            ("Project Quantum Leap", ["Project", "Initiative", "Transformation"]),
-            ("Epsilon Marketing Agency", ["Vendor", "ServiceProvider", "Marketing"]),
-            ("GL Account 7200 – Software Licenses", ["GLAccount", "CostCenter", "Technology"]),
-            ("Iota Facilities Management", ["Vendor", "ServiceProvider"]),
-            ("Vendor Payment Terms Policy", ["ExpensePolicy", "Document", "FinancePolicy"]),
-            ("GL Account 8500 – Telecommunications", ["GLAccount", "CostCenter"]),
-            ("Nu Data Security Solutions", ["Vendor", "TechnologyPartner", "Security"]),
-            ("Project Innovation Hub", ["Project", "Initiative", "R&D"]),
-            ("Xi Event Planning Services", ["Vendor", "ServiceProvider", "Event"]),
-            ("Per Diem Policy International", ["ExpensePolicy", "Document"]),
-            ("GL Account 6300 – Advertising", ["GLAccount", "CostCenter", "Marketing"]),
-            ("Omicron Healthcare Benefits", ["Vendor", "ServiceProvider", "HR"]),
-            ("Capital Expenditure Policy", ["ExpensePolicy", "Document", "FinancePolicy"]),
-            ("Rho Engineering Contractors", ["Vendor", "ServiceProvider", "Engineering"]),
-            ("GL Account 9200 – Professional Development", ["GLAccount", "CostCenter", "HR"]),
-            ("Tau Translation Services", ["Vendor", "ServiceProvider", "Consultant"]),
-            ("Project Digital Transformation", ["Project", "Initiative", "Technology"]),
-            ("Upsilon Shipping & Freight", ["Vendor", "Logistics", "ServiceProvider"]),
-            ("Mileage Reimbursement Policy", ["ExpensePolicy", "Document"]),
-            ("GL Account 5700 – Ground Transportation", ["GLAccount", "CostCenter"]),
-            ("Phi Property Management LLC", ["Vendor", "ServiceProvider", "RealEstate"]),
-        ]
+        n = self.sample_count
 
         possible_labels = sorted(
-            {label for _, labels in sample_entities for label in labels}
+            {label for _, labels in _SAMPLE_ENTITIES for label in labels}
         )
 
-        for idx in range(1, n + 1):
-            raw_name, labels = sample_entities[idx % len(sample_entities)]
-
-            system = (
-                f"You are {cfg.agent_name} advanced classification module. "
-                "Classify the entity into one or more labels, and assign a confidence "
-                "score per label. If a label does not apply, its confidence should be low."
-            )
-            instruction = f"Classify the entity with multi-label output: {raw_name}"
-
-            # Assign high confidence to correct labels and low to others. The values
-            # alternate slightly with the index to introduce minor variation.
-            label_confidences = {
-                label: (0.85 if label in labels else 0.05 + 0.01 * (idx % 5))
-                for label in possible_labels
-            }
-
-            output_dict = {
-                "entity": raw_name,
-                "multi_label": True,
-                "predicted_labels": labels,
-                "label_confidences": label_confidences,
-            }
-
-            meta = make_metadata(
-                section="advanced_entity_classification",
-                index=idx,
-                complexity="medium",
-                tags=["classification", "multi_label", "advanced"],
-                reasoning_mode="classification",
-                confidence=0.8,
-                possible_labels=possible_labels,
+        mode = cfg.label_confidence_mode
+        if mode not in LABEL_CONFIDENCE_MODES:
+            raise ValueError(
+                f"label_confidence_mode must be one of {LABEL_CONFIDENCE_MODES}, got '{mode}'"
             )
+        top_k = min(cfg.label_confidence_top_k, len(possible_labels))
+
+        # Multi-hot (entity × label) matrix; confidences for a batch are a single
+        # ``where`` over the rows of the batch's entities.
+        label_index = {label: i for i, label in enumerate(possible_labels)}
+        multi_hot = np.zeros((len(_SAMPLE_ENTITIES), len(possible_labels)), dtype=bool)
+        for row, (_, labels) in enumerate(_SAMPLE_ENTITIES):
+            multi_hot[row, [label_index[label] for label in labels]] = True
+
+        system = (
+            f"You are {cfg.agent_name} advanced classification module. "
+            "Classify the entity into one or more labels, and assign a confidence "
+            "score per label. If a label does not apply, its confidence should be low."
+        )
 
-            examples.append({
-                "system": system,
-                "instruction": instruction,
-                "input": raw_name,
-                "output": json.dumps(output_dict, ensure_ascii=False),
-                "metadata": meta,
-            })
-
-        return examples
+        # Each entity is paired with one of five low-confidence offsets; walking the
+        # pairs without repeats keeps every output distinct.
+        sampler = self.coverage_sampler({
+            "entity": range(len(_SAMPLE_ENTITIES)),
+            "offset": range(_LOW_CONFIDENCE_OFFSETS),
+        })
+
+        total = min(n, sampler.size)
+        for start in range(0, total, _BATCH_SIZE):
+            combos = [sampler[i] for i in range(start, min(start + _BATCH_SIZE, total))]
+            entity_idx = np.array([c["entity"] for c in combos])
+            # Assign high confidence to correct labels and low to others. The low
+            # values are offset slightly per combination to introduce variation.
+            low = _NEGATIVE_CONFIDENCE + 0.01 * np.array([c["offset"] for c in combos])
+            hot = multi_hot[entity_idx]
+            confidences = np.where(hot, _POSITIVE_CONFIDENCE, low[:, None])
+
+            if mode == "full":
+                confidence_json = dumps_float_rows(possible_labels, confidences)
+            elif mode == "top_k":
+                # Stable sort keeps label order among equal confidences.
+                columns = np.argsort(-confidences, axis=1, kind="stable")[:, :top_k]
+                confidence_json = dumps_float_rows(
+                    possible_labels, np.take_along_axis(confidences, columns, axis=1), columns
+                )
+            else:
+                confidence_json = dumps_float_rows(possible_labels, confidences, mask=hot)
+            lows = low.tolist()
+
+            for row, entity in enumerate(entity_idx.tolist()):
+                raw_name, labels = _SAMPLE_ENTITIES[entity]
+                instruction = f"Classify the entity with multi-label output: {raw_name}"
+
+                # Serialized by hand around the pre-rendered confidences; matches
+                # json.dumps of the equivalent dict.
+                output = (
+                    '{"entity": ' + json.dumps(raw_name, ensure_ascii=False)
+                    + ', "multi_label": true, "predicted_labels": '
+                    + json.dumps(labels, ensure_ascii=False)
+                    + ', "label_confidences": ' + confidence_json[row]
+                )
+                if mode != "full":
+                    # Omitted labels all share the row's low confidence.
+                    output += ', "default_confidence": ' + repr(lows[row])
+                output += "}"
+
+                meta = make_metadata(
+                    section="advanced_entity_classification",
+                    index=start + row + 1,
+                    complexity="medium",
+                    tags=["classification", "multi_label", "advanced"],
+                    reasoning_mode="classification",
+                    confidence=0.8,
+                    possible_labels=possible_labels,
+                )
+
+                yield {
+                    "system": system,
+                    "instruction": instruction,
+                    "input": raw_name,
+                    "output": output,
+                    "metadata": meta,
+                }
@@ -2,22 +2,104 @@
 
 from __future__ import annotations
 
+import sys
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
 
 from ..domain_config import DomainConfig
+from ..sampling import CoverageSampler, RngStreams
+
+#: Receives the number of examples built so far and returns the count at which
+#: it wants to be called next (see :meth:`SectionBuilder.report_progress`).
+ProgressCallback = Callable[[int], int]
 
 
 class SectionBuilder(ABC):
     """Abstract base for all dataset section builders (LSP + SRP)."""
 
-    def __init__(self, config: DomainConfig) -> None:
+    #: Stable identifier of the section, used to key RNG streams and settings.
+    section_key: str
+    #: Examples generated at ``sample_scale`` 1 unless overridden in config.
+    default_samples: int = 100
+
+    def __init__(self, config: DomainConfig, rng_streams: Optional[RngStreams] = None) -> None:
         self._config = config
+        self._rng_streams = rng_streams or RngStreams()
+        self._progress: Optional[ProgressCallback] = None
+        self._progress_next = sys.maxsize
 
     @property
     def config(self) -> DomainConfig:
         return self._config
 
+    def with_config(self, config: DomainConfig) -> "SectionBuilder":
+        """Same builder (RNG streams and progress callback) for a different config."""
+        builder = type(self)(config, self._rng_streams)
+        builder.set_progress(self._progress)
+        return builder
+
+    def set_progress(self, callback: Optional[ProgressCallback]) -> None:
+        """Install (or with None remove) the callback fed by :meth:`report_progress`."""
+        self._progress = callback
+        self._progress_next = 0 if callback is not None else sys.maxsize
+
+    def report_progress(self, done: int) -> None:
+        """Tell the progress callback that ``done`` examples have been built.
+
+        Called by :meth:`build_examples` on every example:
+        the callback only runs once ``done`` reaches the threshold it returned
+        last time, so the per-call cost is a single comparison.
+        """
+        if done >= self._progress_next:
+            self._progress_next = self._progress(done)  # type: ignore[misc]
+
+    def base_sample_count(self) -> int:
+        """Number of examples at scale 1 when ``section_samples`` has no entry."""
+        return self.default_samples
+
+    @property
+    def sample_count(self) -> int:
+        """Examples to generate: the per-section count times ``sample_scale``.
+
+        ``section_samples[section_key]`` overrides the builder's default.
+        Builders whose template space is smaller may still return fewer.
+        """
+        cfg = self.config
+        base = (cfg.section_samples or {}).get(self.section_key, self.base_sample_count())
+        if base < 0 or cfg.sample_scale < 0:
+            raise ValueError(
+                f"Sample counts and scale must be >= 0 for section '{self.section_key}'"
+            )
+        return int(round(base * cfg.sample_scale))
+
+    @property
+    def planned_count(self) -> int:
+        """Examples the section will yield, before validation and deduplication.
+
+        ``sample_count`` unless the builder's template space (or a fixed
+        source such as configured facts) caps it; such builders override this.
+        """
+        return self.sample_count
+
+    @property
+    def rng_streams(self) -> RngStreams:
+        return self._rng_streams
+
+    def _stream_key(self) -> str:
+        # Domains that share a sampling_key draw identical samples.
+        return self.config.sampling_key or self.config.id
+
+    def rng(self, shard: int = 0) -> np.random.Generator:
+        """Fresh generator for this builder's ``(domain, section, shard)`` stream."""
+        return self._rng_streams.generator(self._stream_key(), self.section_key, shard)
+
+    def coverage_sampler(self, slots: Mapping[str, Sequence[Any]]) -> CoverageSampler:
+        """Coverage sampler over ``slots`` permuted by this builder's RNG stream."""
+        seed = self._rng_streams.int_seed(self._stream_key(), self.section_key)
+        return CoverageSampler(slots, seed=seed)
+
     @property
     @abstractmethod
     def file_name(self) -> str:
@@ -25,7 +107,18 @@ class SectionBuilder(ABC):
         raise NotImplementedError
 
     @abstractmethod
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
+        """Yield the training examples of this section one at a time.
+
+        Consumers that do not need the whole section at once (sampling,
+        streaming) iterate this instead of :meth:`build_examples`.
+        """
+        raise NotImplementedError
+
     def build_examples(self) -> List[Dict[str, Any]]:
         """Return list of training examples for this section."""
-        raise NotImplementedError
-  
\ No newline at end of file
+        examples: List[Dict[str, Any]] = []
+        for example in self.iter_examples():
+            examples.append(example)
+            self.report_progress(len(examples))
+        return examples
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator
 
 from .base import SectionBuilder
 from ..utils import make_metadata
@@ -19,15 +19,17 @@ class BusinessContextReasoningBuilder(SectionBuilder):
     - Leadership / transformation language
     """
 
+    section_key = "business_context"
+    default_samples = 120
+
     @property
     def file_name(self) -> str:
         return "business_context_training.json"
 
-    def build_examples(self) -> List[Dict[str, Any]]:
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
         cfg = self.config
         # Increased from 80 to 120 to account for deduplication
-        n = 120
-        examples: List[Dict[str, Any]] = []
+        n = self.sample_count
 
         narrative_prompts = [
             "Explain why {company} positions itself as a KPI-driven Enterprise AI platform.",
@@ -52,80 +54,87 @@ class BusinessContextReasoningBuilder(SectionBuilder):
             "Describe {company}'s value creation model for {product} targeting {role}s in {region}.",
         ]
 
-        for idx in range(1, n + 1):
-            role = cfg.primary_roles[idx % len(cfg.primary_roles)]
-            region = cfg.primary_regions[idx % len(cfg.primary_regions)]
-            product = cfg.primary_products[idx % len(cfg.primary_products)]
-            template = narrative_prompts[idx % len(narrative_prompts)]
+        system = (
+            f"You are {cfg.agent_name}, a business-aware assistant. "
+            "Explain concepts using clear business language, aligning technology with KPIs, "
+            "stakeholders, transformation goals, and measurable outcomes."
+        )
+
+        # Provide variety in outputs
+        output_templates = [
+            (
+                "{company} starts from a concrete KPI (such as reduced processing time, "
+                "better compliance, or higher approval throughput) and then composes the supporting "
+                "AI workflow using components like {product}. For a {role} in {region}, the story is "
+                "not just about features, but about traceable impact: where the data comes from, how "
+                "decisions are made, and how the platform fits into existing systems."
+            ),
+            (
+                "The KPI-driven approach at {company} begins with measurable goals and backtracks to the necessary AI building blocks, such as {product}. "
+                "A {role} in {region} doesn't just want features – they need to understand the end-to-end impact, from data ingestion and decision-making to how the solution integrates with existing platforms."
+            ),
+            (
+                "At {company}, every deployment of {product} begins with defining success metrics. "
+                "For {role}s in {region}, this means identifying KPIs like cost reduction, faster turnaround, or improved accuracy, "
+                "then architecting the AI solution to directly address those metrics with measurable outcomes."
+            ),
+            (
+                "{company} differentiates itself by anchoring {product} implementations to business KPIs. "
+                "When working with a {role} in {region}, we first establish what success looks like numerically, "
+                "then design the data flows, model training, and integration points to optimize for those specific targets."
+            ),
+            (
+                "The value proposition of {product} from {company} centers on measurable business outcomes. "
+                "A {role} in {region} can expect to see improvements in efficiency, accuracy, and compliance, "
+                "all tied back to specific KPIs established during the initial planning phase."
+            ),
+            (
+                "For {role}s in {region}, {company}'s methodology with {product} follows a KPI-first pattern: "
+                "define the business objective, identify the metrics that matter, design the AI architecture to optimize those metrics, "
+                "and continuously monitor performance against targets."
+            ),
+            (
+                "{company} positions {product} as a transformation enabler for {role}s in {region}. "
+                "Rather than deploying technology for its own sake, we focus on business outcomes—faster processing, better decisions, "
+                "enhanced compliance—and configure the platform to deliver those results."
+            ),
+            (
+                "When implementing {product} with {company}, {role}s in {region} experience a structured approach: "
+                "KPI identification, baseline measurement, solution design, iterative deployment, and continuous optimization. "
+                "Each phase is anchored to measurable business impact."
+            ),
+            (
+                "The transformation journey with {company} and {product} for a {role} in {region} emphasizes ROI. "
+                "We start by quantifying current state performance, define target KPIs, implement the AI solution incrementally, "
+                "and track improvements against those baselines."
+            ),
+            (
+                "{company}'s framework for {product} ensures that {role}s in {region} can connect technical capabilities "
+                "to business value. Every feature is mapped to KPIs like processing time, error rates, or compliance scores, "
+                "providing transparency into how technology drives business outcomes."
+            ),
+        ]
 
-            instruction = template.format(
+        # Walk role × region × product × prompt × output combinations without
+        # repeats; lockstep ``idx % len`` cycling only ever reached 60 of them.
+        sampler = self.coverage_sampler({
+            "role": cfg.primary_roles,
+            "region": cfg.primary_regions,
+            "product": cfg.primary_products,
+            "prompt": narrative_prompts,
+            "output": output_templates,
+        })
+
+        for idx, combo in enumerate(sampler.take(n), start=1):
+            role, region = combo["role"], combo["region"]
+            fields = dict(
                 company=cfg.company_name,
-                product=product,
+                product=combo["product"],
                 role=role,
                 region=region,
             )
-
-            system = (
-                f"You are {cfg.agent_name}, a business-aware assistant. "
-                "Explain concepts using clear business language, aligning technology with KPIs, "
-                "stakeholders, transformation goals, and measurable outcomes."
-            )
-
-            # Provide variety in outputs
-            output_templates = [
-                (
-                    f"{cfg.company_name} starts from a concrete KPI (such as reduced processing time, "
-                    "better compliance, or higher approval throughput) and then composes the supporting "
-                    f"AI workflow using components like {product}. For a {role} in {region}, the story is "
-                    "not just about features, but about traceable impact: where the data comes from, how "
-                    "decisions are made, and how the platform fits into existing systems."
-                ),
-                (
-                    f"The KPI-driven approach at {cfg.company_name} begins with measurable goals and backtracks to the necessary AI building blocks, such as {product}. "
-                    f"A {role} in {region} doesn't just want features – they need to understand the end-to-end impact, from data ingestion and decision-making to how the solution integrates with existing platforms."
-                ),
-                (
-                    f"At {cfg.company_name}, every deployment of {product} begins with defining success metrics. "
-                    f"For {role}s in {region}, this means identifying KPIs like cost reduction, faster turnaround, or improved accuracy, "
-                    "then architecting the AI solution to directly address those metrics with measurable outcomes."
-                ),
-                (
-                    f"{cfg.company_name} differentiates itself by anchoring {product} implementations to business KPIs. "
-                    f"When working with a {role} in {region}, we first establish what success looks like numerically, "
-                    "then design the data flows, model training, and integration points to optimize for those specific targets."
-                ),
-                (
-                    f"The value proposition of {product} from {cfg.company_name} centers on measurable business outcomes. "
-                    f"A {role} in {region} can expect to see improvements in efficiency, accuracy, and compliance, "
-                    "all tied back to specific KPIs established during the initial planning phase."
-                ),
-                (
-                    f"For {role}s in {region}, {cfg.company_name}'s methodology with {product} follows a KPI-first pattern: "
-                    "define the business objective, identify the metrics that matter, design the AI architecture to optimize those metrics, "
-                    "and continuously monitor performance against targets."
-                ),
-                (
-                    f"{cfg.company_name} positions {product} as a transformation enabler for {role}s in {region}. "
-                    "Rather than deploying technology for its own sake, we focus on business outcomes—faster processing, better decisions, "
-                    "enhanced compliance—and configure the platform to deliver those results."
-                ),
-                (
-                    f"When implementing {product} with {cfg.company_name}, {role}s in {region} experience a structured approach: "
-                    "KPI identification, baseline measurement, solution design, iterative deployment, and continuous optimization. "
-                    "Each phase is anchored to measurable business impact."
-                ),
-                (
-                    f"The transformation journey with {cfg.company_name} and {product} for a {role} in {region} emphasizes ROI. "
-                    "We start by quantifying current state performance, define target KPIs, implement the AI solution incrementally, "
-                    "and track improvements against those baselines."
-                ),
-                (
-                    f"{cfg.company_name}'s framework for {product} ensures that {role}s in {region} can connect technical capabilities "
-                    "to business value. Every feature is mapped to KPIs like processing time, error rates, or compliance scores, "
-                    "providing transparency into how technology drives business outcomes."
-                ),
-            ]
-            output = output_templates[idx % len(output_templates)]
+            instruction = combo["prompt"].format(**fields)
+            output = combo["output"].format(**fields)
 
             metadata = make_metadata(
                 section="business_context",
@@ -137,12 +146,10 @@ class BusinessContextReasoningBuilder(SectionBuilder):
                 region=region,
             )
 
-            examples.append({
+            yield {
                 "system": system,
                 "instruction": instruction,
                 "input": "",
                 "output": output,
                 "metadata": metadata,
-            })
-
-        return examples
+            }
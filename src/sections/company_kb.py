@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 from .base import SectionBuilder
 from ..utils import make_metadata
@@ -11,13 +11,21 @@ from ..utils import make_metadata
 class CompanyKBTrainingBuilder(SectionBuilder):
     """Section 11 (positive): Company Knowledge Base factual Q&A."""
 
+    section_key = "company_kb"
+    default_samples = 120
+
     @property
     def file_name(self) -> str:
         return "company_kb_training.json"
 
-    def build_examples(self) -> List[Dict[str, Any]]:
+    @property
+    def planned_count(self) -> int:
+        # Configured facts replace the sample count entirely.
+        facts = getattr(self.config, "company_kb_facts", None)
+        return len(facts) if facts else self.sample_count
+
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
         cfg = self.config
-        examples: List[Dict[str, Any]] = []
 
         # Check if real company KB facts are provided via config. If present, use them
         # instead of auto-generated placeholder facts. Facts should be a list of
@@ -41,20 +49,20 @@ class CompanyKBTrainingBuilder(SectionBuilder):
                     reasoning_mode="lookup",
                 )
 
-                examples.append({
+                yield {
                     "system": system,
                     "instruction": instruction,
                     "input": "",
                     "output": output,
                     "metadata": metadata,
-                })
-            return examples
+                }
+            return
 
         # No real facts provided – fall back to placeholder generation using the
         # original logic with varied question and answer templates. Maintain
         # compatibility with existing datasets by generating a fixed number of
         # examples (n).
-        n = 120
+        n = self.sample_count
         # Varied question prompts and factual templates to improve diversity
         question_templates = [
             "What does the company KB say about {company} detail {idx}?",
@@ -84,28 +92,28 @@ class CompanyKBTrainingBuilder(SectionBuilder):
                 reasoning_mode="lookup",
             )
 
-            examples.append({
+            yield {
                 "system": system,
                 "instruction": instruction,
                 "input": "",
                 "output": output,
                 "metadata": metadata,
-            })
-
-        return examples
+            }
 
 
 class CompanyKBNoHallucinationsTrainingBuilder(SectionBuilder):
     """Section 11 (negative): Refuse outside-KB questions."""
 
+    section_key = "company_kb_no_hallucinations"
+    default_samples = 80
+
     @property
     def file_name(self) -> str:
         return "company_kb_no_hallucinations_training.json"
 
-    def build_examples(self) -> List[Dict[str, Any]]:
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
         cfg = self.config
-        n = 80
-        examples: List[Dict[str, Any]] = []
+        n = self.sample_count
 
         # Provide variation in hallucination-prevention queries and responses
         question_templates = [
@@ -137,13 +145,11 @@ class CompanyKBNoHallucinationsTrainingBuilder(SectionBuilder):
                 is_negative_example=True,
             )
 
-            examples.append({
+            yield {
                 "system": system,
                 "instruction": instruction,
                 "input": "",
                 "output": output,
                 "metadata": metadata,
-            })
-
-        return examples
+            }
   
@@ -2,28 +2,30 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator
 
 from .base import SectionBuilder
-from ..utils import make_metadata, generate_diverse_entity_names, classify_entity_name
+from ..utils import EntityNameSpace, make_metadata, classify_entity_name
 
 
 class EntityClassificationTrainingBuilder(SectionBuilder):
     """Sections 6+12: Entity type classification."""
 
+    section_key = "entity_classification"
+    default_samples = 100
+
     @property
     def file_name(self) -> str:
         return "entity-classification-training.json"
 
-    def build_examples(self) -> List[Dict[str, Any]]:
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
         cfg = self.config
-        n = 100
-        examples: List[Dict[str, Any]] = []
+        n = self.sample_count
 
         # Generate a diverse set of entity names. This helps avoid overfitting on a
         # small static list and encourages the classifier to generalize. The
-        # number of names generated matches the dataset size.
-        names = generate_diverse_entity_names(cfg, n)
+        # name space matches the dataset size and is indexed lazily.
+        names = EntityNameSpace(cfg, n)
         instruction_templates = [
             "Classify the entity type for: {name}",
             "What type of entity is {name}?",
@@ -61,13 +63,10 @@ class EntityClassificationTrainingBuilder(SectionBuilder):
                 classified_as=labels,
                 variant_id=idx,
             )
-            examples.append({
+            yield {
                 "system": system,
                 "instruction": instruction,
                 "input": name,
                 "output": output,
                 "metadata": meta,
-            })
-
-        return examples
-  
\ No newline at end of file
+            }
@@ -3,97 +3,232 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
 
 from .base import SectionBuilder
 from ..utils import default_currencies, default_expense_doc_types, make_metadata
 
 
+# Expense categories: (description, category tag, median amount in USD, log-sigma).
+# Amounts are drawn log-normally around the median, which matches the long right
+# tail of real expense data far better than a linear ramp.
+_EXPENSE_CATEGORIES: List[Tuple[str, str, float, float]] = [
+    ("Taxi ride from airport to office", "TRAVEL", 35.0, 0.5),
+    ("Hotel stay for client visit", "LODGING", 180.0, 0.45),
+    ("Business lunch with client", "MEALS", 60.0, 0.5),
+    ("Round-trip airfare for regional conference", "TRAVEL", 650.0, 0.6),
+    ("Annual software subscription renewal", "SOFTWARE", 1200.0, 0.8),
+    ("Office supplies order", "OFFICE", 90.0, 0.7),
+    ("Conference registration fee", "EVENTS", 500.0, 0.5),
+    ("Mobile and data plan reimbursement", "TELECOM", 45.0, 0.35),
+]
+
+# Currency: (units per USD, tax label, candidate tax rates, vendor suffix)
+_CURRENCY_PROFILES: Dict[str, Tuple[float, str, Tuple[float, ...], str]] = {
+    "INR": (83.0, "GST", (0.05, 0.12, 0.18, 0.28), "Pvt Ltd"),
+    "USD": (1.0, "Sales Tax", (0.0, 0.0625, 0.0725, 0.0825), "Inc"),
+    "AED": (3.67, "VAT", (0.05,), "LLC"),
+    "EUR": (0.92, "VAT", (0.19, 0.20, 0.21), "GmbH"),
+    "GBP": (0.79, "VAT", (0.0, 0.05, 0.20), "Ltd"),
+}
+_FALLBACK_PROFILE = (1.0, "Tax", (0.0, 0.10), "Ltd")
+
+# Amounts at or above this USD-equivalent need a manager's approval.
+_AUTO_APPROVE_LIMIT_USD = 500.0
+_VENDOR_POOL_SIZE = 750
+_DATE_RANGE = (np.datetime64("2025-01-01"), np.datetime64("2026-01-01"))
+
+# Fields are drawn in fixed-size batches, each from its own RNG shard, so the
+# values for a given example do not depend on how many batches a run uses.
+_BATCH_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class ExpenseFieldBatch:
+    """Column-oriented numeric and date fields for a batch of expense documents."""
+
+    doc_type: np.ndarray  # index into the doc type list
+    currency: np.ndarray  # index into the currency list
+    category: np.ndarray  # index into _EXPENSE_CATEGORIES
+    amount: np.ndarray  # amount in document currency, rounded to cents
+    amount_usd: np.ndarray  # USD equivalent, used for policy flags
+    tax_rate: np.ndarray
+    vendor_id: np.ndarray
+    date: np.ndarray  # ISO date strings
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+
+def synthesize_expense_fields(
+    rng: np.random.Generator,
+    size: int,
+    doc_types: Sequence[str],
+    currencies: Sequence[str],
+) -> ExpenseFieldBatch:
+    """Draw all numeric/date fields for ``size`` expense documents at once.
+
+    Parameters
+    ----------
+    rng: numpy.random.Generator
+        Source of randomness; use a per-batch stream for reproducibility.
+    size: int
+        Number of documents in the batch.
+    doc_types, currencies: sequence of str
+        Values the document type and currency are drawn from (uniformly).
+
+    Returns
+    -------
+    ExpenseFieldBatch
+        Arrays of length ``size``; per-example code only formats strings.
+    """
+    profiles = [_CURRENCY_PROFILES.get(c, _FALLBACK_PROFILE) for c in currencies]
+    fx = np.array([p[0] for p in profiles])
+    medians = np.array([c[2] for c in _EXPENSE_CATEGORIES])
+    sigmas = np.array([c[3] for c in _EXPENSE_CATEGORIES])
+
+    doc_type = rng.integers(0, len(doc_types), size)
+    currency = rng.integers(0, len(currencies), size)
+    category = rng.integers(0, len(_EXPENSE_CATEGORIES), size)
+
+    amount_usd = rng.lognormal(np.log(medians[category]), sigmas[category])
+    amount = np.round(amount_usd * fx[currency], 2)
+
+    # Tax rate: pick uniformly among the rates valid for each currency by
+    # scaling a uniform draw into a padded (currency × rate) table.
+    rate_counts = np.array([len(p[2]) for p in profiles])
+    rate_table = np.zeros((len(profiles), rate_counts.max()))
+    for row, p in enumerate(profiles):
+        rate_table[row, : len(p[2])] = p[2]
+    rate_idx = (rng.random(size) * rate_counts[currency]).astype(np.int64)
+    tax_rate = rate_table[currency, rate_idx]
+
+    vendor_id = rng.integers(1, _VENDOR_POOL_SIZE + 1, size)
+    span = int((_DATE_RANGE[1] - _DATE_RANGE[0]).astype(np.int64))
+    date = np.datetime_as_string(
+        _DATE_RANGE[0] + rng.integers(0, span, size).astype("timedelta64[D]"), unit="D"
+    )
+
+    return ExpenseFieldBatch(
+        doc_type=doc_type,
+        currency=currency,
+        category=category,
+        amount=amount,
+        amount_usd=amount_usd,
+        tax_rate=tax_rate,
+        vendor_id=vendor_id,
+        date=date,
+    )
+
+
 class ExpenseDocumentsTrainingBuilder(SectionBuilder):
     """New: Expense documents dataset (invoices, bills, receipts...)."""
 
+    section_key = "expense_docs"
+    default_samples = 150
+
     @property
     def file_name(self) -> str:
         return "expense_documents_training.json"
 
-    def build_examples(self) -> List[Dict[str, Any]]:
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
         cfg = self.config
-        n = 150
-        examples: List[Dict[str, Any]] = []
+        n = self.sample_count
 
         doc_types = default_expense_doc_types(cfg)
         currencies = default_currencies(cfg)
-
-        for idx in range(1, n + 1):
-            doc_type = doc_types[idx % len(doc_types)]
-            currency = currencies[idx % len(currencies)]
-            invoice_no = f"{doc_type[:3].upper()}-{2025}{idx:04d}"
-            vendor = f"Vendor {idx:03d} Pvt Ltd"
-
-            raw_doc = (
-                f"{doc_type} Number: {invoice_no}\n"
-                f"Vendor: {vendor}\n"
-                f"Date: 2025-10-{(idx % 28) + 1:02d}\n"
-                f"Amount: {currency} {1000 + idx * 5:.2f}\n"
-                "Description: Taxi ride from airport to office\n"
-                "GST: 18%\n"
-            )
-
-            system = (
-                f"You are {cfg.agent_name}, specialized in {cfg.domain_name}. "
-                "Given an invoice/bill/receipt, extract normalized fields and explain if it "
-                "is compliant with basic policy rules (only high-level, no real legal advice)."
-            )
-
-            # Introduce variation in extraction task phrasing
-            if doc_type.lower() in ["invoice", "bill"]:
-                task_templates = [
-                    "Extract and normalize all key fields from this document.",
-                    "Identify and standardize each important field in this document.",
-                    "List all critical fields from this document in a structured format.",
-                ]
-            else:
-                task_templates = [
-                    "Identify key fields and classify this document type.",
-                    "Classify this document and extract its key attributes.",
-                    "Determine the document type and capture essential fields.",
-                ]
-            task = task_templates[idx % len(task_templates)]
-            instruction = f"{task} Document type: {doc_type}."
-
-            output_dict = {
-                "document_type": doc_type,
-                "invoice_number": invoice_no,
-                "vendor_name": vendor,
-                "currency": currency,
-                "amount": round(1000 + idx * 5, 2),
-                "transaction_date": f"2025-10-{(idx % 28) + 1:02d}",
-                "description": "Taxi ride from airport to office",
-                "tax_rate": "18%",
-                "policy_flags": [
-                    "AUTO_APPROVE_IF_UNDER_LIMIT",
-                    "REQUIRES_TRAVEL_CATEGORY_TAG"
-                ]
-            }
-
-            metadata = make_metadata(
-                section="expense_docs",
-                index=idx,
-                complexity="medium",
-                tags=["invoice_parsing", "expense_docs", doc_type.lower()],
-                reasoning_mode="extraction+classification",
-                is_negative_example=False,
-                is_synthetic=True,
-                document_type=doc_type,
-            )
-
-            examples.append({
-                "system": system,
-                "instruction": instruction,
-                "input": raw_doc,
-                "output": json.dumps(output_dict, ensure_ascii=False),
-                "metadata": metadata
-            })
-
-        return examples
-  
\ No newline at end of file
+        profiles = [_CURRENCY_PROFILES.get(c, _FALLBACK_PROFILE) for c in currencies]
+
+        system = (
+            f"You are {cfg.agent_name}, specialized in {cfg.domain_name}. "
+            "Given an invoice/bill/receipt, extract normalized fields and explain if it "
+            "is compliant with basic policy rules (only high-level, no real legal advice)."
+        )
+
+        for batch_no, start in enumerate(range(0, n, _BATCH_SIZE)):
+            size = min(_BATCH_SIZE, n - start)
+            batch = synthesize_expense_fields(self.rng(shard=batch_no), size, doc_types, currencies)
+            # Convert once per batch; row access on Python lists is cheaper than
+            # on NumPy scalars.
+            doc_type_idx = batch.doc_type.tolist()
+            currency_idx = batch.currency.tolist()
+            category_idx = batch.category.tolist()
+            amounts = batch.amount.tolist()
+            tax_rates = batch.tax_rate.tolist()
+            vendor_ids = batch.vendor_id.tolist()
+            dates = batch.date.tolist()
+            approvals = (batch.amount_usd < _AUTO_APPROVE_LIMIT_USD).tolist()
+
+            for row in range(size):
+                idx = start + row + 1
+                doc_type = doc_types[doc_type_idx[row]]
+                currency = currencies[currency_idx[row]]
+                _, tax_label, _, vendor_suffix = profiles[currency_idx[row]]
+                description, category, _, _ = _EXPENSE_CATEGORIES[category_idx[row]]
+                amount = amounts[row]
+                date = dates[row]
+                tax_rate = f"{tax_rates[row] * 100:g}%"
+                invoice_no = f"{doc_type[:3].upper()}-{date[:4]}{idx:04d}"
+                vendor = f"Vendor {vendor_ids[row]:03d} {vendor_suffix}"
+
+                raw_doc = (
+                    f"{doc_type} Number: {invoice_no}\n"
+                    f"Vendor: {vendor}\n"
+                    f"Date: {date}\n"
+                    f"Amount: {currency} {amount:.2f}\n"
+                    f"Description: {description}\n"
+                    f"{tax_label}: {tax_rate}\n"
+                )
+
+                # Introduce variation in extraction task phrasing
+                if doc_type.lower() in ["invoice", "bill"]:
+                    task_templates = [
+                        "Extract and normalize all key fields from this document.",
+                        "Identify and standardize each important field in this document.",
+                        "List all critical fields from this document in a structured format.",
+                    ]
+                else:
+                    task_templates = [
+                        "Identify key fields and classify this document type.",
+                        "Classify this document and extract its key attributes.",
+                        "Determine the document type and capture essential fields.",
+                    ]
+                task = task_templates[idx % len(task_templates)]
+                instruction = f"{task} Document type: {doc_type}."
+
+                output_dict = {
+                    "document_type": doc_type,
+                    "invoice_number": invoice_no,
+                    "vendor_name": vendor,
+                    "currency": currency,
+                    "amount": amount,
+                    "transaction_date": date,
+                    "description": description,
+                    "tax_rate": tax_rate,
+                    "policy_flags": [
+                        "AUTO_APPROVE_IF_UNDER_LIMIT" if approvals[row] else "REQUIRES_MANAGER_APPROVAL",
+                        f"REQUIRES_{category}_CATEGORY_TAG",
+                    ]
+                }
+
+                metadata = make_metadata(
+                    section="expense_docs",
+                    index=idx,
+                    complexity="medium",
+                    tags=["invoice_parsing", "expense_docs", doc_type.lower()],
+                    reasoning_mode="extraction+classification",
+                    is_negative_example=False,
+                    is_synthetic=True,
+                    document_type=doc_type,
+                )
+
+                yield {
+                    "system": system,
+                    "instruction": instruction,
+                    "input": raw_doc,
+                    "output": json.dumps(output_dict, ensure_ascii=False),
+                    "metadata": metadata,
+                }
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator
 
 from .base import SectionBuilder
 from ..utils import make_metadata  # standardized metadata helper
@@ -11,14 +11,18 @@ from ..utils import make_metadata  # standardized metadata helper
 class HardNegativesTrainingBuilder(SectionBuilder):
     """Section 6B: Hard-negative classification + anti-hallucination."""
 
+    section_key = "hard_negatives"
+
+    def base_sample_count(self) -> int:
+        return self.config.hard_negatives_samples
+
     @property
     def file_name(self) -> str:
         return "hard_negatives_hallucinations.json"
 
-    def build_examples(self) -> List[Dict[str, Any]]:
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
         cfg = self.config
-        n = cfg.hard_negatives_samples
-        examples: List[Dict[str, Any]] = []
+        n = self.sample_count
 
         # Provide variation in question phrasing and responses to avoid overfitting
         question_templates = [
@@ -59,13 +63,10 @@ class HardNegativesTrainingBuilder(SectionBuilder):
                 multi_label=["UNKNOWN"],
             )
 
-            examples.append({
+            yield {
                 "system": system,
                 "instruction": instruction,
                 "input": "",
                 "output": output,
                 "metadata": metadata,
-            })
-
-        return examples
-  
\ No newline at end of file
+            }
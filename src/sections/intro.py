@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator
 
 from .base import SectionBuilder
 from ..utils import make_metadata
@@ -13,14 +13,18 @@ class IntroTrainingBuilder(SectionBuilder):
     Sections 1+2: Greetings + Agent Identity + Capability Declaration.
     """
 
+    section_key = "intro"
+
+    def base_sample_count(self) -> int:
+        return self.config.intro_samples
+
     @property
     def file_name(self) -> str:
         return "intro-training.json"
 
-    def build_examples(self) -> List[Dict[str, Any]]:
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
         cfg = self.config
-        n = cfg.intro_samples
-        examples: List[Dict[str, Any]] = []
+        n = self.sample_count
 
         # Provide varied templates for greetings, capabilities and limitations to reduce
         # repetition. Each template uses named placeholders which are filled from
@@ -70,7 +74,7 @@ class IntroTrainingBuilder(SectionBuilder):
                 reasoning_mode="template",
                 confidence=0.95,
             )
-            examples.append({
+            yield {
                 "system": f"Respond to user greetings and introduce yourself as {cfg.chat_agent_name}.",
                 "instruction": f"User greets you (variant {idx + 1})",
                 "input": "",
@@ -81,7 +85,7 @@ class IntroTrainingBuilder(SectionBuilder):
                 "source": "persona",
                 "notes": "",
                 "metadata": meta,
-            })
+            }
 
         # Generate capability declarations
         for idx in range(n // 3):
@@ -97,7 +101,7 @@ class IntroTrainingBuilder(SectionBuilder):
                 reasoning_mode="template",
                 confidence=0.95,
             )
-            examples.append({
+            yield {
                 "system": (
                     f"You are {cfg.agent_name}. Describe your capabilities clearly, factually, "
                     "and without hallucination."
@@ -111,11 +115,10 @@ class IntroTrainingBuilder(SectionBuilder):
                 "source": "persona",
                 "notes": "",
                 "metadata": meta,
-            })
+            }
 
         # Generate limitations until we reach n total examples
-        limitation_idx = 0
-        while len(examples) < n:
+        for limitation_idx in range(n - 2 * (n // 3)):
             template = limitation_templates[limitation_idx % len(limitation_templates)]
             output = template.format(domain=cfg.domain_name, company=cfg.company_name)
             meta = make_metadata(
@@ -126,7 +129,7 @@ class IntroTrainingBuilder(SectionBuilder):
                 reasoning_mode="template",
                 confidence=0.95,
             )
-            examples.append({
+            yield {
                 "system": (
                     f"You are {cfg.agent_name}. Always be honest about missing context or "
                     "limitations."
@@ -140,8 +143,4 @@ class IntroTrainingBuilder(SectionBuilder):
                 "source": "persona",
                 "notes": "",
                 "metadata": meta,
-            })
-            limitation_idx += 1
-
-        return examples[:n]
-  
\ No newline at end of file
+            }
@@ -2,78 +2,63 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+import numpy as np
 
 from .base import SectionBuilder
+from ..domain_config import DomainConfig
+from ..operator_routing import (
+    ROUTING_BATCH_SIZE,
+    OperatorScenario,
+    ScenarioEngine,
+    load_operator_scenarios,
+    validate_operator_scores,  # noqa: F401  (re-exported for existing callers)
+)
 from ..utils import make_metadata
 
 
-def validate_operator_scores(scores: Dict[str, float], tolerance: float = 0.01) -> None:
-    """Validate that operator scores sum to approximately 1.0.
+DEFAULT_OPERATOR_SCENARIOS = Path(__file__).with_name("operator_scenarios.yaml")
+
+
+@lru_cache(maxsize=None)
+def _load_scenarios(path: str) -> Tuple[OperatorScenario, ...]:
+    return tuple(load_operator_scenarios(Path(path)))
+
 
-    Parameters
-    ----------
-    scores : Dict[str, float]
-        Dictionary mapping operator names to their confidence scores.
-    tolerance : float, optional
-        Acceptable deviation from 1.0, by default 0.01.
+def scenario_engine_for(cfg: DomainConfig, section: str) -> ScenarioEngine:
+    """Build the routing scenario engine configured for ``cfg``'s ``section``.
 
-    Raises
-    ------
-    ValueError
-        If the sum of scores deviates from 1.0 by more than tolerance.
+    Only scenarios tagged for ``section`` (or not tagged at all) are used.
     """
-    total = sum(scores.values())
-    if abs(total - 1.0) > tolerance:
-        raise ValueError(
-            f"Operator scores must sum to ~1.0 (tolerance: {tolerance}). "
-            f"Got {total:.4f} from scores: {scores}"
-        )
+    path = cfg.operator_scenarios or str(DEFAULT_OPERATOR_SCENARIOS)
+    scenarios = [s for s in _load_scenarios(path) if s.applies_to(section)]
+    if not scenarios:
+        raise ValueError(f"No operator scenarios in {path} apply to section '{section}'")
+    return ScenarioEngine(scenarios, noise=cfg.operator_score_noise)
 
 
 class OperatorTrainingBuilder(SectionBuilder):
     """Section 3: Operator selection (Vector DB / KG / Hybrid)."""
 
+    section_key = "operator"
+
+    def base_sample_count(self) -> int:
+        return self.config.operator_samples
+
     @property
     def file_name(self) -> str:
         return "operator-training.json"
 
-    def build_examples(self) -> List[Dict[str, Any]]:
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
         cfg = self.config
-        n = cfg.operator_samples
-        examples: List[Dict[str, Any]] = []
-
-        # A richer set of routing scenarios to provide the model with more varied
-        # decision patterns. Each tuple contains a key, primary operator, list of
-        # secondary operators and a score distribution. Low confidence and
-        # fallback scenarios are included implicitly by advanced_operator_logic.py.
-        # Note: All operator scores must sum to approximately 1.0.
-        scenarios = [
-            ("vdb_high", "VDB", ["KG"], {"vdb": 0.9, "kg": 0.05, "graph": 0.03, "web": 0.02}),
-            ("kg_high", "KG", ["VDB"], {"vdb": 0.05, "kg": 0.9, "graph": 0.03, "web": 0.02}),
-            ("graph_only", "Graph", ["VDB"], {"vdb": 0.2, "kg": 0.2, "graph": 0.5, "web": 0.1}),
-            ("hybrid_balanced", "VDB+KG", [], {"vdb": 0.45, "kg": 0.45, "graph": 0.1, "web": 0.0}),
-            ("low_confidence", "VDB", ["KG", "Graph"], {"vdb": 0.3, "kg": 0.3, "graph": 0.3, "web": 0.1}),
-            ("vdb_medium", "VDB", ["KG"], {"vdb": 0.7, "kg": 0.15, "graph": 0.1, "web": 0.05}),
-            ("kg_medium", "KG", ["VDB", "Graph"], {"vdb": 0.15, "kg": 0.7, "graph": 0.1, "web": 0.05}),
-            ("graph_high", "Graph", ["KG"], {"vdb": 0.1, "kg": 0.2, "graph": 0.65, "web": 0.05}),
-            ("hybrid_vdb_heavy", "VDB+KG", [], {"vdb": 0.6, "kg": 0.3, "graph": 0.08, "web": 0.02}),
-            ("hybrid_kg_heavy", "VDB+KG", [], {"vdb": 0.3, "kg": 0.6, "graph": 0.08, "web": 0.02}),
-            ("vdb_with_web", "VDB", ["Web"], {"vdb": 0.65, "kg": 0.1, "graph": 0.05, "web": 0.2}),
-            ("kg_with_web", "KG", ["Web"], {"vdb": 0.1, "kg": 0.65, "graph": 0.05, "web": 0.2}),
-            ("multi_operator", "VDB+KG", ["Graph"], {"vdb": 0.35, "kg": 0.35, "graph": 0.25, "web": 0.05}),
-            ("vdb_uncertain", "VDB", ["KG"], {"vdb": 0.5, "kg": 0.3, "graph": 0.15, "web": 0.05}),
-            ("kg_uncertain", "KG", ["VDB"], {"vdb": 0.3, "kg": 0.5, "graph": 0.15, "web": 0.05}),
-            ("graph_medium", "Graph", ["VDB", "KG"], {"vdb": 0.15, "kg": 0.2, "graph": 0.55, "web": 0.1}),
-            ("balanced_all", "VDB+KG", ["Graph"], {"vdb": 0.33, "kg": 0.33, "graph": 0.27, "web": 0.07}),
-            ("vdb_very_high", "VDB", [], {"vdb": 0.95, "kg": 0.02, "graph": 0.02, "web": 0.01}),
-            ("kg_very_high", "KG", [], {"vdb": 0.02, "kg": 0.95, "graph": 0.02, "web": 0.01}),
-            ("graph_very_high", "Graph", [], {"vdb": 0.05, "kg": 0.05, "graph": 0.85, "web": 0.05}),
-        ]
+        n = self.sample_count
 
-        # Validate all scenario scores sum to ~1.0
-        for scenario_key, _, _, scores in scenarios:
-            validate_operator_scores(scores)
+        # Routing scenarios come from YAML (cfg.operator_scenarios); their
+        # scores are perturbed and renormalized per example by the engine.
+        engine = scenario_engine_for(cfg, self.section_key)
 
         # Instruction templates to reduce repetition
         instruction_templates = [
@@ -122,109 +107,122 @@ class OperatorTrainingBuilder(SectionBuilder):
             "{product} transforms {domain} information access by harmonizing vector search results with graph-derived relationships.",
         ]
 
-        for idx in range(n):
-            # Use different prime multipliers for each dimension to create better distribution
-            # and avoid repeating patterns that cause deduplication
-            scenario_key, primary, secondary, scores = scenarios[idx % len(scenarios)]
-            role = cfg.primary_roles[(idx * 7) % len(cfg.primary_roles)]
-            product = cfg.primary_products[(idx * 11) % len(cfg.primary_products)]
-
-            instr_template = instruction_templates[(idx * 3) % len(instruction_templates)]
-            instruction = instr_template.format(role=role, product=product, domain=cfg.domain_name)
-
-            # Multiple input context templates for variety
-            input_ctx_templates = [
-                (
-                    "Vector DB context:\n"
-                    f"- Snippet: description of {product} usage in {cfg.domain_name}\n\n"
-                    "Knowledge Graph context:\n"
-                    "- Entities: [Product, Capability, Integration]\n"
-                ),
-                (
-                    "Available context:\n"
-                    f"- VDB: Retrieved documents about {product} in {cfg.domain_name}\n"
-                    "- KG: Entity relationships and product metadata\n"
-                ),
-                (
-                    f"Context from {product}:\n"
-                    "- Vector search results: Medium relevance snippets\n"
-                    f"- Graph entities: [Product, Feature, {cfg.domain_name}]\n"
-                ),
-                (
-                    "Indexed information:\n"
-                    f"- Unstructured docs on {product} usage\n"
-                    f"- Structured entities linking {product} to {cfg.domain_name} workflows\n"
-                ),
-                (
-                    "Retrieval sources:\n"
-                    f"- Vector DB: {product} documentation and examples\n"
-                    "- Knowledge Graph: Product-capability-integration relationships\n"
-                ),
-                (
-                    "System context:\n"
-                    f"- Semantic search: Found {product} references in {cfg.domain_name} data\n"
-                    "- Entity graph: Connected product nodes with capability attributes\n"
-                ),
-                (
-                    f"Data available for {product}:\n"
-                    "- Text embeddings from vector store\n"
-                    f"- Relationship graph showing {cfg.domain_name} connections\n"
-                ),
-                (
-                    "Query results:\n"
-                    f"- VDB returned: Description snippets for {product}\n"
-                    f"- KG returned: Entity nodes [Product, Integration, {cfg.domain_name}]\n"
-                ),
-                (
-                    f"Combined context on {product}:\n"
-                    "- Vector results with 0.75 confidence\n"
-                    "- Graph paths showing capability relationships\n"
-                ),
-                (
-                    "Retrieved data:\n"
-                    f"- Embedding-based search: {product} documentation\n"
-                    f"- Graph traversal: Links to {cfg.domain_name} entities\n"
-                ),
-            ]
-            input_ctx = input_ctx_templates[(idx * 5) % len(input_ctx_templates)]
-
-            out_template = output_templates[(idx * 13) % len(output_templates)]
-            output = out_template.format(product=product, domain=cfg.domain_name)
-
-            # Determine complexity based on scenario
-            complexity = "high" if scenario_key in {"low_confidence", "graph_only"} else "medium"
-
-            meta = make_metadata(
-                section="operator_decision_logic",
-                index=idx + 1,
-                complexity=complexity,
-                tags=["operator_selection", "rag_router", cfg.agent_name.lower()],
-                reasoning_mode="chain_of_thought",
-                confidence=0.8,
-                scenario=scenario_key,
-                question_wrapper="Choose the best operators and answer grounded on context."
-            )
+        # Multiple input context templates for variety
+        input_ctx_templates = [
+            (
+                "Vector DB context:\n"
+                "- Snippet: description of {product} usage in {domain}\n\n"
+                "Knowledge Graph context:\n"
+                "- Entities: [Product, Capability, Integration]\n"
+            ),
+            (
+                "Available context:\n"
+                "- VDB: Retrieved documents about {product} in {domain}\n"
+                "- KG: Entity relationships and product metadata\n"
+            ),
+            (
+                "Context from {product}:\n"
+                "- Vector search results: Medium relevance snippets\n"
+                "- Graph entities: [Product, Feature, {domain}]\n"
+            ),
+            (
+                "Indexed information:\n"
+                "- Unstructured docs on {product} usage\n"
+                "- Structured entities linking {product} to {domain} workflows\n"
+            ),
+            (
+                "Retrieval sources:\n"
+                "- Vector DB: {product} documentation and examples\n"
+                "- Knowledge Graph: Product-capability-integration relationships\n"
+            ),
+            (
+                "System context:\n"
+                "- Semantic search: Found {product} references in {domain} data\n"
+                "- Entity graph: Connected product nodes with capability attributes\n"
+            ),
+            (
+                "Data available for {product}:\n"
+                "- Text embeddings from vector store\n"
+                "- Relationship graph showing {domain} connections\n"
+            ),
+            (
+                "Query results:\n"
+                "- VDB returned: Description snippets for {product}\n"
+                "- KG returned: Entity nodes [Product, Integration, {domain}]\n"
+            ),
+            (
+                "Combined context on {product}:\n"
+                "- Vector results with 0.75 confidence\n"
+                "- Graph paths showing capability relationships\n"
+            ),
+            (
+                "Retrieved data:\n"
+                "- Embedding-based search: {product} documentation\n"
+                "- Graph traversal: Links to {domain} entities\n"
+            ),
+        ]
 
-            examples.append({
-                "system": (
-                    f"You are {cfg.agent_name}, an AI retrieval router. Decide whether to use "
-                    "VDB, KG, both, or safe fallback."
-                ),
-                "instruction": instruction,
-                "input": input_ctx,
-                "output": output,
-                "metadata": meta,
-                "operator_decision": {
-                    "primary_operator": primary,
-                    "secondary_operators": secondary,
-                    "reasoning_steps": [
-                        "Inspect vector search results for rich unstructured context.",
-                        "Inspect knowledge graph entities for structured relationships.",
-                        "Pick the operator (or combination) that gives the most grounded answer."
-                    ],
-                    "operator_scores": scores,
-                }
-            })
+        # Walk the scenario × role × product × template space without repeats so
+        # every example is a distinct combination.
+        sampler = self.coverage_sampler({
+            "scenario": range(len(engine)),
+            "role": cfg.primary_roles,
+            "product": cfg.primary_products,
+            "instruction": instruction_templates,
+            "input_ctx": input_ctx_templates,
+            "output": output_templates,
+        })
+        system = (
+            f"You are {cfg.agent_name}, an AI retrieval router. Decide whether to use "
+            "VDB, KG, both, or safe fallback."
+        )
 
-        return examples
-  
\ No newline at end of file
+        total = min(n, sampler.size)
+        for batch_no, start in enumerate(range(0, total, ROUTING_BATCH_SIZE)):
+            combos = [sampler[i] for i in range(start, min(start + ROUTING_BATCH_SIZE, total))]
+            routing = engine.draw(
+                self.rng(shard=batch_no), np.array([c["scenario"] for c in combos])
+            )
+            scores = routing.score_dicts()
+            # Risk at or above the medium threshold is exactly when a fallback exists.
+            high_risk = (routing.fallback > 0).tolist()
+
+            for row, combo in enumerate(combos):
+                scenario = engine.scenarios[combo["scenario"]]
+                role = combo["role"]
+                product = combo["product"]
+
+                instruction = combo["instruction"].format(
+                    role=role, product=product, domain=cfg.domain_name
+                )
+                input_ctx = combo["input_ctx"].format(product=product, domain=cfg.domain_name)
+                output = combo["output"].format(product=product, domain=cfg.domain_name)
+
+                meta = make_metadata(
+                    section="operator_decision_logic",
+                    index=start + row + 1,
+                    complexity="high" if high_risk[row] else "medium",
+                    tags=["operator_selection", "rag_router", cfg.agent_name.lower()],
+                    reasoning_mode="chain_of_thought",
+                    confidence=0.8,
+                    scenario=scenario.key,
+                    question_wrapper="Choose the best operators and answer grounded on context."
+                )
+
+                yield {
+                    "system": system,
+                    "instruction": instruction,
+                    "input": input_ctx,
+                    "output": output,
+                    "metadata": meta,
+                    "operator_decision": {
+                        "primary_operator": scenario.primary,
+                        "secondary_operators": list(scenario.secondary),
+                        "reasoning_steps": [
+                            "Inspect vector search results for rich unstructured context.",
+                            "Inspect knowledge graph entities for structured relationships.",
+                            "Pick the operator (or combination) that gives the most grounded answer."
+                        ],
+                        "operator_scores": scores[row],
+                    }
+                }
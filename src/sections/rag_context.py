@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator
 
 from .base import SectionBuilder
 from ..utils import make_metadata
@@ -11,14 +11,18 @@ from ..utils import make_metadata
 class RagContextTrainingBuilder(SectionBuilder):
     """Sections 7+8: Multi-hop reasoning + contextual conflict resolution."""
 
+    section_key = "rag_context"
+
+    def base_sample_count(self) -> int:
+        return self.config.rag_context_samples
+
     @property
     def file_name(self) -> str:
         return "rag_context_training.json"
 
-    def build_examples(self) -> List[Dict[str, Any]]:
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
         cfg = self.config
-        n = cfg.rag_context_samples
-        examples: List[Dict[str, Any]] = []
+        n = self.sample_count
 
         # Define varied input and output templates for conflict resolution tasks.
         input_templates = [
@@ -56,13 +60,10 @@ class RagContextTrainingBuilder(SectionBuilder):
                 id=f"rag_conflict_{idx}"
             )
 
-            examples.append({
+            yield {
                 "system": system,
                 "instruction": instruction,
                 "input": input_ctx,
                 "output": output,
                 "metadata": meta,
-            })
-
-        return examples
-  
\ No newline at end of file
+            }
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator
 
 from .base import SectionBuilder
 from ..utils import make_metadata
@@ -20,14 +20,16 @@ class ResumeIntelligenceTrainingBuilder(SectionBuilder):
     - Answer HR-style questions later
     """
 
+    section_key = "resume_intelligence"
+    default_samples = 120
+
     @property
     def file_name(self) -> str:
         return "resume_intelligence_training.json"
 
-    def build_examples(self) -> List[Dict[str, Any]]:
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
         cfg = self.config
-        n = 120
-        examples: List[Dict[str, Any]] = []
+        n = self.sample_count
 
         base_skills = [
             "Java", "Spring Boot", "PostgreSQL", "Kafka",
@@ -98,12 +100,10 @@ class ResumeIntelligenceTrainingBuilder(SectionBuilder):
                 is_synthetic=True,
             )
 
-            examples.append({
+            yield {
                 "system": system,
                 "instruction": instruction,
                 "input": resume_text,
                 "output": json.dumps(output_dict, ensure_ascii=False),
                 "metadata": metadata,
-            })
-
-        return examples
+            }
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator
 
 from .base import SectionBuilder
 from ..utils import make_metadata
@@ -11,14 +11,16 @@ from ..utils import make_metadata
 class SafetyGuardrailsTrainingBuilder(SectionBuilder):
     """Section 5: Safety, guardrails & anti-hallucination."""
 
+    section_key = "safety"
+    default_samples = 100
+
     @property
     def file_name(self) -> str:
         return "safety_guardrails_training.json"
 
-    def build_examples(self) -> List[Dict[str, Any]]:
+    def iter_examples(self) -> Iterator[Dict[str, Any]]:
         cfg = self.config
-        n = 100
-        examples: List[Dict[str, Any]] = []
+        n = self.sample_count
 
         # Templates for unknown entity / no context queries
         unknown_templates = [
@@ -49,7 +51,7 @@ class SafetyGuardrailsTrainingBuilder(SectionBuilder):
                 risk_level="low",
                 category="no_context",
             )
-            examples.append({
+            yield {
                 "system": (
                     f"You are {cfg.agent_name}. Follow strict safety and hallucination rules."
                 ),
@@ -60,10 +62,10 @@ class SafetyGuardrailsTrainingBuilder(SectionBuilder):
                     "I prefer to say I don't know rather than guessing."
                 ),
                 "metadata": meta,
-            })
+            }
 
         # PII / sensitive examples
-        for count in range(1, n - len(examples) + 1):
+        for count in range(1, n - n // 2 + 1):
             q_template = pii_templates[count % len(pii_templates)]
             q = q_template.format(idx=count)
             meta = make_metadata(
@@ -76,7 +78,7 @@ class SafetyGuardrailsTrainingBuilder(SectionBuilder):
                 risk_level="high",
                 category="pii",
             )
-            examples.append({
+            yield {
                 "system": (
                     f"You are {cfg.agent_name}. Never reveal PII or sensitive financial data."
                 ),
@@ -88,7 +90,4 @@ class SafetyGuardrailsTrainingBuilder(SectionBuilder):
                     "Please ask a non-sensitive question."
                 ),
                 "metadata": meta,
-            })
-
-        return examples[:n]
-  
\ No newline at end of file
+            }
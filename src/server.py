@@ -0,0 +1,302 @@
+# dataset_generator/server.py
+"""
+Localhost generation service.
+
+Loads the config once, keeps builders warm and serves pages of any section as
+JSON lines, so tools that need a few fresh examples do not pay interpreter
+startup and config parsing on every call::
+
+    python -m src.server --config config.yaml --port 8765
+    curl 'http://127.0.0.1:8765/examples?domain=expense&section=safety&count=5&offset=10'
+
+Endpoints:
+
+* ``GET /domains`` - domain ids with their section keys.
+* ``GET /examples?domain=&section=&count=&offset=&seed=`` - JSONL page of
+  the section's examples as the CLI would write them (validated and
+  deduplicated); ``seed`` selects the sampling seed, defaulting to
+  ``--seed``. Pages index the section at its configured size; a window
+  reaching past its end is answered with 416 and the section's length.
+* ``GET /stats`` - cache sizes and hit counts.
+
+Errors are JSON objects with an ``error`` message: 400 for bad parameters,
+404 for unknown domains or sections, 500 when a domain's config is broken or
+a builder fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Generic, Hashable, List, Optional, Sequence, TypeVar
+from urllib.parse import parse_qs, urlparse
+
+from .domain_config import load_domain_configs
+from .factory import SectionBuilderFactory
+from .sections import SectionBuilder
+from .utils import clean_examples
+
+
+DEFAULT_PORT = 8765
+DEFAULT_COUNT = 10
+MAX_COUNT = 10_000
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe mapping that evicts the least recently used entry."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._data: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, record: bool = True) -> Optional[V]:
+        """Cached value or None; ``record=False`` leaves the hit counters alone."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += record
+                return None
+            self._data.move_to_end(key)
+            self.hits += record
+            return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+
+
+class RequestError(Exception):
+    """Bad request parameters; carries the HTTP status to answer with."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class GenerationService:
+    """Warm builders plus two LRU caches: built sections and rendered pages.
+
+    Parameters
+    ----------
+    config_path: Path
+        Config file, loaded once.
+    seed: int, optional
+        Default sampling seed for requests that do not pass one.
+    max_sections: int, optional
+        Built sections kept in memory.
+    max_pages: int, optional
+        Rendered JSONL pages kept in memory.
+    """
+
+    def __init__(
+        self,
+        config_path: Path,
+        seed: Optional[int] = None,
+        max_sections: int = 32,
+        max_pages: int = 1024,
+    ) -> None:
+        self._configs = load_domain_configs(config_path)
+        self._seed = seed
+        # Builders are cheap to keep but one set exists per (domain, seed).
+        self._builders: LRUCache[Dict[str, SectionBuilder]] = LRUCache(256)
+        self._sections: LRUCache[List[Dict[str, Any]]] = LRUCache(max_sections)
+        self._pages: LRUCache[bytes] = LRUCache(max_pages)
+        # Building is CPU bound, so concurrent builds would only compete for the
+        # GIL and duplicate memory; one lock keeps a section from being built
+        # twice by simultaneous requests.
+        self._build_lock = threading.Lock()
+
+    def _builders_for(self, domain: str, seed: Optional[int]) -> Dict[str, SectionBuilder]:
+        key = (domain, seed)
+        builders = self._builders.get(key, record=False)
+        if builders is None:
+            if domain not in self._configs:
+                raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown domain '{domain}'")
+            try:
+                cfg = self._configs[domain]
+                factory = SectionBuilderFactory(include_expense_docs=True, seed=seed)
+                builders = {b.section_key: b for b in factory.create_builders(cfg)}
+            except Exception as e:
+                raise RequestError(HTTPStatus.INTERNAL_SERVER_ERROR, f"Domain '{domain}' is unusable: {e}") from e
+            self._builders.put(key, builders)
+        return builders
+
+    def domains(self) -> Dict[str, Any]:
+        """Section keys per domain; a broken domain maps to its error instead."""
+        out: Dict[str, Any] = {}
+        for d in self._configs:
+            try:
+                out[d] = list(self._builders_for(d, self._seed))
+            except RequestError as e:
+                out[d] = {"error": str(e)}
+        return out
+
+    def section(self, domain: str, section: str, seed: Optional[int]) -> List[Dict[str, Any]]:
+        key = (domain, section, seed)
+        examples = self._sections.get(key)
+        if examples is not None:
+            return examples
+        builder = self._builders_for(domain, seed).get(section)
+        if builder is None:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown section '{section}' for domain '{domain}'")
+        with self._build_lock:
+            examples = self._sections.get(key, record=False)
+            if examples is None:
+                try:
+                    examples = clean_examples(builder.build_examples(), builder.file_name)
+                except Exception as e:
+                    raise RequestError(
+                        HTTPStatus.INTERNAL_SERVER_ERROR,
+                        f"Building section '{section}' of domain '{domain}' failed: {e}",
+                    ) from e
+                self._sections.put(key, examples)
+        return examples
+
+    def page(self, domain: str, section: str, count: int, offset: int, seed: Optional[int] = None) -> bytes:
+        """Examples ``offset .. offset + count`` of a section as JSON lines.
+
+        Raises
+        ------
+        RequestError
+            416 when the window reaches past the section's last example.
+        """
+        if seed is None:
+            seed = self._seed
+        key = (domain, section, count, offset, seed)
+        body = self._pages.get(key)
+        if body is None:
+            # Sections are not prefix-stable across sizes (most split their
+            # count between sub-groups), so a bigger build would reshuffle the
+            # pages before this one; refuse the window instead.
+            section_examples = self.section(domain, section, seed)
+            total = len(section_examples)
+            if offset + count > total:
+                raise RequestError(
+                    HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+                    f"Section '{section}' of domain '{domain}' has {total} examples; "
+                    f"offset {offset} + count {count} is past the end",
+                )
+            examples = section_examples[offset:offset + count]
+            body = "".join(json.dumps(ex, ensure_ascii=False) + "\n" for ex in examples).encode("utf-8")
+            self._pages.put(key, body)
+        return body
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sections": {"entries": len(self._sections), "hits": self._sections.hits, "misses": self._sections.misses},
+            "pages": {"entries": len(self._pages), "hits": self._pages.hits, "misses": self._pages.misses},
+        }
+
+
+def _int_param(params: Dict[str, List[str]], name: str, default: Optional[int], lo: int, hi: int) -> Optional[int]:
+    raw = params.get(name, [None])[0]
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"'{name}' must be an integer") from None
+    if not lo <= value <= hi:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"'{name}' must be between {lo} and {hi}")
+    return value
+
+
+def _str_param(params: Dict[str, List[str]], name: str) -> str:
+    value = params.get(name, [""])[0]
+    if not value:
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"Missing '{name}' parameter")
+    return value
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: GenerationService  # set on the subclass built by make_server
+    quiet = False
+
+    def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        try:
+            if url.path == "/examples":
+                body = self.service.page(
+                    _str_param(params, "domain"),
+                    _str_param(params, "section"),
+                    count=_int_param(params, "count", DEFAULT_COUNT, 0, MAX_COUNT),
+                    offset=_int_param(params, "offset", 0, 0, 2**63 - 1),
+                    seed=_int_param(params, "seed", None, 0, 2**63 - 1),
+                )
+                self._send(HTTPStatus.OK, body, "application/x-ndjson")
+            elif url.path == "/domains":
+                self._send_json(HTTPStatus.OK, self.service.domains())
+            elif url.path == "/stats":
+                self._send_json(HTTPStatus.OK, self.service.stats())
+            else:
+                raise RequestError(HTTPStatus.NOT_FOUND, f"No such endpoint '{url.path}'")
+        except RequestError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            self.log_error("Unhandled error for %s: %r", self.path, e)
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Internal error: {e}"})
+
+    def _send_json(self, status: HTTPStatus, payload: Any) -> None:
+        self._send(status, (json.dumps(payload) + "\n").encode("utf-8"), "application/json")
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(service: GenerationService, host: str, port: int, quiet: bool = False) -> ThreadingHTTPServer:
+    handler = type("Handler", (_Handler,), {"service": service, "quiet": quiet})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve generated examples over localhost HTTP.")
+    parser.add_argument("--config", required=True, help="Path to config.yaml")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=None, help="Default sampling seed")
+    parser.add_argument("--cache-sections", type=int, default=32, help="Built sections kept in memory")
+    parser.add_argument("--cache-pages", type=int, default=1024, help="Rendered pages kept in memory")
+    parser.add_argument("--quiet", action="store_true", help="Do not log requests")
+    args = parser.parse_args(argv)
+
+    config_path = Path(args.config)
+    if not config_path.exists():
+        raise FileNotFoundError(f"Config file not found: {config_path}")
+    service = GenerationService(config_path, args.seed, args.cache_sections, args.cache_pages)
+    server = make_server(service, args.host, args.port, args.quiet)
+    print(f"Serving examples on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# dataset_generator/splits.py
+
+from __future__ import annotations
+
+import hashlib
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .domain_config import DomainConfig
+from .utils import content_key
+
+
+# -----------------------------------------------------------------------------
+# Train / validation / test splits
+#
+# Each example is mapped to a number u in [0, 1) by a hash of its content
+# (instruction, input and output, the same key deduplication uses), so its
+# split never depends on generation order, on which domains or shards are in
+# the run, or on the seed of unrelated sections.
+#
+# An example goes to the first split whose cumulative ratio exceeds u, so its
+# split is a pure function of the example: adding or removing other examples,
+# sharding the run or writing a section in pieces never moves it, and nothing
+# has to be held in memory to decide it.
+#
+# With ``stratify`` keys (metadata fields such as ``section``, ``complexity``
+# or ``is_negative_example``) the stratum's values are hashed together with
+# the content, giving every stratum its own independent draw against the same
+# thresholds. Each stratum then matches the ratios in expectation, but a
+# small stratum is not cut at an exact quota: ten hard negatives with a 5%
+# validation ratio may well put none in ``val``.
+
+DEFAULT_SPLIT_NAMES = ("train", "val", "test")
+
+
+def _unit_hash(example: Mapping[str, Any], stratum: Tuple[str, ...] = ()) -> float:
+    key = content_key(example)
+    if stratum:
+        key += "|" + "|".join(stratum)
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8, person=b"split").digest()
+    return int.from_bytes(digest, "big") / 2**64
+
+
+def parse_split_ratios(spec: str) -> Dict[str, float]:
+    """Parse ``"train=0.9,val=0.05,test=0.05"`` into a ratio mapping."""
+    ratios: Dict[str, float] = {}
+    for part in spec.split(","):
+        name, sep, value = part.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Invalid split '{part}', expected name=ratio")
+        ratios[name.strip()] = float(value)
+    return ratios
+
+
+@dataclass(frozen=True)
+class SplitSpec:
+    """Named split ratios plus optional metadata keys to stratify by."""
+
+    ratios: Tuple[Tuple[str, float], ...]
+    stratify: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if not self.ratios:
+            raise ValueError("At least one split is required")
+        names = [name for name, _ in self.ratios]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate split names in {names}")
+        if any(r < 0 for _, r in self.ratios):
+            raise ValueError("Split ratios must be >= 0")
+        total = sum(r for _, r in self.ratios)
+        if not math.isclose(total, 1.0, abs_tol=1e-6):
+            raise ValueError(f"Split ratios must sum to 1, got {total:g}")
+
+    @classmethod
+    def from_config(cls, cfg: DomainConfig) -> Optional[SplitSpec]:
+        """The config's split spec, or None when it does not split."""
+        if not cfg.splits:
+            return None
+        return cls(tuple(cfg.splits.items()), tuple(cfg.split_stratify or ()))
+
+    @property
+    def names(self) -> List[str]:
+        return [name for name, _ in self.ratios]
+
+    def path_for(self, path: Path, name: str) -> Path:
+        """``safety.json`` -> ``safety.train.json``."""
+        return path.with_name(f"{path.stem}.{name}{path.suffix}")
+
+    def split_of(self, example: Mapping[str, Any]) -> str:
+        """Split name of one example; depends on nothing but the example."""
+        u = _unit_hash(example, self._stratum(example))
+        acc = 0.0
+        for name, ratio in self.ratios:
+            acc += ratio
+            if u < acc:
+                return name
+        return self.ratios[-1][0]  # ratios summing to just under 1
+
+    def assign(self, examples: Sequence[Mapping[str, Any]]) -> List[str]:
+        """Split name for every example, in order."""
+        return [self.split_of(ex) for ex in examples]
+
+    def _stratum(self, example: Mapping[str, Any]) -> Tuple[str, ...]:
+        if not self.stratify:
+            return ()
+        meta = example.get("metadata") or {}
+        return tuple(f"{k}={meta.get(k)}" for k in self.stratify)
@@ -0,0 +1,146 @@
+# dataset_generator/stream.py
+
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from .domain_config import DomainConfig
+from .factory import SectionBuilderFactory
+from .sections import SectionBuilder
+from .splits import SplitSpec
+from .utils import iter_clean_examples
+
+
+# -----------------------------------------------------------------------------
+# In-process generation
+#
+# Training jobs can draw examples straight from the builders instead of
+# reading JSON files back from disk. Sections are generated lazily when the
+# iterator reaches them, validated and deduplicated exactly like the CLI does
+# (keeping only content hashes), and yielded in the same order the CLI writes
+# them, so memory stays flat however large a section is.
+#
+# Sharding partitions that canonical stream, so the union of all shards is
+# the full dataset and no example is seen twice:
+#
+# * ``shard_by="example"`` (default) deals examples round-robin over the
+#   concatenated stream. Shards stay balanced, but every shard generates every
+#   section and skips the examples that are not its share.
+# * ``shard_by="section"`` assigns whole sections round-robin. Nothing is
+#   built twice, at the price of uneven shards when sections differ in size.
+#
+# Inside a PyTorch DataLoader worker the worker id/count are folded in
+# automatically (``shard * num_workers + worker_id``), so several workers
+# reading the same iterator definition get disjoint streams.
+
+SHARD_MODES = ("example", "section")
+
+
+def _loader_worker() -> Tuple[int, int]:
+    """(worker id, worker count) of the current DataLoader worker, or (0, 1).
+
+    torch is never imported here; if the process has not imported it there
+    cannot be a DataLoader worker.
+    """
+    data = sys.modules.get("torch.utils.data")
+    info = data.get_worker_info() if data is not None else None
+    if info is None:
+        return 0, 1
+    return info.id, info.num_workers
+
+
+def iter_dataset(
+    cfg: DomainConfig,
+    sections: Optional[Iterable[str]] = None,
+    shard: int = 0,
+    num_shards: int = 1,
+    seed: Optional[int] = None,
+    shard_by: str = "example",
+    include_expense_docs: bool = True,
+    worker_aware: bool = True,
+    split: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Lazily yield the examples of ``cfg`` without writing any files.
+
+    Parameters
+    ----------
+    cfg: DomainConfig
+        Domain to generate.
+    sections: iterable of str, optional
+        Section keys to include (e.g. ``["safety", "expense_docs"]``); all
+        sections the factory builds for ``cfg`` when omitted.
+    shard, num_shards: int, optional
+        Yield only shard ``shard`` of ``num_shards`` disjoint shards.
+    seed: int, optional
+        Root sampling seed, as ``--seed`` on the command line.
+    shard_by: str, optional
+        ``"example"`` or ``"section"`` (see module comment).
+    include_expense_docs: bool, optional
+        Passed to :class:`SectionBuilderFactory`.
+    worker_aware: bool, optional
+        Split each shard further across PyTorch DataLoader workers.
+    split: str, optional
+        Yield only this split of ``cfg.splits`` (same assignment as the
+        split files the CLI writes).
+
+    Returns
+    -------
+    iterator of dict
+        Examples in the order the CLI would write them.
+    """
+    if shard_by not in SHARD_MODES:
+        raise ValueError(f"Unknown shard_by '{shard_by}', expected one of {SHARD_MODES}")
+    if num_shards < 1 or not 0 <= shard < num_shards:
+        raise ValueError(f"Invalid shard {shard} of {num_shards}")
+    if worker_aware:
+        worker_id, num_workers = _loader_worker()
+        shard, num_shards = shard * num_workers + worker_id, num_shards * num_workers
+
+    builders = SectionBuilderFactory(include_expense_docs=include_expense_docs, seed=seed).create_builders(cfg)
+    if sections is not None:
+        wanted = list(sections)
+        available = {b.section_key for b in builders}
+        unknown = [s for s in wanted if s not in available]
+        if unknown:
+            raise ValueError(
+                f"Unknown section(s) {unknown} for domain '{cfg.id}', expected some of {sorted(available)}"
+            )
+        builders = [b for b in builders if b.section_key in wanted]
+
+    spec = SplitSpec.from_config(cfg) if split is not None else None
+    if split is not None and (spec is None or split not in spec.names):
+        raise ValueError(f"Domain '{cfg.id}' has no split '{split}' (splits: {cfg.splits})")
+
+    return _iter_shard(builders, shard, num_shards, shard_by, spec, split)
+
+
+def _section_examples(
+    builder: SectionBuilder, spec: Optional[SplitSpec], split: Optional[str]
+) -> Iterator[Dict[str, Any]]:
+    examples = iter_clean_examples(builder.iter_examples(), builder.file_name)
+    if spec is None:
+        return examples
+    return (ex for ex in examples if spec.split_of(ex) == split)
+
+
+def _iter_shard(
+    builders: Sequence[SectionBuilder],
+    shard: int,
+    num_shards: int,
+    shard_by: str,
+    spec: Optional[SplitSpec],
+    split: Optional[str],
+) -> Iterator[Dict[str, Any]]:
+    # Kept separate from iter_dataset so argument errors surface at call time
+    # rather than on the first next().
+    pos = 0  # position in the concatenated stream
+    for section_no, builder in enumerate(builders):
+        if shard_by == "section":
+            if section_no % num_shards == shard:
+                yield from _section_examples(builder, spec, split)
+            continue
+        for ex in _section_examples(builder, spec, split):
+            if pos % num_shards == shard:
+                yield ex
+            pos += 1
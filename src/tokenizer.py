@@ -0,0 +1,125 @@
+# dataset_generator/tokenizer.py
+
+from __future__ import annotations
+
+import json
+import re
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# -----------------------------------------------------------------------------
+# Local tokenization
+#
+# Packing and pre-tokenized export need token counts and ids for every
+# example. A ``tokenizer.json`` (the Hugging Face ``tokenizers`` format, which
+# every recent model ships) gives the real numbers; ``tokenizers`` is an
+# optional dependency and is only imported when such a file is requested.
+# Without it the whitespace tokenizer splits words and punctuation and hashes
+# them into a fixed vocabulary: no state, no downloads, the same ids on every
+# machine, and counts close enough to plan packing with.
+#
+# An example is rendered as a prompt (system, instruction and input, one per
+# line) and a response (output); training only computes loss on the response,
+# so the two are tokenized separately and the boundary is kept.
+
+PROMPT_FIELDS = ("system", "instruction", "input")
+RESPONSE_FIELD = "output"
+WHITESPACE = "whitespace"
+DEFAULT_VOCAB_SIZE = 1 << 16
+DEFAULT_EOS_TOKEN = "</s>"
+
+_WORD_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def _field_text(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+def example_segments(example: Dict[str, Any]) -> Tuple[str, str]:
+    """(prompt, response) text of an example."""
+    prompt = "\n".join(_field_text(example[f]) for f in PROMPT_FIELDS if example.get(f))
+    response = example.get(RESPONSE_FIELD)
+    return prompt, _field_text(response) if response else ""
+
+
+class WhitespaceTokenizer:
+    """Words and punctuation hashed into ``vocab_size`` ids; id 0 is EOS.
+
+    Parameters
+    ----------
+    vocab_size: int, optional
+        Number of ids, EOS included.
+    """
+
+    name = WHITESPACE
+
+    def __init__(self, vocab_size: int = DEFAULT_VOCAB_SIZE) -> None:
+        if vocab_size < 2:
+            raise ValueError("vocab_size must be >= 2")
+        self.vocab_size = vocab_size
+        self.eos_id = 0
+
+    def encode_batch(self, texts: Sequence[str]) -> List[List[int]]:
+        m = self.vocab_size - 1
+        return [[1 + zlib.crc32(w.encode("utf-8")) % m for w in _WORD_RE.findall(t)] for t in texts]
+
+    def count_batch(self, texts: Sequence[str]) -> np.ndarray:
+        return np.fromiter((len(_WORD_RE.findall(t)) for t in texts), dtype=np.int64, count=len(texts))
+
+
+class FileTokenizer:
+    """A local ``tokenizer.json`` loaded with the ``tokenizers`` package.
+
+    Parameters
+    ----------
+    path: Path
+        The tokenizer file.
+    eos_token: str, optional
+        Token appended after every example.
+    """
+
+    def __init__(self, path: Path, eos_token: str = DEFAULT_EOS_TOKEN) -> None:
+        try:
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise RuntimeError(
+                f"Loading {path} requires the optional 'tokenizers' package "
+                f"(pip install tokenizers); omit --tokenizer to use the whitespace tokenizer"
+            ) from e
+        self._tok = Tokenizer.from_file(str(path))
+        self.name = str(path)
+        self.vocab_size = self._tok.get_vocab_size(with_added_tokens=True)
+        eos_id = self._tok.token_to_id(eos_token)
+        if eos_id is None:
+            raise ValueError(f"{path} has no EOS token {eos_token!r}; pass the model's EOS token")
+        self.eos_id = eos_id
+
+    def encode_batch(self, texts: Sequence[str]) -> List[List[int]]:
+        return [enc.ids for enc in self._tok.encode_batch(list(texts), add_special_tokens=False)]
+
+    def count_batch(self, texts: Sequence[str]) -> np.ndarray:
+        encodings = self._tok.encode_batch(list(texts), add_special_tokens=False)
+        return np.fromiter((len(enc.ids) for enc in encodings), dtype=np.int64, count=len(texts))
+
+
+Tokenizer = Any  # WhitespaceTokenizer | FileTokenizer
+
+
+def load_tokenizer(spec: Optional[str] = None, eos_token: str = DEFAULT_EOS_TOKEN) -> Tokenizer:
+    """``None`` or ``"whitespace"`` -> WhitespaceTokenizer, else a tokenizer.json path."""
+    if spec is None or spec == WHITESPACE:
+        return WhitespaceTokenizer()
+    path = Path(spec)
+    if not path.is_file():
+        raise FileNotFoundError(f"Tokenizer file not found: {path}")
+    return FileTokenizer(path, eos_token)
+
+
+def example_lengths(examples: Sequence[Dict[str, Any]], tokenizer: Tokenizer) -> np.ndarray:
+    """Tokens per example: prompt, response and the trailing EOS."""
+    prompts, responses = zip(*(example_segments(ex) for ex in examples)) if examples else ((), ())
+    return tokenizer.count_batch(prompts) + tokenizer.count_batch(responses) + 1
@@ -2,12 +2,22 @@
 
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
+import random
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union, overload
+
+import numpy as np
 
 from .domain_config import DomainConfig
+from .sampling import MixedRadixSpace
+
+if TYPE_CHECKING:
+    from .splits import SplitSpec
 
 
 # -----------------------------------------------------------------------------
@@ -76,8 +86,8 @@ def validate_example(example: Dict[str, Any]) -> bool:
 
     An example is considered valid if it contains at least a ``system`` key and
     a non-empty ``output``. If ``instruction`` is present it must be non-empty
-    as well. For examples where ``output`` is a dict or list, the structure
-    must not be empty.
+    as well, except for multi-turn dialogues (list outputs). For examples where
+    ``output`` is a dict or list, the structure must not be empty.
 
     Parameters
     ----------
@@ -92,12 +102,14 @@ def validate_example(example: Dict[str, Any]) -> bool:
     # Check mandatory keys
     if "system" not in example or "output" not in example:
         return False
-    # Check instruction if provided
+    out = example["output"]
+    # Check instruction if provided. Multi-turn dialogues carry the prompt in
+    # their messages and may leave the instruction empty.
     instr = example.get("instruction")
     if instr is not None and isinstance(instr, str) and not instr.strip():
-        return False
+        if not isinstance(out, list):
+            return False
     # Validate output
-    out = example["output"]
     if isinstance(out, str):
         if not out.strip():
             return False
@@ -117,6 +129,28 @@ def validate_example(example: Dict[str, Any]) -> bool:
     return True
 
 
+def content_key(example: Dict[str, Any]) -> str:
+    """The instruction, input and full output that identify an example."""
+    instruction = example.get("instruction", "")
+    input_text = str(example.get("input", ""))
+    output_text = str(example.get("output", ""))
+    return f"{instruction}|{input_text}|{output_text}"
+
+
+_TEXT_FIELDS = ("system", "instruction", "input", "output")
+
+
+def approx_tokens(example: Dict[str, Any]) -> int:
+    """Whitespace token count over the text fields, a cheap length estimate."""
+    total = 0
+    for field in _TEXT_FIELDS:
+        value = example.get(field)
+        if value:
+            text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+            total += len(text.split())
+    return total
+
+
 def deduplicate_examples(examples: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Remove duplicate examples based on instruction, input, and full output hash.
 
@@ -139,13 +173,7 @@ def deduplicate_examples(examples: List[Dict[str, Any]]) -> List[Dict[str, Any]]
     unique_examples: List[Dict[str, Any]] = []
     for ex in examples:
         # Use full output with hash to avoid false positives from prefix matching
-        instruction = ex.get("instruction", "")
-        input_text = str(ex.get("input", ""))
-        output_text = str(ex.get("output", ""))
-
-        # Create a hash of the full content
-        content = f"{instruction}|{input_text}|{output_text}"
-        content_hash = hashlib.md5(content.encode('utf-8')).hexdigest()
+        content_hash = hashlib.md5(content_key(ex).encode('utf-8')).hexdigest()
 
         if content_hash not in seen:
             seen.add(content_hash)
@@ -202,7 +230,145 @@ def compute_stats(examples: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
 
-def save_json_array(path: Path, items: List[Dict[str, Any]]) -> None:
+# Sections that should skip deduplication due to limited dimension variety
+NO_DEDUP_FILES = frozenset({
+    "operator-training.json",
+    "entity_reasoning_depth_training.json",
+})
+
+
+def clean_examples(items: List[Dict[str, Any]], file_name: str) -> List[Dict[str, Any]]:
+    """Validate and deduplicate ``items`` exactly as :func:`save_json_array` does."""
+    validated = [ex for ex in items if validate_example(ex)]
+    if file_name in NO_DEDUP_FILES:
+        return validated
+    return deduplicate_examples(validated)
+
+
+def iter_clean_examples(items: Iterable[Dict[str, Any]], file_name: str) -> Iterator[Dict[str, Any]]:
+    """Streaming :func:`clean_examples`: the same examples, in the same order.
+
+    Only the hashes of the examples seen so far are kept, not the examples.
+    """
+    dedup = file_name not in NO_DEDUP_FILES
+    seen: set = set()
+    for ex in items:
+        if not validate_example(ex):
+            continue
+        if dedup:
+            content_hash = hashlib.md5(content_key(ex).encode('utf-8')).hexdigest()
+            if content_hash in seen:
+                continue
+            seen.add(content_hash)
+        yield ex
+
+
+class JsonArrayWriter:
+    """Writes a JSON array one item at a time.
+
+    The output is byte-identical to ``json.dump(items, f, ensure_ascii=False,
+    indent=2)``, so several files can be filled in one pass over the items.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._f = path.open("w", encoding="utf-8")
+        self.count = 0
+
+    def write(self, item: Any) -> None:
+        self._f.write(",\n  " if self.count else "[\n  ")
+        # Strings never contain raw newlines in JSON, so this only indents.
+        self._f.write(json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n  "))
+        self.count += 1
+
+    def close(self) -> None:
+        self._f.write("\n]" if self.count else "[]")
+        self._f.close()
+
+    def __enter__(self) -> "JsonArrayWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def iter_json_array(path: Path, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the items of a JSON array file without loading the whole file.
+
+    Parameters
+    ----------
+    path: Path
+        File holding a single JSON array (as written by :func:`save_json_array`).
+    chunk_size: int, optional
+        Characters read at a time.
+    """
+    decoder = json.JSONDecoder()
+    with path.open("r", encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+
+        def fill() -> bool:
+            # Drop consumed text and append a chunk; False at end of file.
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            buf, pos, eof = buf[pos:] + chunk, 0, not chunk
+            return bool(chunk)
+
+        def skip(chars: str) -> str:
+            # Next character not in ``chars`` ("" at end of file).
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in chars:
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                if not fill():
+                    return ""
+
+        if skip(" \t\r\n") != "[":
+            raise ValueError(f"{path} does not contain a JSON array")
+        pos += 1
+        while True:
+            head = skip(" \t\r\n,")
+            if head == "]":
+                return
+            if not head:
+                raise ValueError(f"Unterminated JSON array in {path}")
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    item, end = None, -1
+                # A value ending exactly at the buffer's end may be cut short
+                # (e.g. a number); only trust it once more text follows.
+                if end != -1 and (end < len(buf) or eof):
+                    break
+                if not fill():
+                    if end == -1:
+                        raise ValueError(f"Malformed JSON array in {path}")
+                    break
+            pos = end
+            yield item
+
+
+@dataclass(frozen=True)
+class SaveReport:
+    """Counts, size and per-stage wall time of one :func:`save_json_array` call."""
+
+    received: int
+    valid: int
+    written: int
+    bytes: int
+    # Seconds spent in each stage: validate, dedup, stats, [split,] write
+    stage_seconds: Dict[str, float]
+    # Examples per split name when the section was split
+    split_counts: Optional[Dict[str, int]] = None
+
+
+def save_json_array(
+    path: Path,
+    items: List[Dict[str, Any]],
+    on_stage: Optional[Callable[[str], None]] = None,
+    splits: Optional["SplitSpec"] = None,
+) -> SaveReport:
     """Persist a list of dicts as a JSON array and sidecar stats file.
 
     This function performs deduplication and validation on the provided items
@@ -220,30 +386,134 @@ def save_json_array(path: Path, items: List[Dict[str, Any]]) -> None:
         Destination file path for the JSON dataset.
     items: list of dicts
         The raw examples to be cleaned and saved.
-    """
-    # Sections that should skip deduplication due to limited dimension variety
-    no_dedup_sections = {
-        "operator-training.json",
-        "entity_reasoning_depth_training.json",
-    }
+    on_stage: callable, optional
+        Called with the stage name (validate, dedup, stats, split, write) as
+        each stage starts, e.g. to report progress.
+    splits: SplitSpec, optional
+        Write one file per split (``<stem>.<split>.json``, see splits.py)
+        instead of ``path``. The stats file covers all splits and records the
+        split sizes.
 
+    Returns
+    -------
+    SaveReport
+        Example counts before and after cleaning, bytes written and the time
+        spent in each stage.
+    """
+    timings: Dict[str, float] = {}
+    clock = time.perf_counter()
+
+    def lap(stage: str, following: Optional[str] = None) -> None:
+        nonlocal clock
+        now = time.perf_counter()
+        timings[stage] = now - clock
+        clock = now
+        if following is not None and on_stage is not None:
+            on_stage(following)
+
+    if on_stage is not None:
+        on_stage("validate")
     # Filter out invalid examples
     validated = [ex for ex in items if validate_example(ex)]
+    lap("validate", "dedup")
 
     # Skip deduplication for certain sections to preserve template variety
-    if path.name in no_dedup_sections:
+    if path.name in NO_DEDUP_FILES:
         cleaned = validated
     else:
         cleaned = deduplicate_examples(validated)
+    lap("dedup", "stats")
+
+    stats = compute_stats(cleaned)
+    lap("stats", "split" if splits is not None else "write")
+
+    split_counts: Optional[Dict[str, int]] = None
+    if splits is not None:
+        assignment = splits.assign(cleaned)
+        lap("split", "write")
 
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(cleaned, f, ensure_ascii=False, indent=2)
+    if splits is None:
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(cleaned, f, ensure_ascii=False, indent=2)
+        written_bytes = path.stat().st_size
+    else:
+        # One pass over the examples fills every split file.
+        writers = {name: JsonArrayWriter(splits.path_for(path, name)) for name in splits.names}
+        try:
+            for ex, name in zip(cleaned, assignment):
+                writers[name].write(ex)
+        finally:
+            for writer in writers.values():
+                writer.close()
+        split_counts = {name: w.count for name, w in writers.items()}
+        stats["splits"] = split_counts
+        written_bytes = sum(splits.path_for(path, name).stat().st_size for name in splits.names)
     # Write stats
-    stats = compute_stats(cleaned)
     stats_path = path.parent / f"{path.stem}_stats.json"
     with stats_path.open("w", encoding="utf-8") as f:
         json.dump(stats, f, ensure_ascii=False, indent=2)
+    lap("write")
+
+    return SaveReport(
+        received=len(items),
+        valid=len(validated),
+        written=len(cleaned),
+        bytes=written_bytes,
+        stage_seconds=timings,
+        split_counts=split_counts,
+    )
+
+
+def dumps_float_rows(
+    keys: Sequence[str],
+    values: np.ndarray,
+    columns: Optional[np.ndarray] = None,
+    mask: Optional[np.ndarray] = None,
+) -> List[str]:
+    """Serialize each row of a float matrix as a JSON object, in bulk.
+
+    Produces exactly what ``json.dumps(dict(zip(keys, row)))`` would, but
+    formats every distinct value and every key only once per call instead of
+    once per cell, which dominates the cost for wide, repetitive matrices
+    such as per-label confidences.
+
+    Parameters
+    ----------
+    keys: sequence of str
+        Object key for each column of ``values``.
+    values: numpy.ndarray
+        Finite floats of shape ``(rows, len(keys))``, or ``(rows, k)`` when
+        ``columns`` is given.
+    columns: numpy.ndarray, optional
+        Integer array shaped like ``values`` selecting the key of every cell,
+        for top-k or otherwise reordered rows.
+    mask: numpy.ndarray, optional
+        Boolean array shaped like ``values``; only cells where it is true are
+        written, giving sparse rows of varying length.
+
+    Returns
+    -------
+    list of str
+        One serialized JSON object per row.
+    """
+    uniques, inverse = np.unique(values, return_inverse=True)
+    inverse = inverse.reshape(values.shape)
+    # json.dumps formats floats with float.__repr__ and keys with a JSON string
+    # encoder; both are applied once per distinct value here.
+    formatted = [repr(v) for v in uniques.tolist()]
+    prefixes = [json.dumps(k, ensure_ascii=False) + ": " for k in keys]
+    rows = inverse.tolist()
+    if columns is None and mask is None:
+        return ["{" + ", ".join([p + formatted[i] for p, i in zip(prefixes, row)]) + "}" for row in rows]
+    if columns is None:
+        columns = np.broadcast_to(np.arange(len(keys)), values.shape)
+    if mask is None:
+        mask = np.ones(values.shape, dtype=bool)
+    return [
+        "{" + ", ".join([prefixes[c] + formatted[i] for c, i, m in zip(cols, row, keep) if m]) + "}"
+        for cols, row, keep in zip(columns.tolist(), rows, mask.tolist())
+    ]
 
 
 def default_currencies(cfg: DomainConfig) -> List[str]:
@@ -355,52 +625,104 @@ def classify_entity_name(name: str, entity_types: List[str]) -> List[str]:
     return labels if labels else ["Unknown"]
 
 
+_DEFAULT_BASE_ENTITIES = [
+    "Expense Report", "Expense Policy", "Workflow", "Voucher", "Card Transaction",
+    "Invoice", "Receipt", "Vendor", "GL Account"
+]
+
+
+class EntityNameSpace(Sequence[str]):
+    """Lazy, index-addressable space of pseudo entity names.
+
+    Names combine a region, an entity type and a role with a serial number,
+    e.g. ``"India Expense Policy for Finance Controller 001"``. The
+    region × entity × role product is addressed in mixed radix (role varies
+    fastest), and the serial number is the 1-based position in the space, so
+    every name is unique even once ``size`` exceeds the product and the
+    components start to cycle. Nothing is materialized: indexing, iteration,
+    slicing and sampling all work on ``range`` objects.
+
+    Parameters
+    ----------
+    cfg: DomainConfig
+        The domain configuration used to derive region, entity and role names.
+    size: int, optional
+        Number of names in the space. Defaults to the size of the
+        region × entity × role product.
+    """
+
+    def __init__(self, cfg: DomainConfig, size: Optional[int] = None) -> None:
+        self._regions = list(cfg.primary_regions or ["Global"])
+        self._roles = list(cfg.primary_roles or ["User"])
+        # Use provided entity types if available; otherwise fallback
+        self._entities = list(cfg.entity_types or _DEFAULT_BASE_ENTITIES)
+        self._space = MixedRadixSpace(
+            [len(self._regions), len(self._entities), len(self._roles)]
+        )
+        self._indices = range(len(self._space) if size is None else size)
+
+    def _name(self, position: int) -> str:
+        region, ent, role = self._space.digits(position % len(self._space))
+        return (
+            f"{self._regions[region]} {self._entities[ent]} "
+            f"for {self._roles[role]} {position + 1:03d}"
+        )
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "EntityNameSpace": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, "EntityNameSpace"]:
+        if isinstance(index, slice):
+            view = copy.copy(self)
+            view._indices = self._indices[index]
+            return view
+        return self._name(self._indices[index])
+
+    def __iter__(self) -> Iterator[str]:
+        for position in self._indices:
+            yield self._name(position)
+
+    def shard(self, shard: int, num_shards: int) -> "EntityNameSpace":
+        """Return the ``shard``-th of ``num_shards`` disjoint, strided partitions."""
+        if not 0 <= shard < num_shards:
+            raise ValueError(f"shard must be in [0, {num_shards}), got {shard}")
+        return self[shard::num_shards]
+
+    def sample(self, k: int, rng: Optional[random.Random] = None) -> List[str]:
+        """Draw ``k`` distinct names uniformly at random, without replacement."""
+        rng = rng or random.Random()
+        return [self._name(p) for p in rng.sample(self._indices, k)]
+
+    def __repr__(self) -> str:
+        return f"EntityNameSpace(size={len(self)}, product={len(self._space)})"
+
+
 def generate_diverse_entity_names(cfg: DomainConfig, n: int) -> List[str]:
     """Generate a diverse list of entity-like names for classification tasks.
 
     This helper creates pseudo entity names by combining regions, entity types,
-    roles and simple numeric identifiers. It ensures that a reasonable variety
-    of names are produced to avoid overfitting on a small static set. If
-    ``cfg`` provides specific ``entity_types`` they will be used; otherwise a
-    fallback set of generic financial domain entities is applied. The number of
-    names returned will be at least ``n``; if the Cartesian product of the
-    components yields more than needed, the list will be truncated.
+    roles and simple numeric identifiers. If ``cfg`` provides specific
+    ``entity_types`` they will be used; otherwise a fallback set of generic
+    financial domain entities is applied. Names are taken from an
+    :class:`EntityNameSpace` of size ``n``; use that class directly to index,
+    sample or shard large name spaces without building a list.
 
     Parameters
     ----------
     cfg: DomainConfig
         The domain configuration used to derive region and role names.
     n: int
-        The minimum number of unique names to generate.
+        The number of unique names to generate.
 
     Returns
     -------
     list of str
         A list of unique entity names suitable for training examples.
     """
-    regions = cfg.primary_regions or ["Global"]
-    roles = cfg.primary_roles or ["User"]
-    # Use provided entity types if available; otherwise fallback
-    base_entities = cfg.entity_types or [
-        "Expense Report", "Expense Policy", "Workflow", "Voucher", "Card Transaction",
-        "Invoice", "Receipt", "Vendor", "GL Account"
-    ]
-    names: List[str] = []
-    counter = 1
-    # Cartesian combination of regions, base entities and roles
-    for region in regions:
-        for ent in base_entities:
-            for role in roles:
-                # e.g. "India Expense Policy for Finance Controller 001"
-                name = f"{region} {ent} for {role} {counter:03d}"
-                names.append(name)
-                counter += 1
-                if len(names) >= n:
-                    return names
-    # If still not enough, append numeric suffixes
-    while len(names) < n:
-        name = f"{regions[0]} {base_entities[0]} {counter:03d}"
-        names.append(name)
-        counter += 1
-    return names
-   
\ No newline at end of file
+    return list(EntityNameSpace(cfg, n))
@@ -0,0 +1,213 @@
+# dataset_generator/watch.py
+
+from __future__ import annotations
+
+import importlib
+import re
+import sys
+import time
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List, Optional, Set
+
+from . import factory as factory_module
+from . import sections as sections_package
+from .domain_config import DomainConfig
+from .generator import DatasetGenerator, SectionResult
+
+
+# -----------------------------------------------------------------------------
+# Watch mode
+#
+# The process stays up after the first run and polls the config file plus
+# every builder module and data file in ``src/sections``. A change is mapped
+# to the smallest set of work:
+#
+# * A builder module (or a YAML file it names) is reloaded together with the
+#   modules importing it, then ``sections`` and the factory are reloaded so new
+#   builders use the new classes. ``base.py`` reloads every builder.
+# * A config edit only touches the domains whose DomainConfig changed.
+#
+# The affected domains are then regenerated through the generator's section
+# memo: sections whose class and config inputs are unchanged come back as the
+# very list that was written last time and are skipped, so only the sections
+# actually affected are rebuilt and rewritten. Polling ``stat`` on a couple of
+# dozen files is cheap enough that no inotify dependency is needed.
+
+DEFAULT_POLL_INTERVAL = 0.25
+SECTIONS_DIR = Path(sections_package.__file__).parent
+
+_IMPORT_RE = re.compile(r"^from \.(\w+) import", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class ChangeSet:
+    config: bool
+    modules: FrozenSet[str]  # section module names (file stems) to reload
+
+    def __bool__(self) -> bool:
+        return self.config or bool(self.modules)
+
+
+def _watched_files(config_path: Path) -> List[Path]:
+    files = [config_path]
+    files.extend(sorted(SECTIONS_DIR.glob("*.py")))
+    files.extend(sorted(SECTIONS_DIR.glob("*.yaml")))
+    return files
+
+
+def _mtimes(files: List[Path]) -> Dict[Path, int]:
+    out: Dict[Path, int] = {}
+    for path in files:
+        try:
+            out[path] = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
+    return out
+
+
+def affected_modules(changed: List[Path]) -> Set[str]:
+    """Section modules to reload for ``changed`` files in ``src/sections``.
+
+    A YAML file maps to the modules naming it; every module pulls in the
+    modules importing it, transitively.
+    """
+    sources = {
+        p.stem: p.read_text(encoding="utf-8")
+        for p in SECTIONS_DIR.glob("*.py")
+        if p.stem != "__init__"
+    }
+    pending: Set[str] = set()
+    for path in changed:
+        if path.suffix == ".py" and path.stem in sources:
+            pending.add(path.stem)
+        elif path.suffix == ".yaml":
+            pending.update(stem for stem, src in sources.items() if path.name in src)
+
+    imports = {stem: set(_IMPORT_RE.findall(src)) for stem, src in sources.items()}
+    result: Set[str] = set()
+    while pending:
+        stem = pending.pop()
+        if stem in result:
+            continue
+        result.add(stem)
+        pending.update(s for s, deps in imports.items() if stem in deps)
+    return result
+
+
+def reload_section_modules(stems: Set[str]) -> Set[type]:
+    """Reload builder modules, ``sections`` and the factory.
+
+    Returns
+    -------
+    set of type
+        The builder classes that were replaced.
+    """
+    package = sections_package.__name__
+    # base first: the others must subclass the new SectionBuilder.
+    ordered = sorted(stems, key=lambda s: (s != "base", s))
+    modules = [sys.modules[f"{package}.{s}"] for s in ordered if f"{package}.{s}" in sys.modules]
+    base_cls = sections_package.SectionBuilder
+    replaced = {
+        obj
+        for module in modules
+        for obj in vars(module).values()
+        if isinstance(obj, type) and issubclass(obj, base_cls) and obj.__module__ == module.__name__
+    }
+    for module in modules:
+        importlib.reload(module)
+    importlib.reload(sections_package)
+    # create_builders resolves the builder classes through the factory
+    # module's globals, which reload refreshes for existing factory objects.
+    importlib.reload(factory_module)
+    return replaced
+
+
+class Watcher:
+    """Polls the config and section sources for changes.
+
+    Parameters
+    ----------
+    config_path: Path
+        Config file being generated from.
+    interval: float, optional
+        Seconds between polls.
+    """
+
+    def __init__(self, config_path: Path, interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        self.config_path = config_path
+        self._interval = interval
+        self._seen = _mtimes(_watched_files(config_path))
+
+    def poll(self) -> ChangeSet:
+        """Changes since the previous poll (or since construction)."""
+        current = _mtimes(_watched_files(self.config_path))
+        changed = [p for p, m in current.items() if self._seen.get(p) != m]
+        self._seen = current
+        config = self.config_path in changed
+        modules = affected_modules([p for p in changed if p != self.config_path])
+        return ChangeSet(config=config, modules=frozenset(modules))
+
+    def wait(self) -> ChangeSet:
+        while True:
+            time.sleep(self._interval)
+            changes = self.poll()
+            if changes:
+                return changes
+
+
+def watch(
+    generator: DatasetGenerator,
+    watcher: Watcher,
+    cfgs: List[DomainConfig],
+    load_configs: Callable[[], List[DomainConfig]],
+    regenerate: Callable[[List[DomainConfig]], List[SectionResult]],
+    log: Callable[[str], None] = print,
+    max_rounds: Optional[int] = None,
+) -> None:
+    """Regenerate affected domains and sections whenever sources change.
+
+    Parameters
+    ----------
+    generator: DatasetGenerator
+        The generator of the initial run; its section memo drives reuse.
+    watcher: Watcher
+        Source of change sets, created before the initial run.
+    cfgs: list of DomainConfig
+        Configs the initial run generated.
+    load_configs: callable
+        Reloads the selected domain configs the way the initial run did.
+    regenerate: callable
+        Generates the given configs into the same places as the initial run.
+    log: callable, optional
+        Status output.
+    max_rounds: int, optional
+        Stop after this many change sets (mainly for scripted use).
+    """
+    current = {cfg.id: cfg for cfg in cfgs}
+    log(f"Watching {watcher.config_path} and {SECTIONS_DIR} for changes (Ctrl-C to stop)")
+    rounds = 0
+    while max_rounds is None or rounds < max_rounds:
+        changes = watcher.wait()
+        rounds += 1
+        start = time.perf_counter()
+        try:
+            affected: Set[str] = set()
+            if changes.modules:
+                generator.forget(reload_section_modules(set(changes.modules)))
+                affected.update(current)
+            if changes.config:
+                fresh = {cfg.id: cfg for cfg in load_configs()}
+                affected.update(d for d, cfg in fresh.items() if current.get(d) != cfg)
+                current = fresh
+            results = regenerate([current[d] for d in current if d in affected])
+        except Exception:  # keep watching after a broken edit
+            log(traceback.format_exc().rstrip())
+            log("Generation failed; waiting for the next change")
+            continue
+        what = ", ".join(sorted(changes.modules)) if changes.modules else "config"
+        log(
+            f"[{what}] regenerated {len(results)} section(s) across {len(affected)} domain(s) "
+            f"in {(time.perf_counter() - start) * 1000:.0f} ms"
+        )